@@ -0,0 +1 @@
+"""Performance benchmarks of nodepy, run as modules from the repository root."""
\ No newline at end of file
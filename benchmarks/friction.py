@@ -0,0 +1,166 @@
+"""Throughput and accuracy benchmark of the friction correlations.
+
+Run from the repository root:
+
+    python -m benchmarks.friction --max-size 10000000 --output friction.json
+
+Every DarcyWeisbach correlation and HazenWilliams.get are timed on arrays of
+increasing size. The Moody table is timed on a few tubing roughnesses, the use
+it is built for, and the other correlations on scattered roughnesses. Each
+throughput record names its sampling. The the friction factors of the correlations are compared with
+the converged Colebrook solution over a standard (Re, epd) grid. The results are
+written as JSON so that runs can be compared against each other.
+"""
+import argparse
+import json
+import platform
+import time
+
+from datetime import datetime, timezone
+
+import numpy as np
+
+from nodepy.pressure_drop import Pipe, DarcyWeisbach, HazenWilliams
+
+from nodepy.pressure_drop._colebrook import colebrook
+
+CORRELATIONS = ("blasius","colebrook","haaland","chen","moody","churchill")
+
+REYNOLDS_RANGE = (4e3,1e8)
+ROUGHNESS_RANGE = (1e-6,1e-2)
+
+TUBING_ROUGHNESS = (1e-5,1e-4,2.5e-4,1e-3) # relative roughnesses of common tubing strings
+
+SAMPLING = {"moody":"tubing"} # roughness sampling of the correlations, "scattered" otherwise
+
+def sample(size:int,seed:int=0,sampling:str="scattered"):
+    """Returns log-uniform Reynolds numbers of the turbulent range and relative roughnesses,
+    log-uniform when sampling is "scattered" or drawn from TUBING_ROUGHNESS when "tubing"."""
+    rng = np.random.default_rng(seed)
+
+    Re = 10**rng.uniform(*np.log10(REYNOLDS_RANGE),size)
+
+    if sampling=="tubing":
+        epd = rng.choice(TUBING_ROUGHNESS,size)
+    elif sampling=="scattered":
+        epd = 10**rng.uniform(*np.log10(ROUGHNESS_RANGE),size)
+    else:
+        raise ValueError(f"Unknown roughness sampling: {sampling}")
+
+    return Re,epd
+
+def best_time(func,repeat:int=3) -> float:
+    """Returns the shortest wall time of repeated calls, seconds."""
+    times = []
+
+    for _ in range(repeat):
+        tic = time.perf_counter()
+        func()
+        times.append(time.perf_counter()-tic)
+
+    return min(times)
+
+def throughput(sizes,repeat:int=3) -> list:
+    """Times the correlations and Hazen-Williams head loss at each array size.
+
+    Each record is the best of the repetitions, so the one-time builds of the Moody
+    table buckets are not included. Scattered roughnesses send the Moody table to its
+    exact Colebrook fallback, so it is timed on the tubing sampling of SAMPLING.
+
+    """
+    DarcyWeisbach.moody(np.full(len(TUBING_ROUGHNESS),1e5),np.array(TUBING_ROUGHNESS))
+
+    hazen = HazenWilliams(Pipe(4.,1000.),None)
+
+    records = []
+
+    for size in sizes:
+
+        samples = {sampling:sample(size,sampling=sampling) for sampling in ("scattered","tubing")}
+
+        for name in CORRELATIONS:
+            sampling = SAMPLING.get(name,"scattered")
+            Re,epd = samples[sampling]
+            friction = getattr(DarcyWeisbach,name)
+            seconds = best_time(lambda: friction(Re,epd),repeat)
+            records.append(_record(name,size,seconds,sampling))
+
+        rates = samples["scattered"][0]*1e-7
+        seconds = best_time(lambda: hazen.get(rates),repeat)
+        records.append(_record("hazen_williams",size,seconds,"scattered"))
+
+    return records
+
+def _record(name,size,seconds,sampling):
+    """Returns a throughput record."""
+    return {
+        "method": name,
+        "size": int(size),
+        "sampling": sampling,
+        "seconds": seconds,
+        "points_per_second": size/seconds if seconds>0 else None,
+        }
+
+def grid(nre:int=200,nepd:int=17):
+    """Returns the standard (Re, epd) grid, including smooth pipes, as flat arrays."""
+    Re = np.logspace(*np.log10(REYNOLDS_RANGE),nre)
+    epd = np.concatenate(([0.],np.logspace(*np.log10(ROUGHNESS_RANGE),nepd)))
+
+    Re,epd = np.meshgrid(Re,epd,indexing="ij")
+
+    return Re.ravel(),epd.ravel()
+
+def accuracy(nre:int=200,nepd:int=17) -> dict:
+    """Returns the maximum and mean relative deviations from converged Colebrook."""
+    Re,epd = grid(nre,nepd)
+
+    exact = colebrook(Re,epd,tol=1e-14,maxiter=50)
+
+    results = {}
+
+    for name in CORRELATIONS:
+        error = np.abs(getattr(DarcyWeisbach,name)(Re,epd)/exact-1)
+        results[name] = {
+            "max_deviation": float(error.max()),
+            "mean_deviation": float(error.mean()),
+            "argmax": {"Re":float(Re[error.argmax()]),"epd":float(epd[error.argmax()])},
+            }
+
+    return results
+
+def run(sizes,repeat:int=3) -> dict:
+    """Returns the full benchmark report."""
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            },
+        "throughput": throughput(sizes,repeat),
+        "accuracy": accuracy(),
+        }
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+
+    parser.add_argument("--max-size",type=float,default=1e7,help="largest array size")
+    parser.add_argument("--repeat",type=int,default=3,help="timing repetitions per case")
+    parser.add_argument("--output",default="friction.json",help="JSON output file")
+
+    args = parser.parse_args(argv)
+
+    sizes = [10**k for k in range(int(np.log10(args.max_size))+1)]
+
+    report = run(sizes,args.repeat)
+
+    with open(args.output,"w") as file:
+        json.dump(report,file,indent=2)
+
+    for name,record in report["accuracy"].items():
+        print(f"{name:>10s}: max {record['max_deviation']:.2e}, mean {record['mean_deviation']:.2e}")
+
+if __name__ == "__main__":
+    main()
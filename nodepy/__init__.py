@@ -1,7 +1,14 @@
 from . import pressure_drop as drop
 
-from .pressure_drop import Pipe, DarcyWeisbach, HazenWilliams
+from .pressure_drop import Pipe, PipeArray, DarcyWeisbach, HazenWilliams
 
-from ._mixture import Mixture
-from ._lockhart_martinelli import LockhartMartinelli
-from ._chisholm import Chisholm
\ No newline at end of file
+from .pipe_network import Network
+
+from ._mixture import Mixture, MixtureResult
+from ._lockhart_martinelli import LockhartMartinelli, TwoPhaseResult
+from ._chisholm import Chisholm
+from ._flow_pattern_map import FlowPatternMap
+
+from ._conduit import Conduit
+from ._traverse import traverse, TraverseResult, shoot, ShootingResult
+from ._sampling import sample_curve, SampledCurve
\ No newline at end of file
@@ -1,9 +1,14 @@
 # coding=utf-8
-#import sys
-#sys.path.append('C:\Users\frank\PEG Commmunity\VLP\psapy')
-import psapy.FluidProps as FluidProps
 import math
 
+import numpy as np
+
+from ._traverse import traverse, batch_traverse, well_traverse, shoot
+
+from .fluid_props import FluidState, FluidContext
+
+from .fluid_props import black_oil as FluidProps
+
 def Pgrad(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle):
     """Function to Calculate the Flowing Pressure Gradient by the Method of Beggs and Brill"""
     #P          pressure, psia
@@ -55,7 +60,7 @@ def Pgrad(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle)
     qo = Bo * oil_rate / 15387                                          #Oil flowrate
     qw = Bw * Wor * oil_rate / 15387                                    #Water flowrate
     ql = qo + qw                                                        #Liquid flowrate
-    if ((Gor - Rso) < 0):                                        #If gas flowrate is negative, set to zero
+    if ((Gor - Rso - Rsw * Wor) < 0):                              #If gas flowrate is negative, set to zero
         qg = 0
     else:
         qg = Bg * (Gor - Rso - Rsw * Wor) * oil_rate / 86400
@@ -226,6 +231,178 @@ def Fric(Nre, eps):
     
     return (1 / Temp) ** 2
 
+def fluid_state(P, T, Gor, gas_grav, oil_grav, wtr_grav):
+    """Function to Evaluate the Fluid Properties used by Pgrad at Arrays of Pressure and Temperature"""
+    #P          pressure, psia
+    #T          temperature, °F
+    #Gor        producing gas-oil ratio, scf/stb
+    #gas_grav   gas specific gravity
+    #oil_grav   API oil gravity
+    #wtr_grav   water specific gravity
+    return context_state(P, T, FluidContext(gas_grav, oil_grav, wtr_grav, Gor))
+
+def context_state(P, T, context):
+    """Function to Evaluate the Fluid Properties used by Pgrad at Arrays of Pressure and Temperature
+    from a FluidContext"""
+    #The rate- and pressure-invariant terms are taken from the context and the remaining
+    #correlations of Pgrad are evaluated on whole arrays
+    c = context
+    Pb = c.bubble_point(T)                                              #Bubble point pressure, psia
+    Z = FluidProps.zfact((T + 460) / c.Tpc, P / c.Ppc, c.zmethod)
+    Rso = FluidProps.sol_gor(T, P, c.Tsep, c.Psep, Pb, c.gas_grav, c.oil_grav)
+    Rsw = FluidProps.sol_gwr(P, T, c.TDS)
+    Bo = FluidProps.oil_fvf(T, P, c.Tsep, c.Psep, Pb, Rso, c.gas_grav, c.oil_grav)
+    Bw = FluidProps.wtr_fvf(P, T, c.TDS)
+    Bg = 0.0283 * Z * (T + 460) / P
+    muo = FluidProps.oil_visc(T, P, c.Tsep, c.Psep, Pb, Rso, c.gas_grav, c.oil_grav)
+    muw = FluidProps.wtr_visc(P, T, c.TDS)
+    mug = FluidProps.gvisc(P, T + 460, Z, c.gas_grav)
+    rhoo = FluidProps.oil_dens(T, P, c.Tsep, c.Psep, Pb, Bo, Rso, c.gas_grav, c.oil_grav)
+    rhow = 62.368 * c.wtr_grav / Bw
+    rhog = 2.699 * c.gas_grav * P / (T + 460) / Z
+    sigo = FluidProps.oil_tens(P, T, c.oil_grav)
+    sigw = FluidProps.wtr_tens(P, T)
+
+    return FluidState(*np.broadcast_arrays(Z, Rso, Rsw, Bo, Bw, Bg, muo, muw, mug, rhoo, rhow, rhog, sigo, sigw))
+
+def pgrad(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle, state=None):
+    """Function to Calculate the Flowing Pressure Gradient by the Method of Beggs and Brill at Arrays of Points"""
+    #Takes the arguments of Pgrad as arrays that broadcast against each other and
+    #returns the gradients, psi/ft, in the broadcast shape with the same operations
+    #as Pgrad, so that both agree to machine precision.
+    #state      FluidState at (P, T); evaluated with fluid_state when None, and it may
+    #           be given from any other property source of the same shape
+    #Points that fall on a flow regime boundary not covered by Flow_regime return NaN.
+    P, T, oil_rate, wtr_rate, Gor, d, angle = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (P, T, oil_rate, wtr_rate, Gor, d, angle)))
+
+    context = FluidContext(gas_grav, oil_grav, wtr_grav, Gor, wtr_rate / oil_rate, d, angle)
+
+    return gradient(P, T, oil_rate, context, state)
+
+def gradient(P, T, oil_rate, context, state=None):
+    """Function to Calculate the Flowing Pressure Gradient by the Method of Beggs and Brill from a FluidContext"""
+    #P          pressure, psia
+    #T          temperature, °F
+    #oil_rate   oil flowrate, stb/d
+    #context    FluidContext of the fluid and well, its lane terms broadcast against P
+    #state      FluidState at (P, T); evaluated with context_state when None
+    P, T, oil_rate, Wor, Gor, d, angle, Axs, eps = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (
+        P, T, oil_rate, context.wor, context.Gor, context.d, context.angle, context.Axs, context.eps)))
+
+    if state is None:
+        state = context_state(P, T, context)
+
+    Z, Rso, Rsw, Bo, Bw, Bg, muo, muw, mug, rhoo, rhow, rhog, sigo, sigw = state
+
+    #Volume fraction weighted liquid properties
+    rhol = (Bw * Wor * rhow + Bo * rhoo) / (Bw * Wor + Bo)
+    mul = (Bw * Wor * rhow) / (Bw * Wor * rhow + Bo * rhoo) * muw + (Bo * rhoo) / (Bw * Wor * rhow + Bo * rhoo) * muo
+    sigl = (Bw * Wor * rhow) / (Bw * Wor * rhow + Bo * rhoo) * sigw + (Bo * rhoo) / (Bw * Wor * rhow + Bo * rhoo) * sigo
+
+    #Calculate downhole fluid flowrates in ft³/s
+    qo = Bo * oil_rate / 15387
+    qw = Bw * Wor * oil_rate / 15387
+    ql = qo + qw
+    qg = np.where((Gor - Rso - Rsw * Wor) < 0, 0., Bg * (Gor - Rso - Rsw * Wor) * oil_rate / 86400)
+
+    #Calculate fluid superficial velocities in ft/s
+    usl = ql / Axs
+    usg = qg / Axs
+    um = usl + usg
+
+    #Determine flow regime
+    Nfr = um ** 2 / (d / 12) / 32.174
+    Nvl = 1.938 * usl * (rhol / sigl) ** 0.25
+    laml = usl / um
+    lamg = 1 - laml
+    L1 = 316 * laml ** 0.302
+    L2 = 0.0009252 * laml ** -2.4684
+    L3 = 0.1 * laml ** -1.4516
+    L4 = 0.5 * laml ** -6.738
+
+    regime = flow_regime(Nfr, laml, L1, L2, L3, L4)
+
+    #Calculate holdups, the transition regime blends segregated and intermittent holdups
+    transition = regime == 2
+
+    yl = liq_holdup(Nfr, Nvl, laml, angle, np.where(transition, 1, regime))
+
+    if transition.any():
+        a = (L3[transition] - Nfr[transition]) / (L3[transition] - L2[transition])
+        yl_int = liq_holdup(Nfr[transition], Nvl[transition], laml[transition], angle[transition], 3)
+        yl[transition] = a * yl[transition] + (1 - a) * yl_int
+
+    yg = 1 - yl
+
+    #Calculate fluid mixture properties
+    rhom = rhol * laml + rhog * lamg
+    mum = mul * laml + mug * lamg
+    rhobar = rhol * yl + rhog * yg
+
+    #Calculate friction factor
+    Nre = 1488 * rhom * um * (d / 12) / mum
+    fn = fric(Nre, eps)
+    x = laml / yl ** 2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lnx = np.log(x)
+        s = np.where((x > 1) & (x < 1.2), np.log(2.2 * x - 1.2),
+            lnx / (-0.0523 + 3.182 * lnx - 0.8725 * lnx ** 2 + 0.01853 * lnx ** 4))
+
+    ftp = fn * np.exp(s)
+
+    #Calculate gradients
+    Pgrad_pe = rhobar * np.sin(angle) / 144
+    Pgrad_f = 2 * ftp * rhom * um ** 2 / 32.17 / (d / 12) / 144
+    Ek = um * usg * rhobar / 32.17 / P / 144
+    return (Pgrad_pe + Pgrad_f) / (1 - Ek)
+
+def flow_regime(Nfr, laml, L1, L2, L3, L4):
+    """Function to Determine the Flow Regime by the Method of Beggs and Brill at Arrays of Points"""
+    #Returns the regime numbers of Flow_regime, and 0 where none of the regimes applies.
+    #The conditions are listed in reverse order since later regimes override earlier ones in Flow_regime.
+    return np.select([
+        ((laml < 0.4) & (Nfr >= L1)) | ((laml >= 0.4) & (Nfr > L4)),
+        (((0.01 <= laml) & (laml < 0.4)) & ((L3 < Nfr) & (Nfr < L1))) | ((laml >= 0.4) & (L3 < Nfr) & (Nfr <= L4)),
+        (laml >= 0.01) & (L2 < Nfr) & (Nfr <= L3),
+        ((laml < 0.01) & (Nfr < L1)) | ((laml >= 0.01) & (Nfr < L2)),
+        ], [4, 3, 2, 1], default=0)
+
+#Holdup constants a, b, c, d, e, f, g indexed by [regime, downhill]
+_HOLDUP = np.full((5, 2, 7), np.nan)
+
+_HOLDUP[1, 0] = (0.98, 0.4846, 0.0868, 0.011, -3.768, 3.539, -1.614)
+_HOLDUP[3, 0] = (0.845, 0.5351, 0.0173, 2.96, 0.305, -0.4473, 0.0978)
+_HOLDUP[4, 0] = (1.065, 0.5824, 0.0609, 1, 0, 0, 0)
+
+_HOLDUP[1, 1] = (0.98, 0.4846, 0.0868, 4.7, -0.3692, 0.1244, -0.5056)
+_HOLDUP[3, 1] = (0.845, 0.5351, 0.0173, 4.7, -0.3692, 0.1244, -0.5056)
+_HOLDUP[4, 1] = (1.065, 0.5824, 0.0609, 4.7, -0.3692, 0.1244, -0.5056)
+
+def liq_holdup(Nfr, Nvl, laml, angle, regime):
+    """Function to Calculate Liquid Holdup for the Segregated, Intermittent and Distributed Regimes
+    by the Method of Beggs and Brill at Arrays of Points"""
+    #angle      pipe inclination in radians
+    #regime     flow regime numbers 1, 3 or 4, other regimes return NaN
+    a, b, c, d, e, f, g = np.moveaxis(_HOLDUP[regime, (np.asarray(angle) < 0).astype(int)], -1, 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = (1 - laml) * np.log(d * laml ** e * Nvl ** f * Nfr ** g)
+
+    corr = np.where(corr < 0, 0., corr)
+
+    psi = 1 + corr * (np.sin(1.8 * angle) - (np.sin(1.8 * angle)) ** 3 / 3)
+    ylo = a * laml ** b / Nfr ** c
+    ylo = np.where(ylo < laml, laml, ylo)
+
+    return ylo * psi
+
+def fric(Nre, eps):
+    """Calculate Fanning Friction Factor using the Chen Equation at Arrays of Reynolds Numbers"""
+    Temp = -4 * np.log10((eps / 3.7065) - (5.0452 / Nre) * np.log10((eps ** 1.1098 / 2.8257) + (7.149 / Nre) ** 0.8981))
+    return (1 / Temp) ** 2
+
 def Pgrad2(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle):
     """Function to Calculate the Flowing Pressure Gradient by the no slip method"""
     #P          pressure, psia
@@ -274,7 +451,7 @@ def Pgrad2(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle
     qo = Bo * oil_rate / 15387                                          #Oil flowrate
     qw = Bw * Wor * oil_rate / 15387                                    #Water flowrate
     ql = qo + qw                                                        #Liquid flowrate
-    if ((Gor - Rso) < 0):                                              #If gas flowrate is negative, set to zero
+    if ((Gor - Rso - Rsw * Wor) < 0):                                    #If gas flowrate is negative, set to zero
         qg = 0
     else:
         qg = Bg * (Gor - Rso - Rsw * Wor) * oil_rate / 86400
@@ -303,36 +480,62 @@ def Pgrad2(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle
     Pgrad_f = 2 * fn * rhom * um ** 2 / 32.17 / (d / 12)                 #Frictional pressure gradient, psi/ft
     return (Pgrad_pe + Pgrad_f) / 144                                 #Overall pressure gradient, psi/ft
 
-def Pwf_q(FWHP, FWHT,Oil_Rate,Water_Rate,GOR,GasGrav,API, WaterGrav, ID, Angle, Depth, FBHT):
+def Pwf_q(FWHP, FWHT,Oil_Rate,Water_Rate,GOR,GasGrav,API, WaterGrav, ID, Angle, Depth, FBHT, rtol=5e-4):
     """Function to calculate the Pwf as function of rate"""
-    DPs = []          ## Start as the empty list
-    Temps=[]
-    Press=[]
-    PressList=[]
-    DepthList=[]
-    i=0
-    PressList.append(FWHP)
-    Temps.append(FWHT)
-    DepthList.append(0)
-    DPs.append(0)
-    nSteps=60
-    i=1
+    #The traverse is integrated from the wellhead down with error-controlled steps,
+    #the temperature varies linearly from FWHT at the wellhead to FBHT at Depth.
+    #rtol       relative tolerance of the traverse steps
     Tgrad= (FBHT-FWHT)/ Depth
 
-    while (i<= nSteps):
-    
-        DeltaD= Depth/nSteps*i
-        DepthList.append(DeltaD) 
-    
-        T=Temps[i-1]+Tgrad*DeltaD
-        Temps.append(T)
-        p=PressList[i-1]+DPs[i-1]*(DepthList[i]-DepthList[i-1])     
-        dp= Pgrad(p,T,Oil_Rate,Water_Rate,GOR,GasGrav,API, WaterGrav, ID, Angle)
-        DPs.append(dp)
-        
-        PressList.append(p)
-        i=i+1
+    def gradient(z, p):
+        return Pgrad(p, FWHT + Tgrad * z, Oil_Rate, Water_Rate, GOR, GasGrav, API, WaterGrav, ID, Angle)
+
+    return traverse(gradient, FWHP, 0., Depth, rtol=rtol).pressures[-1]
+
+def pwf_q(FWHP, FWHT, Oil_Rate, Water_Rate, GOR, GasGrav, API, WaterGrav, ID, Angle, Depth, FBHT, rtol=5e-4, pvt=None, conduit=None):
+    """Function to calculate the Pwf of many wells or rates at once"""
+    #Takes the arguments of Pwf_q as arrays that broadcast against each other, except the
+    #fluid gravities GasGrav, API and WaterGrav, and integrates all traverses together
+    #as one vectorized state with batch_traverse and gradient.
+    #pvt        PVTTable of the fluid, the properties are evaluated live when None
+    #conduit    Conduit of the well, its segment diameters, angles and roughnesses and its
+    #           measured depth replace ID, Angle and Depth, and the temperature varies
+    #           linearly in true vertical depth from FWHT to FBHT
+    #Returns Pwf in the broadcast shape, NaN where a traverse failed.
+    return well_traverse(gradient, FWHP, FWHT, Oil_Rate, Water_Rate, GOR, GasGrav, API, WaterGrav, ID, Angle, Depth, FBHT,
+        rtol=rtol, pvt=pvt, conduit=conduit)
+
+def pwh_q(FBHP, FWHT, Oil_Rate, Water_Rate, GOR, GasGrav, API, WaterGrav, ID, Angle, Depth, FBHT, rtol=5e-4, pvt=None, conduit=None):
+    """Function to calculate the wellhead pressure of many wells or rates at once from their Pwf"""
+    #Takes the arguments of pwf_q with the flowing bottomhole pressure FBHP, psia, in place
+    #of FWHP, and integrates all traverses from Depth up to the wellhead directly.
+    #Returns the wellhead pressure in the broadcast shape, NaN where a traverse failed,
+    #e.g. when the pressure is exhausted before the wellhead.
+    return well_traverse(gradient, FBHP, FWHT, Oil_Rate, Water_Rate, GOR, GasGrav, API, WaterGrav, ID, Angle, Depth, FBHT,
+        bottom_up=True, rtol=rtol, pvt=pvt, conduit=conduit)
+
+def q_pwf(FWHP, FBHP, FWHT, WOR, GOR, GasGrav, API, WaterGrav, ID, Angle, Depth, FBHT, guess, tol=0.1, rtol=1e-6, pvt=None, conduit=None):
+    """Function to calculate the oil rates that flow between given wellhead and bottomhole pressures"""
+    #Matches both ends of the traverses by vectorized secant shooting on the oil rate,
+    #the water rate is WOR times the oil rate.
+    #guess      initial oil rates, stb/d, or the ShootingResult of neighbouring cases, e.g.
+    #           the previous rates of a sweep, to warm start the secant iterations
+    #tol        tolerance on the bottomhole pressure, psi
+    #rtol       relative tolerance of the traverse steps, tighter than that of pwf_q so that
+    #           the secant sees a smooth function of the rate
+    #Returns a ShootingResult with the oil rates in x in the broadcast shape, NaN where no
+    #rate was found.
+    FWHP, FBHP, FWHT, WOR, GOR, ID, Angle, Depth, FBHT = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (FWHP, FBHP, FWHT, WOR, GOR, ID, Angle, Depth, FBHT)))
+
+    target = FBHP
+
+    FWHP, FWHT, WOR, GOR, ID, Angle, Depth, FBHT = (np.ravel(x) for x in (FWHP, FWHT, WOR, GOR, ID, Angle, Depth, FBHT))
+
+    def end_pressure(q, index):
+        return pwf_q(FWHP[index], FWHT[index], q, WOR[index] * q, GOR[index], GasGrav, API, WaterGrav,
+            ID[index], Angle[index], Depth[index], FBHT[index], rtol=rtol, pvt=pvt, conduit=conduit)
 
-    return PressList[-1]
+    return shoot(end_pressure, target, guess, tol=tol, bounds=(1e-6, np.inf))
 
 #print(Pgrad(150,101,100,50,300,0.65,35,1.07,2.44,90))
\ No newline at end of file
@@ -0,0 +1,162 @@
+import copy
+
+import numpy as np
+
+class Conduit():
+    """Segmented flow path of a well or flowline with array-backed geometry.
+
+    The conduit is a chain of straight segments between stations of increasing measured
+    depth. The per-segment length, true vertical depth increment, inclination from
+    horizontal, inner diameter, cross-sectional area and relative roughness are computed
+    once at construction, so that a traverse looks the geometry up by a searchsorted of
+    its depths instead of recomputing it at every step. The angle of a segment is taken
+    from its chord, so the elevation change over the conduit is exact at the stations.
+
+    Attributes:
+        md (np.ndarray)       : Measured depths of the stations, ft.
+        tvd (np.ndarray)      : True vertical depths of the stations, ft.
+        length (np.ndarray)   : Segment lengths, ft.
+        dtvd (np.ndarray)     : True vertical depth increments of the segments, ft.
+        angle (np.ndarray)    : Segment inclinations from horizontal, radians.
+        diameter (np.ndarray) : Segment inner diameters, in.
+        Axs (np.ndarray)      : Segment cross-sectional areas, ft².
+        roughness (np.ndarray): Segment relative roughnesses.
+        north (np.ndarray)    : Northings of the stations of a survey, ft, None otherwise.
+        east (np.ndarray)     : Eastings of the stations of a survey, ft, None otherwise.
+
+    """
+
+    def __init__(self,md:np.ndarray,tvd:np.ndarray,diameter=2.441,roughness=0.0006):
+        """Initializes the conduit from station depths and per-segment pipe properties.
+
+        Args:
+            md (np.ndarray): Increasing measured depths of the stations, ft.
+            tvd (np.ndarray): True vertical depths of the stations, ft.
+            diameter (float|np.ndarray, optional): Inner diameters of the segments, in. A
+                tapered string is given by one value per segment, with the crossover
+                depths among the stations.
+            roughness (float|np.ndarray, optional): Relative roughnesses of the segments.
+
+        Raises:
+            ValueError: If there are fewer than two stations or the measured depths do
+                not increase.
+
+        """
+        self.md = np.array(md,dtype=float).ravel()
+        self.tvd = np.array(tvd,dtype=float).ravel()
+
+        if self.md.size<2 or self.md.size!=self.tvd.size:
+            raise ValueError("A conduit needs at least two stations with a TVD for each MD.")
+
+        self.length = np.diff(self.md)
+        self.dtvd = np.diff(self.tvd)
+
+        if np.any(self.length<=0):
+            raise ValueError("Measured depths of the stations must increase.")
+
+        self.angle = np.arcsin(np.clip(self.dtvd/self.length,-1.,1.))
+
+        self.diameter = np.array(np.broadcast_to(np.asarray(diameter,dtype=float),self.length.shape))
+        self.roughness = np.array(np.broadcast_to(np.asarray(roughness,dtype=float),self.length.shape))
+
+        self.Axs = np.pi/4*(self.diameter/12)**2
+
+        self.north = self.east = None
+
+    @classmethod
+    def from_survey(cls,md:np.ndarray,inclination:np.ndarray,azimuth:np.ndarray=0.,diameter=2.441,
+        roughness=0.0006):
+        """Builds the conduit of a deviation survey by the minimum curvature method.
+
+        Each interval between stations is a circular arc, and the chord increments are
+        scaled by the ratio factor 2/b*tan(b/2) of its dogleg angle b.
+
+        Args:
+            md (np.ndarray): Increasing measured depths of the stations, ft.
+            inclination (np.ndarray): Inclinations from vertical at the stations, degrees.
+            azimuth (np.ndarray, optional): Azimuths at the stations, degrees.
+            diameter (float|np.ndarray, optional): Inner diameters of the segments, in.
+            roughness (float|np.ndarray, optional): Relative roughnesses of the segments.
+
+        Returns:
+            Conduit: Conduit with the true vertical depth measured from the first station.
+
+        """
+        md,inc,azi = np.broadcast_arrays(*(np.asarray(x,dtype=float).ravel() for x in (md,inclination,azimuth)))
+
+        inc,azi = np.radians(inc),np.radians(azi)
+
+        i1,i2,a1,a2 = inc[:-1],inc[1:],azi[:-1],azi[1:]
+
+        cosb = np.cos(i2-i1)-np.sin(i1)*np.sin(i2)*(1-np.cos(a2-a1))
+
+        b = np.arccos(np.clip(cosb,-1.,1.))
+
+        with np.errstate(divide="ignore",invalid="ignore"):
+            ratio = np.where(b>1e-9,2/b*np.tan(b/2),1.)
+
+        dtvd = np.diff(md)/2*(np.cos(i1)+np.cos(i2))*ratio
+
+        conduit = cls(md,np.concatenate(([0.],np.cumsum(dtvd))),diameter,roughness)
+
+        conduit.north = np.concatenate(([0.],np.cumsum(np.diff(md)/2*(np.sin(i1)*np.cos(a1)+np.sin(i2)*np.cos(a2))*ratio)))
+        conduit.east = np.concatenate(([0.],np.cumsum(np.diff(md)/2*(np.sin(i1)*np.sin(a1)+np.sin(i2)*np.sin(a2))*ratio)))
+
+        return conduit
+
+    @classmethod
+    def from_profile(cls,distance:np.ndarray,elevation:np.ndarray,diameter=2.441,roughness=0.0006):
+        """Builds the conduit of a flowline following a terrain profile.
+
+        Args:
+            distance (np.ndarray): Increasing horizontal distances of the stations from the
+                outlet, ft.
+            elevation (np.ndarray): Elevations of the stations, ft.
+            diameter (float|np.ndarray, optional): Inner diameters of the segments, in.
+            roughness (float|np.ndarray, optional): Relative roughnesses of the segments.
+
+        Returns:
+            Conduit: Conduit with the true vertical depth measured down from the outlet, so
+                that segments rising toward the outlet have positive angles.
+
+        """
+        distance,elevation = np.broadcast_arrays(*(np.asarray(x,dtype=float).ravel() for x in (distance,elevation)))
+
+        md = np.concatenate(([0.],np.cumsum(np.hypot(np.diff(distance),np.diff(elevation)))))
+
+        return cls(md,elevation[0]-elevation,diameter,roughness)
+
+    @property
+    def depth(self) -> float:
+        """Returns the total measured depth of the conduit, ft."""
+        return float(self.md[-1]-self.md[0])
+
+    def segment(self,z:np.ndarray) -> np.ndarray:
+        """Returns the indices of the segments at measured depths z below the first station."""
+        return np.clip(np.searchsorted(self.md,self.md[0]+np.asarray(z),side="right")-1,0,self.length.size-1)
+
+    def vertical(self,z:np.ndarray) -> np.ndarray:
+        """Returns the true vertical depths at measured depths z below the first station."""
+        i = self.segment(z)
+
+        return self.tvd[i]+(self.md[0]+np.asarray(z)-self.md[i])*self.dtvd[i]/self.length[i]
+
+    def temperature(self,z:np.ndarray,T0,T1) -> np.ndarray:
+        """Returns temperatures varying linearly in true vertical depth from T0 at the first
+        station to T1 at the last one, or in measured depth if the conduit is level."""
+        span = self.tvd[-1]-self.tvd[0]
+
+        if span==0:
+            return T0+(T1-T0)*np.asarray(z)/self.depth
+
+        return T0+(T1-T0)*(self.vertical(z)-self.tvd[0])/span
+
+    def apply(self,context,z:np.ndarray):
+        """Returns a copy of a FluidContext with the pipe terms of the segments at z."""
+        i = self.segment(z)
+
+        context = copy.copy(context)
+
+        context.d,context.angle,context.Axs,context.eps = self.diameter[i],self.angle[i],self.Axs[i],self.roughness[i]
+
+        return context
@@ -0,0 +1,103 @@
+import numpy as np
+
+from ._lockhart_martinelli import LockhartMartinelli
+
+class FlowPatternMap():
+    """Flow-pattern map of the LockhartMartinelli regime curves.
+
+    An operating point (X,Y) is assigned the pattern of the highest boundary curve lying
+    at or below it, -1 below all of them. The boundaries are polynomials in ln X, so the
+    logarithm of the points is taken once and the curves are evaluated exactly, one at a
+    time, without holding a (points x curves) array.
+
+    Attributes:
+        patterns (tuple): Names of the LockhartMartinelli boundaries, indexed by code.
+
+    """
+    PATTERNS = ("dispersed_bubbly","elongated_bubbly","smooth_stratified",
+        "stratified_wavy","slug_flow","annular_mist")
+
+    def __init__(self,patterns:tuple=None):
+        """Selects the boundary curves of the map, all PATTERNS by default."""
+        self.patterns = self.PATTERNS if patterns is None else tuple(patterns)
+
+    def __call__(self,X:float|np.ndarray,Y:float|np.ndarray) -> np.ndarray:
+        """Returns the pattern codes, indices of patterns, of the broadcast (X,Y) points."""
+        X,Y = np.broadcast_arrays(np.asarray(X,dtype=float),np.asarray(Y,dtype=float))
+
+        shape = X.shape
+
+        x,Y = self._log(X.ravel()),Y.ravel()
+
+        code = np.full(Y.shape,-1,dtype=np.int8)
+        best = np.full(Y.shape,-np.inf)
+
+        for k,name in enumerate(self.patterns):
+
+            with np.errstate(invalid="ignore"):
+                value = LockhartMartinelli.boundary(name,x)
+
+            mask = (value<=Y)&(value>=best)
+
+            code[mask] = k
+            best[mask] = value[mask]
+
+        code[~(np.isfinite(x)&np.isfinite(Y))] = -1
+
+        return code.reshape(shape)
+
+    def raster(self,X:np.ndarray,Y:np.ndarray) -> np.ndarray:
+        """Returns the flow-pattern map on the grid of X and increasing Y values.
+
+        The boundaries of all X columns are sorted once and located on the Y axis with
+        searchsorted, and each column is filled by a cumulative sum of the code changes at
+        those rows, so the cost is one pass over the raster.
+
+        Args:
+            X (np.ndarray): Lockhart-Martinelli parameters of the columns.
+            Y (np.ndarray): Increasing ordinates of the rows.
+
+        Returns:
+            np.ndarray: Pattern codes, (Y.size x X.size), equal to self(X[None,:],Y[:,None]).
+
+        Raises:
+            ValueError: If Y is not increasing.
+
+        """
+        X,Y = np.asarray(X,dtype=float).ravel(),np.asarray(Y,dtype=float).ravel()
+
+        if np.any(np.diff(Y)<0):
+            raise ValueError("The Y values of the raster rows must be increasing.")
+
+        x = self._log(X)
+
+        with np.errstate(invalid="ignore"):
+            values = np.column_stack([LockhartMartinelli.boundary(name,x) for name in self.patterns])
+
+        order = np.argsort(values,axis=1,kind="stable")
+
+        rows = np.searchsorted(Y,np.take_along_axis(values,order,axis=1),side="left")
+
+        # code changes where each boundary is crossed from below
+        codes = np.concatenate((np.full((X.size,1),-1),order),axis=1)
+
+        change = np.zeros((Y.size+1,X.size),dtype=np.int16)
+
+        np.add.at(change,(rows,np.arange(X.size)[:,None]),np.diff(codes,axis=1))
+
+        code = (np.cumsum(change[:-1],axis=0)-1).astype(np.int8)
+
+        code[:,~np.isfinite(x)] = -1
+
+        return code
+
+    def name(self,code:int) -> str:
+        """Returns the pattern name of a code, None below all boundary curves."""
+        return None if code<0 else self.patterns[code]
+
+    @staticmethod
+    def _log(X:np.ndarray) -> np.ndarray:
+        """Returns the natural logarithm of X, the points where it is not finite are
+        below all boundaries."""
+        with np.errstate(divide="ignore",invalid="ignore"):
+            return np.log(X)
\ No newline at end of file
@@ -1,8 +1,17 @@
-import FluidProps
 import math
 
+import numpy as np
+
+from ._traverse import traverse, batch_traverse, well_traverse, shoot
+
+from ._beggs_brill import fluid_state, context_state, fric
+
+from .fluid_props import FluidContext
+
+from .fluid_props import black_oil as FluidProps
+
 def Pgrad(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle):
-    """Function to Calculate the Flowing Pressure Gradient by the Method of Beggs and Brill"""
+    """Function to Calculate the Flowing Pressure Gradient by the Method of Hagedorn and Brown"""
     #P          pressure, psia
     #T          temperature, °F
     #oil_rate   oil flowrate, stb/d
@@ -16,8 +25,6 @@ def Pgrad(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle)
     #               90° = vertical
     #               0°  = horizontal
 
-    print( 'P', P, ' T ', T, ' WOR ', oil_rate/wtr_rate, ' GOR ', Gor)
-    
     #Set constants
     pi = math.pi   #4 * math.atan(1)                                               #Define pi
     Psep = 114.7                                                        #Separator pressure, psia
@@ -28,8 +35,6 @@ def Pgrad(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle)
     
     #Calculate fluid properties
     Z = FluidProps.zfact((T + 460) / FluidProps.Tc(gas_grav), P / FluidProps.Pc(gas_grav))               #Gas compressibility factor
-    if T==145.0:
-        print ('error')
        
     Wor = wtr_rate / oil_rate                                           #Water-oil ratio, stb/stb
     TDS = FluidProps.salinity(wtr_grav)                                            #Water salinity, wt% total dissolved solids
@@ -57,7 +62,7 @@ def Pgrad(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle)
     qo = Bo * oil_rate / 15387                                          #Oil flowrate
     qw = Bw * Wor * oil_rate / 15387                                    #Water flowrate
     ql = qo + qw                                                        #Liquid flowrate
-    if ((Gor - Rso) < 0):                                        #If gas flowrate is negative, set to zero
+    if ((Gor - Rso - Rsw * Wor) < 0):                              #If gas flowrate is negative, set to zero
         qg = 0
     else:
         qg = Bg * (Gor - Rso - Rsw * Wor) * oil_rate / 86400
@@ -115,12 +120,16 @@ def Pgrad(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle)
         if B<=0.025:
             PHI=27170*B**3-317.52*B**2+0.5472*B+0.9999
         if (B>0.025 and B<=0.055):
-            PHI=-5333.33*B**2+58.524*B+0.1171
+            PHI=-533.33*B**2+58.524*B+0.1171
         if B>0.055:
             PHI=2.5714*B+1.5962
 
         HL=H_Phi*PHI
 
+    if usg==0 or HL>1:
+        ## no free gas, or the chart holdup above one, the liquid fills the pipe
+        HL=1
+
      #Liquid velocity number
     laml = usl / um                                                     #Input liquid fraction
     lamg = 1 - laml                                                     #Input gas fraction
@@ -168,36 +177,220 @@ def Fric(Nre, eps):
     
     return (1 / Temp) ** 2
 
-def Pwf_q(FWHP, FWHT,Oil_Rate,Water_Rate,GOR,GasGrav,API, WaterGrav, ID, Angle, Depth, FBHT):
+def cnl(NL):
+    """Liquid viscosity number coefficient CNL as a function of the liquid viscosity number NL"""
+    return 0.061 * NL ** 3 - 0.0929 * NL ** 2 + 0.0505 * NL + 0.0019
+
+def holdup_psi(H):
+    """Holdup divided by the secondary correction factor, HL/PHI, as a function of the holdup group H"""
+    return np.sqrt((0.047 + (1123.32) * H + 729489.64 * H ** 2) / (1 + 1097.1556 * H + 722153.97 * H ** 2))
+
+def psi(B):
+    """Secondary correction factor PHI as a function of the group B = NGv*NLv**0.38/ND**2.14"""
+    return np.select([B <= 0.025, B <= 0.055], [
+        27170 * B ** 3 - 317.52 * B ** 2 + 0.5472 * B + 0.9999,
+        -533.33 * B ** 2 + 58.524 * B + 0.1171], 2.5714 * B + 1.5962)
+
+class HoldupChart():
+    """
+    A Hagedorn and Brown holdup chart tabulated once and evaluated by linear interpolation.
+
+    Arguments outside of the tabulated range take the end values of the chart. The
+    largest relative error of the interpolation against the chart fit is checked at the
+    cell centers when the table is built.
+
+    Attributes:
+        nodes (np.ndarray) : Abscissas of the chart.
+        values (np.ndarray): Chart values at the nodes.
+        max_error (float)  : Maximum relative interpolation error.
+
+    """
+    def __init__(self, func, nodes):
+        """Tabulates the chart function at the increasing nodes."""
+        self.nodes = np.asarray(nodes, dtype=float)
+        self.values = func(self.nodes)
+
+        center = (self.nodes[1:] + self.nodes[:-1]) / 2
+
+        self.max_error = float(np.abs(self(center) / func(center) - 1).max())
+
+    def __call__(self, x):
+        """Returns the chart values at x."""
+        return np.interp(x, self.nodes, self.values)
+
+def _split(*edges):
+    """Returns the edges with the next float after each inner edge, so that a jump of a
+    piecewise fit between the two is kept by the linear interpolation."""
+    inner = np.nextafter(edges[1:-1], np.inf)
+    return np.sort(np.concatenate((edges, inner)))
+
+CNL_CHART = HoldupChart(cnl, np.linspace(0., 1., 2001))
+HOLDUP_CHART = HoldupChart(holdup_psi, np.concatenate(([0.], np.logspace(-8., 0., 3201))))
+PSI_CHART = HoldupChart(psi, np.unique(np.concatenate((
+    np.linspace(0., 0.025, 1001), np.linspace(0.025, 0.055, 601), _split(0., 0.025, 0.055, 1.)))))
+
+def pgrad(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle, state=None, out=None):
+    """Function to Calculate the Flowing Pressure Gradient by the Method of Hagedorn and Brown at Arrays of Points"""
+    #Takes the arguments of Pgrad as arrays that broadcast against each other, e.g. rates
+    #of shape (N,1) against pressures of shape (M,), and returns the gradients, psi/ft, in
+    #the broadcast shape. The CNL, holdup and secondary correction charts are evaluated
+    #from the precomputed CNL_CHART, HOLDUP_CHART and PSI_CHART tables.
+    #state      FluidState at (P, T); evaluated with fluid_state when None
+    #out        preallocated array of the broadcast shape for the gradients
+    P, T, oil_rate, wtr_rate, Gor, d, angle = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (P, T, oil_rate, wtr_rate, Gor, d, angle)))
+
+    context = FluidContext(gas_grav, oil_grav, wtr_grav, Gor, wtr_rate / oil_rate, d, angle)
+
+    return gradient(P, T, oil_rate, context, state, out)
+
+def gradient(P, T, oil_rate, context, state=None, out=None):
+    """Function to Calculate the Flowing Pressure Gradient by the Method of Hagedorn and Brown from a FluidContext"""
+    #P          pressure, psia
+    #T          temperature, °F
+    #oil_rate   oil flowrate, stb/d
+    #context    FluidContext of the fluid and well, its lane terms broadcast against P
+    #state      FluidState at (P, T); evaluated with context_state when None
+    #out        preallocated array of the broadcast shape for the gradients
+    P, T, oil_rate, Wor, Gor, d, angle, Axs, eps = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (
+        P, T, oil_rate, context.wor, context.Gor, context.d, context.angle, context.Axs, context.eps)))
+
+    if state is None:
+        state = context_state(P, T, context)
+
+    Z, Rso, Rsw, Bo, Bw, Bg, muo, muw, mug, rhoo, rhow, rhog, sigo, sigw = state
+
+    #Volume fraction weighted liquid properties
+    rhol = (Bw * Wor * rhow + Bo * rhoo) / (Bw * Wor + Bo)
+    mul = (Bw * Wor * rhow) / (Bw * Wor * rhow + Bo * rhoo) * muw + (Bo * rhoo) / (Bw * Wor * rhow + Bo * rhoo) * muo
+    sigl = (Bw * Wor * rhow) / (Bw * Wor * rhow + Bo * rhoo) * sigw + (Bo * rhoo) / (Bw * Wor * rhow + Bo * rhoo) * sigo
+
+    #Calculate downhole fluid flowrates in ft³/s
+    qo = Bo * oil_rate / 15387
+    qw = Bw * Wor * oil_rate / 15387
+    ql = qo + qw
+    qg = np.where((Gor - Rso - Rsw * Wor) < 0, 0., Bg * (Gor - Rso - Rsw * Wor) * oil_rate / 86400)
+
+    #Calculate fluid superficial velocities in ft/s
+    usl = ql / Axs
+    usg = qg / Axs
+    um = usl + usg
+
+    #Determine flow regime, bubble flow takes the Griffith holdup
+    A = np.maximum(1.071 - ((0.2218 * um ** 2) / (d)), 0.13)
+    bubble = usg / (um) - A >= 0
+
+    HL = np.empty(um.shape)
+
+    us = 0.8 * 0.3048
+    x = (1 + um[bubble] / us) ** 2 - 4 * usg[bubble] / us
+    HL[bubble] = 1 - 0.5 * (1 + um[bubble] / us - np.sqrt(x))
+
+    #Hagedorn and Brown holdup correlation for the rest
+    slug = ~bubble
+
+    rhol_s, sigl_s, usl_s, usg_s = rhol[slug], sigl[slug], usl[slug], usg[slug]
+
+    NL = 0.15726 * mul[slug] * (1 / (rhol_s * sigl_s ** 3)) ** 0.25
+    NLv = 1.938 * usl_s * (rhol_s / (sigl_s)) ** 0.25
+    NGv = 1.938 * usg_s * (rhol_s / (sigl_s)) ** 0.25
+    ND = 120.872 * d[slug] / 12 * np.sqrt(rhol_s / (sigl_s))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        H = np.where(NGv == 0, 0., NLv / (NGv ** 0.575) * (P[slug] / 14.7) ** 0.1 * CNL_CHART(NL) / ND)
+
+    B = NGv * (NLv ** 0.38) / (ND ** 2.14)
+
+    HL[slug] = HOLDUP_CHART(H) * PSI_CHART(B)
+
+    #No free gas, or the chart holdup above one, the liquid fills the pipe
+    HL[(usg == 0) | (HL > 1)] = 1.
+
+    laml = usl / um
+    lamg = 1 - laml
+
+    yl = HL
+    yg = 1 - HL
+
+    #Calculate fluid mixture properties
+    rhom = rhol * laml + rhog * lamg
+    mum = mul ** yl * mug ** (yg)
+    rhobar = rhol * yl + rhog * yg
+
+    #Calculate friction factor
+    Nre = 1488 * rhom * um * (d / 12) / mum
+    fn = fric(Nre, eps)
+    x = laml / HL ** 2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lnx = np.log(x)
+        s = np.where((x > 1) & (x < 1.2), np.log(2.2 * x - 1.2),
+            lnx / (-0.0523 + 3.182 * lnx - 0.8725 * lnx ** 2 + 0.01853 * lnx ** 4))
+
+    ftp = fn * np.exp(s)
+
+    #Calculate gradients
+    Pgrad_pe = rhobar * np.sin(angle) / 144
+    Pgrad_f = 2 * ftp * rhom * um ** 2 / 32.17 / (d / 12) / 144
+    Ek = um * usg * rhobar / 32.17 / P / 144
+    return np.divide(Pgrad_pe + Pgrad_f, 1 - Ek, out=out)
+
+def Pwf_q(FWHP, FWHT,Oil_Rate,Water_Rate,GOR,GasGrav,API, WaterGrav, ID, Angle, Depth, FBHT, rtol=5e-4):
     """Function to calculate the Pwf as function of rate"""
-    DPs = []          ## Start as the empty list
-    Temps=[]
-    Press=[]
-    PressList=[]
-    DepthList=[]
-    i=0
-    PressList.append(FWHP)
-    Temps.append(FWHT)
-    DepthList.append(0)
-    DPs.append(0)
-    nSteps=60
-    i=1
+    #The traverse is integrated from the wellhead down with error-controlled steps,
+    #the temperature varies linearly from FWHT at the wellhead to FBHT at Depth.
+    #rtol       relative tolerance of the traverse steps
     Tgrad= (FBHT-FWHT)/ Depth
 
-    while (i<= nSteps):
-    
-        DeltaD= Depth/nSteps*i
-        DepthList.append(DeltaD) 
-    
-        T=FWHT+Tgrad*DeltaD
-        Temps.append(T)
-        p=PressList[i-1]+DPs[i-1]*(DepthList[i]-DepthList[i-1])     
-        dp= Pgrad(p,T,Oil_Rate,Water_Rate,GOR,GasGrav,API, WaterGrav, ID, Angle)
-        DPs.append(dp)
-        
-        PressList.append(p)
-        i=i+1
+    def gradient(z, p):
+        return Pgrad(p, FWHT + Tgrad * z, Oil_Rate, Water_Rate, GOR, GasGrav, API, WaterGrav, ID, Angle)
+
+    return traverse(gradient, FWHP, 0., Depth, rtol=rtol).pressures[-1]
+
+def pwf_q(FWHP, FWHT, Oil_Rate, Water_Rate, GOR, GasGrav, API, WaterGrav, ID, Angle, Depth, FBHT, rtol=5e-4, pvt=None, conduit=None):
+    """Function to calculate the Pwf of many wells or rates at once"""
+    #Takes the arguments of Pwf_q as arrays that broadcast against each other, except the
+    #fluid gravities GasGrav, API and WaterGrav, and integrates all traverses together
+    #as one vectorized state with batch_traverse and gradient.
+    #pvt        PVTTable of the fluid, the properties are evaluated live when None
+    #conduit    Conduit of the well, its segment diameters, angles and roughnesses and its
+    #           measured depth replace ID, Angle and Depth, and the temperature varies
+    #           linearly in true vertical depth from FWHT to FBHT
+    #Returns Pwf in the broadcast shape, NaN where a traverse failed.
+    return well_traverse(gradient, FWHP, FWHT, Oil_Rate, Water_Rate, GOR, GasGrav, API, WaterGrav, ID, Angle, Depth, FBHT,
+        rtol=rtol, pvt=pvt, conduit=conduit)
+
+def pwh_q(FBHP, FWHT, Oil_Rate, Water_Rate, GOR, GasGrav, API, WaterGrav, ID, Angle, Depth, FBHT, rtol=5e-4, pvt=None, conduit=None):
+    """Function to calculate the wellhead pressure of many wells or rates at once from their Pwf"""
+    #Takes the arguments of pwf_q with the flowing bottomhole pressure FBHP, psia, in place
+    #of FWHP, and integrates all traverses from Depth up to the wellhead directly.
+    #Returns the wellhead pressure in the broadcast shape, NaN where a traverse failed,
+    #e.g. when the pressure is exhausted before the wellhead.
+    return well_traverse(gradient, FBHP, FWHT, Oil_Rate, Water_Rate, GOR, GasGrav, API, WaterGrav, ID, Angle, Depth, FBHT,
+        bottom_up=True, rtol=rtol, pvt=pvt, conduit=conduit)
+
+def q_pwf(FWHP, FBHP, FWHT, WOR, GOR, GasGrav, API, WaterGrav, ID, Angle, Depth, FBHT, guess, tol=0.1, rtol=1e-6, pvt=None, conduit=None):
+    """Function to calculate the oil rates that flow between given wellhead and bottomhole pressures"""
+    #Matches both ends of the traverses by vectorized secant shooting on the oil rate,
+    #the water rate is WOR times the oil rate.
+    #guess      initial oil rates, stb/d, or the ShootingResult of neighbouring cases, e.g.
+    #           the previous rates of a sweep, to warm start the secant iterations
+    #tol        tolerance on the bottomhole pressure, psi
+    #rtol       relative tolerance of the traverse steps, tighter than that of pwf_q so that
+    #           the secant sees a smooth function of the rate
+    #Returns a ShootingResult with the oil rates in x in the broadcast shape, NaN where no
+    #rate was found.
+    FWHP, FBHP, FWHT, WOR, GOR, ID, Angle, Depth, FBHT = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (FWHP, FBHP, FWHT, WOR, GOR, ID, Angle, Depth, FBHT)))
+
+    target = FBHP
+
+    FWHP, FWHT, WOR, GOR, ID, Angle, Depth, FBHT = (np.ravel(x) for x in (FWHP, FWHT, WOR, GOR, ID, Angle, Depth, FBHT))
+
+    def end_pressure(q, index):
+        return pwf_q(FWHP[index], FWHT[index], q, WOR[index] * q, GOR[index], GasGrav, API, WaterGrav,
+            ID[index], Angle[index], Depth[index], FBHT[index], rtol=rtol, pvt=pvt, conduit=conduit)
 
-    return PressList[-1]
+    return shoot(end_pressure, target, guess, tol=tol, bounds=(1e-6, np.inf))
 
 #print(Pgrad(150,101,100,50,300,0.65,35,1.07,2.44,90))
\ No newline at end of file
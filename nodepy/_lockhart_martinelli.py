@@ -1,13 +1,47 @@
+import logging
+
+from typing import NamedTuple
+
+import numpy as np
+
 from respy import Fluid
 
 from .pressure_drop._pipe import Pipe
 from .pressure_drop._darcy_weisbach import DarcyWeisbach
 
-DarcyWeisbach.LOWER_REYNOLDS_LIMIT = 1000
-DarcyWeisbach.UPPER_REYNOLDS_LIMIT = 2000
+class TwoPhaseResult(NamedTuple):
+    """Arrays of a vectorized two-phase multiplier evaluation.
+
+    Attributes:
+        head_loss (np.ndarray): Two-phase head loss, phiG**2 times the gas head loss.
+        phiG (np.ndarray)     : Gas two-phase multiplier.
+        phiL (np.ndarray)     : Liquid two-phase multiplier.
+        X (np.ndarray)        : Lockhart-Martinelli parameter.
+        C (np.ndarray)        : Chisholm constant, NaN in the transition regime.
+        regime (np.ndarray)   : Regime codes 2*liquid+gas with 0 laminar and 1 turbulent
+            phases, -1 where either phase is in transition.
+        error (np.ndarray)    : Relative difference of the two-phase head losses from the
+            gas and the liquid phase.
+
+    """
+    head_loss: np.ndarray
+    phiG: np.ndarray
+    phiL: np.ndarray
+    X: np.ndarray
+    C: np.ndarray
+    regime: np.ndarray
+    error: np.ndarray
 
 class LockhartMartinelli():
 
+    LOWER_REYNOLDS_LIMIT = 1000
+    UPPER_REYNOLDS_LIMIT = 2000
+
+    TOLERANCE = 1e-5 # relative consistency of the gas and liquid two-phase head losses
+
+    # C constants indexed by [liquid,gas] regime, 0 laminar and 1 turbulent
+    C_TABLE = np.array([[5.,12.],[10.,20.]])
+
     def __init__(self,pipe:Pipe,gas:Fluid,liq:Fluid):
 
         self.pipe = pipe
@@ -23,7 +57,8 @@ class LockhartMartinelli():
     @gas.setter
     def gas(self,value):
         """Setter for the superficial gas model."""
-        self._gas = DarcyWeisbach(self.pipe,value)
+        self._gas = DarcyWeisbach(self.pipe,value,
+            lower_limit=self.LOWER_REYNOLDS_LIMIT,upper_limit=self.UPPER_REYNOLDS_LIMIT)
 
     @property
     def liq(self):
@@ -33,10 +68,93 @@ class LockhartMartinelli():
     @liq.setter
     def liq(self,value):
         """Setter for the superficial liquid model."""
-        self._liq = DarcyWeisbach(self.pipe,value)
+        self._liq = DarcyWeisbach(self.pipe,value,
+            lower_limit=self.LOWER_REYNOLDS_LIMIT,upper_limit=self.UPPER_REYNOLDS_LIMIT)
 
     def get(self,grate,lrate,gdict:dict=None,ldict:dict=None):
-        pass
+        """Calculates the two-phase head loss due to friction."""
+        return self.evaluate(grate,lrate,gdict,ldict).head_loss
+
+    def evaluate(self,grate,lrate,gdict:dict=None,ldict:dict=None) -> TwoPhaseResult:
+        """Returns the two-phase multipliers and head loss of arrays of gas and liquid rates.
+
+        The superficial phase head losses are evaluated once on the gas and liquid rate
+        arrays, and the multipliers on their broadcast grid, so a (gas rate, liquid rate)
+        grid is one call with grate[:,None] and lrate[None,:]. The consistency of the two
+        phase estimates is checked over the whole grid and reported in a single warning.
+
+        Args:
+            grate (float|np.ndarray): Superficial gas volumetric flow rate.
+            lrate (float|np.ndarray): Superficial liquid volumetric flow rate, broadcast
+                against grate.
+            gdict (dict, optional): Keyword arguments of the gas Darcy-Weisbach evaluation.
+            ldict (dict, optional): Keyword arguments of the liquid Darcy-Weisbach evaluation.
+
+        Returns:
+            TwoPhaseResult: Head loss, multipliers, Lockhart-Martinelli parameter, C constant,
+                regime codes and consistency errors, NaN where either phase is in transition.
+
+        """
+        gas = self.gas.evaluate(grate,**(gdict or {}))
+        liq = self.liq.evaluate(lrate,**(ldict or {}))
+
+        dropG = gas.head_loss
+        dropL = liq.head_loss
+
+        X = self.get_X(dropG,dropL)
+        C = self.get_C(gas.laminar,gas.turbulent,liq.laminar,liq.turbulent)
+
+        phiG = self.get_phiG(X,C)
+        phiL = self.get_phiL(X,C)
+
+        tdropG = phiG**2*dropG
+        tdropL = phiL**2*dropL
+
+        error = np.abs(tdropG-tdropL)/np.abs(tdropL)
+
+        regime = self.regime_code(gas.laminar,gas.turbulent,liq.laminar,liq.turbulent)
+
+        failed = np.count_nonzero(error>self.TOLERANCE)
+
+        if failed>0:
+            logging.warning(f"Two-phase pressure drops calculated from liquid phase and gas phase "
+                f"differ at {failed} of {error.size} points, maximum relative difference {np.nanmax(error):.3e}")
+
+        return TwoPhaseResult(tdropG,phiG,phiL,X,C,regime,error)
+
+    @staticmethod
+    def get_X(dropG,dropL):
+        """Returns liquid to gas pressure drop ratio."""
+        return np.sqrt(dropL/dropG)
+
+    @classmethod
+    def get_C(cls,lamG,turbG,lamL,turbL):
+        """Returns C constant of the flow regimes, looked up per element in C_TABLE from the
+        regime codes of the phases and NaN in the transition zone."""
+        regime = cls.regime_code(lamG,turbG,lamL,turbL)
+
+        C = cls.C_TABLE.ravel()[np.maximum(regime,0)]
+
+        return np.where(regime<0,np.nan,C)
+
+    @staticmethod
+    def get_phiG(X,C):
+        """Returns gas drag ratio."""
+        return np.sqrt(1+C*X+X**2)
+
+    @staticmethod
+    def get_phiL(X,C):
+        """Returns liquid drag ratio."""
+        return np.sqrt(1+C/X+1/X**2)
+
+    @staticmethod
+    def regime_code(lamG,turbG,lamL,turbL):
+        """Returns regime codes 2*liquid+gas of the broadcast phase flags, with 0 for laminar
+        and 1 for turbulent phases, and -1 where either phase is in transition."""
+        codeG = np.where(turbG,1,np.where(lamG,0,-1))
+        codeL = np.where(turbL,1,np.where(lamL,0,-1))
+
+        return np.where((codeG<0)|(codeL<0),-1,2*codeL+codeG)
 
     @staticmethod
     def regime(lamG:bool,turbG:bool,lamL:bool,turbL:bool):
@@ -52,26 +170,48 @@ class LockhartMartinelli():
 
         raise "Transition zone observed"
     
+    # flow-pattern boundaries Y(X) as coefficients of increasing powers of ln(X)
+    BOUNDARIES = {
+        "dispersed_bubbly": (4.,-12.,28.),
+        "elongated_bubbly": (4.,-15.,26.),
+        "smooth_stratified": (2.,4.5,3.6),
+        "stratified_wavy": (3.,1.65,0.45),
+        "slug_flow": (2.2,6.5),
+        "annular_mist": (4.,2.5,0.5),
+        }
+
+    @classmethod
+    def boundary(cls,name:str,logX):
+        """Returns the flow-pattern boundary of name at the natural logarithms of X."""
+        c0,*coefficients = cls.BOUNDARIES[name]
+
+        value = c0
+
+        for power,c in enumerate(coefficients,1):
+            value = value+c*logX**power
+
+        return value
+
     @staticmethod
     def dispersed_bubbly(x):
-        return 4-12*np.log(x)+28*(np.log(x))**2
+        return LockhartMartinelli.boundary("dispersed_bubbly",np.log(x))
 
     @staticmethod
     def elongated_bubbly(x):
-        return 4-15*np.log(x)+26*(np.log(x))**2
+        return LockhartMartinelli.boundary("elongated_bubbly",np.log(x))
 
     @staticmethod
     def smooth_stratified(x):
-        return 2+4.5*np.log(x)+3.6*(np.log(x))**2
+        return LockhartMartinelli.boundary("smooth_stratified",np.log(x))
 
     @staticmethod
     def stratified_wavy(x):
-        return 3+1.65*np.log(x)+0.45*(np.log(x))**2
+        return LockhartMartinelli.boundary("stratified_wavy",np.log(x))
 
     @staticmethod
     def slug_flow(x):
-        return 2.2+6.5*np.log(x)
+        return LockhartMartinelli.boundary("slug_flow",np.log(x))
 
     @staticmethod
     def annular_mist(x):
-        return 4+2.5*np.log(x)+0.5*(np.log(x))**2
\ No newline at end of file
+        return LockhartMartinelli.boundary("annular_mist",np.log(x))
\ No newline at end of file
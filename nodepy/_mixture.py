@@ -1,7 +1,34 @@
+from typing import NamedTuple
+
+import numpy as np
+
 from respy import Fluid
 
 from .pressure_drop._pipe import Pipe
-from .pressure_drop._darcy_weisbach import DarcyWeisbach
+from .pressure_drop._darcy_weisbach import DarcyWeisbach, friction_factor
+
+class MixtureResult(NamedTuple):
+	"""Arrays of a vectorized mixture evaluation, also used as output buffers.
+
+	Attributes:
+		quality (np.ndarray)  : Mass quality of gas.
+		voidage (np.ndarray)  : Volume fraction of gas.
+		rho (np.ndarray)      : Mixture density.
+		visc (np.ndarray)     : Mixture viscosity.
+		rate (np.ndarray)     : Mixture volumetric flow rate.
+		reynolds (np.ndarray) : Mixture Reynolds number.
+		friction (np.ndarray) : Darcy friction factor.
+		head_loss (np.ndarray): Head loss due to friction.
+
+	"""
+	quality: np.ndarray
+	voidage: np.ndarray
+	rho: np.ndarray
+	visc: np.ndarray
+	rate: np.ndarray
+	reynolds: np.ndarray
+	friction: np.ndarray
+	head_loss: np.ndarray
 
 class Mixture():
 
@@ -12,12 +39,92 @@ class Mixture():
 		self.gas = gas
 		self.liq = liq
 
+		g = 9.80665 # Gravitational acceleration (m/s²)
+
+		# pipe terms of the Darcy-Weisbach kernel, computed once for all calls
+		self._area = pipe.csa*0.3048**2
+		self._scale = pipe.length/(2*g*pipe.diam)/pipe.csa**2
+
 	def get(self,grate,lrate,slip:float=1.,**kwargs):
 		"""Calculates the head loss due to friction using the selected model."""
-		fluid = self.fluid(grate,lrate,slip)
-		model = self.model(fluid)
+		return self.evaluate(grate,lrate,slip,**kwargs).head_loss
+
+	def buffers(self,shape:tuple) -> MixtureResult:
+		"""Returns uninitialized output buffers of the given shape for evaluate()."""
+		return MixtureResult(*(np.empty(shape) for _ in MixtureResult._fields))
+
+	def evaluate(self,grate,lrate,slip:float=1.,C0:float=None,vd:float=0.,method:str="colebrook",
+		out:MixtureResult=None,**kwargs) -> MixtureResult:
+		"""Returns the mixture properties and the head loss of arrays of gas and liquid rates.
+
+		The homogeneous mixture of fluid() and the Darcy-Weisbach head loss of model() are
+		evaluated on whole arrays with in-place ufuncs, without creating fluid or pressure
+		drop objects, and written into the caller's buffers when out is given, so that rate
+		sweeps allocate nothing per call apart from the friction correlation.
+
+		Args:
+			grate (float|np.ndarray): Gas volumetric flow rate, m³/s.
+			lrate (float|np.ndarray): Liquid volumetric flow rate, m³/s, broadcast against grate
+				and the pipes.
+			slip (float, optional): Gas to liquid velocity ratio of the voidage.
+			C0 (float, optional): Distribution parameter of the Zuber-Findlay drift-flux voidage
+				qg/(C0*(qg+ql)+vd*A), used instead of the slip ratio when given.
+			vd (float, optional): Drift velocity of the gas, m/s.
+			method (str, optional): Friction factor method (default="colebrook").
+			out (MixtureResult, optional): Output buffers of the broadcast shape, see buffers().
+			**kwargs: Passed to the friction correlation.
+
+		Returns:
+			MixtureResult: Mixture properties, Reynolds number, friction factor and head loss.
+
+		"""
+		grate = np.atleast_1d(np.asarray(grate,dtype=float))
+		lrate = np.atleast_1d(np.asarray(lrate,dtype=float))
+
+		if out is None:
+			out = self.buffers(np.broadcast_shapes(grate.shape,lrate.shape,np.shape(self.pipe.diam)))
+
+		x,a,rho,mu,q,Re,fD,h = out
+
+		# mass rates, the total is held in the rate buffer until the density is known
+		np.multiply(grate,self.gas._rho,out=x)
+		np.multiply(lrate,self.liq._rho,out=q)
+		np.add(x,q,out=q)
+		np.divide(x,q,out=x)
+
+		np.multiply(x,self.gas._visc-self.liq._visc,out=mu)
+		np.add(mu,self.liq._visc,out=mu)
+
+		if C0 is None:
+			np.multiply(lrate,slip,out=a)
+			np.add(a,grate,out=a)
+		else:
+			np.add(grate,lrate,out=a)
+			np.multiply(a,C0,out=a)
+			np.add(a,vd*self._area,out=a)
+
+		np.divide(grate,a,out=a)
+
+		np.multiply(a,self.gas._rho-self.liq._rho,out=rho)
+		np.add(rho,self.liq._rho,out=rho)
+
+		np.divide(q,rho,out=q)
+
+		np.multiply(q,rho,out=Re)
+		np.multiply(Re,4/np.pi,out=Re)
+		np.divide(Re,mu,out=Re)
+		np.divide(Re,self.pipe.diam,out=Re)
+
+		if method=="churchill":
+			DarcyWeisbach.churchill(Re,self.pipe.epd,out=fD)
+		else:
+			np.copyto(fD,friction_factor(Re,self.pipe.epd,method,**kwargs))
+
+		np.square(q,out=h)
+		np.multiply(h,fD,out=h)
+		np.multiply(h,self._scale,out=h)
 
-		return model.get(fluid._rate,**kwargs)
+		return out
 
 	def fluid(self,grate,lrate,slip:float=1.):
 		"""Returns mixture fluid with density, viscosity, quality, voidage, and flow rate properties."""
@@ -1,12 +1,13 @@
 import math
-import FluidProps
+from nodepy.fluid_props import black_oil as FluidProps
 import matplotlib.pyplot as plt
 from scipy import interpolate
 import numpy as np
 import Vogel
 import BeggsandBrill as BB
 from scipy.optimize import fsolve
-import Hagendornandbrown as HB
+from nodepy import _hagedorn_brown as HB
+from nodepy import sample_curve
 
 Oil_Rate=100
 Water_Rate=50.0
@@ -40,30 +41,15 @@ def Press_Function(rateArray, pressArray, x):
 
 IPR=Vogel.Vogel_DarcyIPR(Pressure,k,Thickness, visc,re,rw,s, 1.21, Temp, Psat, 20)
 
-BB_Pwf=[]
-BB_Rate=[]
-for i in IPR[0]:
-    if i==0:
-        rate=0.1
-    else:
-        rate=i  
-    wr=rate*Wcut/(1-Wcut)   
-    #print 'req rate '   ,rate
-    Pf=HB.Pwf_q(FWHP,FWHT,rate, wr,GOR,GasGrav,API,WaterGrav,ID,Angle, Depth, FBHT)
-    BB_Pwf.append(Pf)
-    BB_Rate.append(rate)
-    #print Pf
-#print "PWF " + str(Pf)
-
-x= np.asarray(BB_Rate)
-f= np.asarray(IPR[1])
-g= np.asarray(BB_Pwf)
-
-q=x
+## VLP sampled adaptively, the batched traverses are refined only where the curve bends
+VLP=sample_curve(lambda q: HB.pwf_q(FWHP,FWHT,q,q*Wcut/(1-Wcut),GOR,GasGrav,API,WaterGrav,ID,Angle,Depth,FBHT),
+    0.1, IPR[0][-1], rtol=0., atol=1.0)
+BB_Rate=VLP.x
+BB_Pwf=VLP.y
 
 QNew =np.linspace(0.1, BB_Rate[-1],10000)
-P_IPR=np.interp(QNew, x, f)
-P_VLP=np.interp(QNew, x, g)
+P_IPR=np.interp(QNew, np.asarray(IPR[0]), np.asarray(IPR[1]))
+P_VLP=VLP(QNew)
 
 SolRate= [fsolve(lambda x:Press_Function(QNew,P_IPR,x)-Press_Function(QNew,P_VLP,x), 0.0)]
 print0(SolRate)
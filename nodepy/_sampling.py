@@ -0,0 +1,89 @@
+from typing import NamedTuple
+
+import numpy as np
+
+class SampledCurve(NamedTuple):
+    """Adaptively sampled curve.
+
+    Attributes:
+        x (np.ndarray)   : Increasing sample abscissas.
+        y (np.ndarray)   : Curve values at the samples.
+        evaluations (int): Number of evaluated points.
+        passes (int)     : Number of vectorized function calls.
+
+    """
+    x: np.ndarray
+    y: np.ndarray
+    evaluations: int
+    passes: int
+
+    def __call__(self,x):
+        """Returns the linear interpolation of the samples."""
+        return np.interp(x,self.x,self.y)
+
+def sample_curve(func,x0:float,x1:float,rtol:float=1e-3,atol:float=0.,points:int=9,
+    min_width:float=None,max_evaluations:int=10000) -> SampledCurve:
+    """Samples a curve on [x0,x1] densely where it bends and sparsely where it is straight.
+
+    The curve is evaluated on a coarse uniform grid, then every interval is bisected
+    and the deviation of the curve at the midpoint from the chord of the interval, the
+    error of linear interpolation there, is compared with atol+rtol*|y|. Intervals whose
+    midpoint deviates more are split in two and checked again in the next pass, so that
+    the samples concentrate near the minimum of a J-shaped lift curve or a flow regime
+    change. All midpoints of a pass are evaluated with one vectorized call, which suits
+    batch traverses such as pwf_q. Intervals with non-finite values are not refined.
+
+    Args:
+        func (callable): Curve values at an array of abscissas.
+        x0 (float): Start of the interval.
+        x1 (float): End of the interval.
+        rtol (float, optional): Relative tolerance on the interpolation error.
+        atol (float, optional): Absolute tolerance on the interpolation error.
+        points (int, optional): Number of points of the initial uniform grid.
+        min_width (float, optional): Intervals are not split below this width. Defaults
+            to 1e-6 of the interval.
+        max_evaluations (int, optional): Maximum number of evaluated points.
+
+    Returns:
+        SampledCurve: Samples and the evaluation counts.
+
+    Raises:
+        RuntimeError: If the tolerance is not met within max_evaluations points.
+
+    """
+    min_width = abs(x1-x0)*1e-6 if min_width is None else min_width
+
+    x = np.linspace(x0,x1,points)
+    y = np.asarray(func(x),dtype=float)
+
+    xs,ys = [x],[y]
+
+    evaluations,passes = points,1
+
+    a,b,ya,yb = x[:-1],x[1:],y[:-1],y[1:]
+
+    while a.size>0:
+
+        if evaluations+a.size>max_evaluations:
+            raise RuntimeError(f"Curve tolerance is not met in {max_evaluations} evaluations.")
+
+        m = (a+b)/2
+        ym = np.asarray(func(m),dtype=float)
+
+        evaluations += m.size
+        passes += 1
+
+        xs.append(m)
+        ys.append(ym)
+
+        with np.errstate(invalid="ignore"):
+            refine = (np.abs(ym-(ya+yb)/2)>atol+rtol*np.abs(ym))&(np.abs(b-a)>2*min_width)
+
+        a,b = np.concatenate((a[refine],m[refine])),np.concatenate((m[refine],b[refine]))
+        ya,yb = np.concatenate((ya[refine],ym[refine])),np.concatenate((ym[refine],yb[refine]))
+
+    x,y = np.concatenate(xs),np.concatenate(ys)
+
+    order = np.argsort(x)
+
+    return SampledCurve(x[order],y[order],evaluations,passes)
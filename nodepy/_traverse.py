@@ -0,0 +1,448 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from .fluid_props import FluidContext
+
+class TraverseResult(NamedTuple):
+    """Pressure profile of a traverse.
+
+    Attributes:
+        depths (np.ndarray)   : Depths of the accepted steps, including both ends.
+        pressures (np.ndarray): Pressures at the depths.
+        evaluations (int)     : Number of gradient evaluations.
+        rejected (int)        : Number of rejected steps.
+
+    """
+    depths: np.ndarray
+    pressures: np.ndarray
+    evaluations: int
+    rejected: int
+
+def traverse(gradient,P0:float,z0:float,z1:float,rtol:float=5e-4,atol:float=1e-3,
+    step:float=None,max_steps:int=10000) -> TraverseResult:
+    """Integrates dP/dz = gradient(z,P) from z0 to z1 with error-controlled steps.
+
+    The embedded Runge-Kutta pair of Bogacki and Shampine (1989) advances the third
+    order solution and estimates the local error from its second order companion.
+    A step is accepted when the estimate is below atol+rtol*|P| and the next step size
+    is scaled by the cube root of the tolerance to error ratio. The last stage of an
+    accepted step is the first stage of the next one, so each accepted step costs three
+    gradient evaluations, and smooth profiles are crossed in a few long steps. The
+    default tolerances hold the bottomhole pressure of a typical well to about a tenth
+    of a percent with a few dozen evaluations.
+
+    Args:
+        gradient (callable): Pressure gradient as a function of depth and pressure.
+        P0 (float): Pressure at the start depth.
+        z0 (float): Start depth.
+        z1 (float): End depth, it may be shallower than z0 for bottom-up traverses.
+        rtol (float, optional): Relative tolerance on the local error.
+        atol (float, optional): Absolute tolerance on the local error, pressure units.
+        step (float, optional): Initial step size. Defaults to a twentieth of the interval.
+        max_steps (int, optional): Maximum number of attempted steps.
+
+    Returns:
+        TraverseResult: Depths, pressures and the evaluation counts.
+
+    Raises:
+        RuntimeError: If the end depth is not reached within max_steps attempts.
+
+    """
+    span = z1-z0
+
+    direction = np.sign(span)
+
+    h = abs(span)/20 if step is None else abs(step)
+
+    z,P = z0,P0
+
+    k1 = gradient(z,P)
+
+    depths,pressures = [z],[P]
+
+    evaluations,rejected = 1,0
+
+    for _ in range(max_steps):
+
+        if direction*(z1-z)<=0:
+            return TraverseResult(np.array(depths),np.array(pressures),evaluations,rejected)
+
+        h = min(h,abs(z1-z))
+
+        dz = direction*h
+
+        k2 = gradient(z+dz/2,P+dz*k1/2)
+        k3 = gradient(z+dz*3/4,P+dz*k2*3/4)
+
+        Pn = P+dz*(2*k1+3*k2+4*k3)/9
+
+        k4 = gradient(z+dz,Pn)
+
+        evaluations += 3
+
+        error = abs(dz*(-5*k1/72+k2/12+k3/9-k4/8))
+
+        tol = atol+rtol*max(abs(P),abs(Pn))
+
+        if not np.isfinite(error):
+            h /= 4
+            rejected += 1
+            continue
+
+        if error<=tol:
+            z = z1 if h==abs(z1-z) else z+dz
+            P,k1 = Pn,k4
+            depths.append(z)
+            pressures.append(P)
+        else:
+            rejected += 1
+
+        h *= min(5.,max(0.2,0.9*(tol/error)**(1/3))) if error>0 else 5.
+
+    raise RuntimeError(f"Traverse did not reach {z1} in {max_steps} steps.")
+
+class BatchTraverseResult(NamedTuple):
+    """End pressures and profiles of a batch of traverses.
+
+    Attributes:
+        pressures (np.ndarray) : End pressures of the lanes, NaN where a lane failed.
+        profile (np.ndarray)   : Pressures of the lanes at the requested depths, of shape
+                                 (lanes, depths), NaN outside of a lane's interval. None when
+                                 no depths are requested.
+        calls (int)            : Number of vectorized gradient calls.
+        evaluations (np.ndarray): Number of gradient evaluations of each lane.
+        rejected (np.ndarray)  : Number of rejected steps of each lane.
+
+    """
+    pressures: np.ndarray
+    profile: np.ndarray
+    calls: int
+    evaluations: np.ndarray
+    rejected: np.ndarray
+
+def batch_traverse(gradient,P0:np.ndarray,z0:np.ndarray,z1:np.ndarray,rtol:float=5e-4,atol:float=1e-3,
+    step:float=None,depths:np.ndarray=None,max_steps:int=10000) -> BatchTraverseResult:
+    """Integrates N independent traverses dP/dz = gradient(z,P) together.
+
+    Every lane advances with its own Bogacki-Shampine step and step size control as in
+    traverse, but the stages of all unfinished lanes are evaluated with one vectorized
+    gradient call, so that the Python overhead is paid per step rather than per lane.
+    Finished lanes are masked out of later calls. A lane whose gradient stays non-finite
+    while its step shrinks below 1e-9 of its interval is stopped with a NaN pressure.
+
+    Args:
+        gradient (callable): Pressure gradients gradient(z,P,index) of the lanes in index
+            at depths z and pressures P, all of the same shape.
+        P0 (np.ndarray): Start pressures of the lanes.
+        z0 (np.ndarray): Start depths, broadcast against P0.
+        z1 (np.ndarray): End depths, broadcast against P0.
+        rtol (float, optional): Relative tolerance on the local error.
+        atol (float, optional): Absolute tolerance on the local error, pressure units.
+        step (float, optional): Initial step size. Defaults to a twentieth of each interval.
+        depths (np.ndarray, optional): Increasing depths at which the profiles are returned
+            by cubic Hermite interpolation of the accepted steps.
+        max_steps (int, optional): Maximum number of batch steps.
+
+    Returns:
+        BatchTraverseResult: End pressures, profiles and the evaluation counts.
+
+    Raises:
+        RuntimeError: If some lanes do not finish within max_steps batch steps.
+
+    """
+    P0,z0,z1 = np.broadcast_arrays(
+        np.asarray(P0,dtype=float),np.asarray(z0,dtype=float),np.asarray(z1,dtype=float))
+
+    shape = P0.shape
+
+    P,z,z1 = np.ravel(P0).copy(),np.ravel(z0).copy(),np.ravel(z1)
+
+    direction = np.sign(z1-z)
+    span = np.abs(z1-z)
+
+    h = span/20 if step is None else np.full(P.size,abs(step))
+
+    index = np.arange(P.size)
+
+    k1 = np.array(gradient(z,P,index),dtype=float)
+
+    calls = 1
+
+    evaluations = np.ones(P.size,dtype=int)
+    rejected = np.zeros(P.size,dtype=int)
+
+    profile = None
+
+    if depths is not None:
+        depths = np.asarray(depths,dtype=float)
+        profile = np.full((P.size,depths.size),np.nan)
+        start = depths[None,:]==z[:,None]
+        profile[start] = np.broadcast_to(P[:,None],profile.shape)[start]
+
+    active = index[direction!=0]
+
+    for _ in range(max_steps):
+
+        if active.size==0:
+            break
+
+        za,Pa,k1a = z[active],P[active],k1[active]
+
+        remaining = np.abs(z1[active]-za)
+
+        ha = np.minimum(h[active],remaining)
+
+        dz = direction[active]*ha
+
+        k2 = gradient(za+dz/2,Pa+dz*k1a/2,active)
+        k3 = gradient(za+dz*3/4,Pa+dz*k2*3/4,active)
+
+        Pn = Pa+dz*(2*k1a+3*k2+4*k3)/9
+
+        zn = np.where(ha==remaining,z1[active],za+dz)
+
+        k4 = gradient(zn,Pn,active)
+
+        calls += 3
+
+        evaluations[active] += 3
+
+        with np.errstate(invalid="ignore",divide="ignore",over="ignore"):
+
+            error = np.abs(dz*(-5*k1a/72+k2/12+k3/9-k4/8))
+
+            tol = atol+rtol*np.maximum(np.abs(Pa),np.abs(Pn))
+
+            finite = np.isfinite(error)
+
+            accept = finite&(error<=tol)
+
+            factor = np.where(error>0,np.clip(0.9*(tol/error)**(1/3),0.2,5.),5.)
+
+        factor[~finite] = 0.25
+
+        if profile is not None and accept.any():
+            _record(profile,depths,active[accept],za[accept],zn[accept],
+                Pa[accept],Pn[accept],k1a[accept],k4[accept])
+
+        lanes = active[accept]
+
+        z[lanes],P[lanes],k1[lanes] = zn[accept],Pn[accept],k4[accept]
+
+        rejected[active[~accept]] += 1
+
+        h[active] = ha*factor
+
+        failed = active[~finite&(ha<1e-9*span[active])]
+
+        z[failed],P[failed] = z1[failed],np.nan
+
+        active = active[direction[active]*(z1[active]-z[active])>0]
+
+    else:
+        if active.size>0:
+            raise RuntimeError(f"{active.size} traverses did not finish in {max_steps} steps.")
+
+    return BatchTraverseResult(P.reshape(shape),profile,calls,
+        evaluations.reshape(shape),rejected.reshape(shape))
+
+def _record(profile,depths,lanes,za,zn,Pa,Pn,ka,kn):
+    """Fills the profile at the depths inside the accepted steps by cubic Hermite interpolation."""
+    lower = np.searchsorted(depths,np.minimum(za,zn),side="left")
+    upper = np.searchsorted(depths,np.maximum(za,zn),side="right")
+
+    counts = upper-lower
+
+    if counts.sum()==0:
+        return
+
+    step = np.repeat(np.arange(lanes.size),counts)
+
+    column = lower[step]+np.arange(counts.sum())-np.repeat(np.cumsum(counts)-counts,counts)
+
+    dz = (zn-za)[step]
+
+    t = (depths[column]-za[step])/dz
+
+    profile[lanes[step],column] = (
+        (1+2*t)*(1-t)**2*Pa[step]+t*(1-t)**2*dz*ka[step]+
+        t**2*(3-2*t)*Pn[step]-t**2*(1-t)*dz*kn[step])
+
+def well_traverse(gradient,P0,FWHT,Oil_Rate,Water_Rate,GOR,GasGrav,API,WaterGrav,ID,Angle,Depth,FBHT,
+    bottom_up:bool=False,rtol:float=5e-4,pvt=None,conduit=None) -> np.ndarray:
+    """Integrates the pressure traverses of many wells or rates together in either direction.
+
+    The lanes are traversed from the wellhead down to Depth, or from Depth up to the
+    wellhead when bottom_up is True, as one vectorized state with batch_traverse. The
+    temperature varies linearly from FWHT at the wellhead to FBHT at Depth.
+
+    Args:
+        gradient (callable): Correlation gradient(P,T,oil_rate,context,state) of the lanes.
+        P0 (np.ndarray): Wellhead pressures, or bottomhole pressures when bottom_up, psia.
+        FWHT, Oil_Rate, Water_Rate, GOR, ID, Angle, Depth, FBHT (np.ndarray): Arguments of
+            pwf_q that broadcast against P0.
+        GasGrav, API, WaterGrav (float): Fluid gravities.
+        bottom_up (bool, optional): Integrates from the bottomhole to the wellhead.
+        rtol (float, optional): Relative tolerance of the traverse steps.
+        pvt (PVTTable, optional): Tabulated fluid properties, evaluated live when None. All
+            lanes must have the GOR of the table.
+        conduit (Conduit, optional): Well geometry, its segments and measured depth replace
+            ID, Angle and Depth, and the temperature varies linearly in its vertical depth.
+
+    Returns:
+        np.ndarray: Pressures at the other end in the broadcast shape, NaN where a traverse failed.
+
+    Raises:
+        ValueError: If the lanes do not have the GOR of pvt.
+
+    """
+    P0,FWHT,Oil_Rate,Water_Rate,GOR,ID,Angle,Depth,FBHT = np.broadcast_arrays(
+        *(np.asarray(x,dtype=float) for x in (P0,FWHT,Oil_Rate,Water_Rate,GOR,ID,Angle,Depth,FBHT)))
+
+    shape = P0.shape
+
+    P0,FWHT,Oil_Rate,Water_Rate,GOR,ID,Angle,Depth,FBHT = (
+        np.ravel(x) for x in (P0,FWHT,Oil_Rate,Water_Rate,GOR,ID,Angle,Depth,FBHT))
+
+    if pvt is not None:
+        pvt.check(GOR)
+
+    if conduit is not None:
+        Depth = np.full(P0.size,conduit.depth)
+
+    Tgrad = (FBHT-FWHT)/Depth
+
+    context = FluidContext(GasGrav,API,WaterGrav,GOR,Water_Rate/Oil_Rate,ID,Angle)
+
+    def lane_gradient(z,p,index):
+        if conduit is None:
+            T = FWHT[index]+Tgrad[index]*z
+            lane = context.take(index)
+        else:
+            T = conduit.temperature(z,FWHT[index],FBHT[index])
+            lane = conduit.apply(context.take(index),z)
+        state = None if pvt is None else pvt(p,T)
+        return gradient(p,T,Oil_Rate[index],lane,state)
+
+    z0,z1 = (Depth,0.) if bottom_up else (0.,Depth)
+
+    return batch_traverse(lane_gradient,P0,z0,z1,rtol=rtol).pressures.reshape(shape)
+
+class ShootingResult(NamedTuple):
+    """Solution of a batch of shooting problems.
+
+    Attributes:
+        x (np.ndarray)          : Solved parameters of the lanes, NaN where a lane failed.
+        residual (np.ndarray)   : Last end-pressure residuals of the lanes.
+        slope (np.ndarray)      : Last secant slopes of the lanes, reused by warm starts.
+        evaluations (np.ndarray): Number of traverses of each lane.
+        calls (int)             : Number of vectorized traverse calls.
+
+    """
+    x: np.ndarray
+    residual: np.ndarray
+    slope: np.ndarray
+    evaluations: np.ndarray
+    calls: int
+
+def shoot(func,target,x0,slope=None,step:float=0.1,tol:float=0.1,bounds:tuple=(-np.inf,np.inf),
+    maxiter:int=20) -> ShootingResult:
+    """Solves func(x,index) = target for independent lanes by vectorized secant iterations.
+
+    Each lane of a boundary-value problem, such as the rate that flows between a given
+    wellhead and bottomhole pressure, is solved by shooting: the traverse is integrated
+    for a trial parameter and the parameter is corrected by the secant of the last two
+    end-pressure residuals. All unconverged lanes are traversed with one vectorized call
+    per iteration. A cold start evaluates x0 and x0*(1+step) before the first secant step.
+    A warm start passes the x and slope of a previous solution of neighbouring cases, so
+    the first correction is a Newton step with the old slope and a lane typically needs
+    two or three traverses. A step to a failed traverse is halved back toward the last
+    point.
+
+    Args:
+        func (callable): End pressures func(x,index) of the lanes in index at parameters x.
+        target (np.ndarray): End pressures to match.
+        x0 (np.ndarray|ShootingResult): Initial parameters, broadcast against target, or a
+            previous result whose x and slope are reused.
+        slope (np.ndarray, optional): Initial slopes d(func)/dx of a warm start.
+        step (float, optional): Relative perturbation of the cold start.
+        tol (float, optional): Absolute tolerance on the end-pressure residual.
+        bounds (tuple, optional): Lower and upper limits of the parameters.
+        maxiter (int, optional): Maximum number of secant iterations.
+
+    Returns:
+        ShootingResult: Parameters, residuals, slopes and the traverse counts.
+
+    """
+    if isinstance(x0,ShootingResult):
+        x0,slope = x0.x,x0.slope if slope is None else slope
+
+    target,x0 = np.broadcast_arrays(np.asarray(target,dtype=float),np.asarray(x0,dtype=float))
+
+    shape = target.shape
+
+    target,x = np.ravel(target),np.ravel(x0).copy()
+
+    index = np.arange(x.size)
+
+    f = np.asarray(func(x,index),dtype=float)-target
+
+    calls = 1
+
+    evaluations = np.ones(x.size,dtype=int)
+
+    if slope is None:
+        slope = np.full(x.size,np.nan)
+        cold = index
+    else:
+        slope = np.ravel(np.broadcast_to(np.asarray(slope,dtype=float),shape)).copy()
+        cold = index[~(np.isfinite(slope)&(slope!=0))]
+
+    if cold.size>0:
+        x1 = np.clip(np.where(x[cold]==0,step,x[cold]*(1+step)),*bounds)
+        f1 = np.asarray(func(x1,cold),dtype=float)-target[cold]
+        calls += 1
+        evaluations[cold] += 1
+        with np.errstate(divide="ignore",invalid="ignore"):
+            slope[cold] = (f1-f[cold])/(x1-x[cold])
+        better = np.isfinite(f1)&~(np.abs(f1)>np.abs(f[cold]))
+        x[cold[better]],f[cold[better]] = x1[better],f1[better]
+
+    active = index[~(np.abs(f)<=tol)]
+
+    for _ in range(maxiter):
+
+        if active.size==0:
+            break
+
+        xa,fa,sa = x[active],f[active],slope[active]
+
+        with np.errstate(divide="ignore",invalid="ignore"):
+            xn = np.clip(xa-fa/sa,*bounds)
+
+        fn = np.asarray(func(xn,active),dtype=float)-target[active]
+
+        calls += 1
+
+        evaluations[active] += 1
+
+        finite = np.isfinite(fn)
+
+        with np.errstate(divide="ignore",invalid="ignore"):
+            sn = np.where(finite,(fn-fa)/(xn-xa),sa*2)
+
+        # failed traverses are retried halfway with a steeper slope
+        x[active] = np.where(finite,xn,xa)
+        f[active] = np.where(finite,fn,fa)
+        slope[active] = sn
+
+        stalled = ~(np.isfinite(slope[active])&(slope[active]!=0))
+
+        x[active[stalled]] = np.nan
+
+        active = active[~stalled&~(np.abs(f[active])<=tol)]
+
+    x[active] = np.nan
+
+    return ShootingResult(x.reshape(shape),f.reshape(shape),slope.reshape(shape),evaluations.reshape(shape),calls)
@@ -0,0 +1,7 @@
+from ._fluid_state import FluidState
+from ._fluid_context import FluidContext
+from ._pvt_table import PVTTable
+
+from . import _black_oil as black_oil
+
+from ._zfactor import pseudo_critical, zfactor, hall_yarborough, ZTable
\ No newline at end of file
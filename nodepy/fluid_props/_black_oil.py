@@ -0,0 +1,202 @@
+import numpy as np
+
+from ._zfactor import zfactor, hall_yarborough
+
+def _vasquez_beggs(oil_grav):
+    """Returns the Vasquez and Beggs solution gas coefficients C1, C2 and C3 for the oil gravity."""
+    light = np.asarray(oil_grav)>30
+    return (np.where(light,0.0178,0.0362),np.where(light,1.187,1.0937),np.where(light,23.931,25.724))
+
+def Pbub(T,Tsep,Psep,gas_grav,oil_grav,Gor):
+    """Returns the Vasquez and Beggs bubble point pressure, psia, at temperatures in °F."""
+    gas_grav_corr = correct(Tsep,Psep,gas_grav,oil_grav)
+
+    C1,C2,C3 = _vasquez_beggs(oil_grav)
+
+    return (Gor/(C1*gas_grav_corr*np.exp(C3*oil_grav/(T+460))))**(1/C2)
+
+def correct(Tsep,Psep,gas_grav,oil_grav):
+    """Returns the gas gravity corrected to the separator conditions in °F and psia."""
+    return gas_grav*(1+5.912*10**-5*oil_grav*Tsep*np.log10(Psep/114.7))
+
+def sol_gor(T,P,Tsep,Psep,Pb,gas_grav,oil_grav):
+    """Returns the Vasquez and Beggs solution gas-oil ratio, scf/stb, saturated at min(P,Pb)."""
+    gas_grav_corr = correct(Tsep,Psep,gas_grav,oil_grav)
+
+    C1,C2,C3 = _vasquez_beggs(oil_grav)
+
+    return C1*gas_grav_corr*np.where(P<=Pb,P,Pb)**C2*np.exp(C3*oil_grav/(T+460))
+
+def oil_fvf(T,P,Tsep,Psep,Pb,Rs,gas_grav,oil_grav):
+    """Returns the Vasquez and Beggs oil formation volume factor, bbl/stb, with the
+    undersaturated oil compressed from the bubble point."""
+    gas_grav_corr = correct(Tsep,Psep,gas_grav,oil_grav)
+
+    light = np.asarray(oil_grav)>30
+
+    C1 = np.where(light,0.000467,0.0004677)
+    C2 = np.where(light,1.1E-05,1.751E-05)
+    C3 = np.where(light,1.337E-09,-1.811E-08)
+
+    Bob = 1+C1*Rs+C2*(T-60)*(oil_grav/gas_grav_corr)+C3*Rs*(T-60)*(oil_grav/gas_grav_corr)
+
+    co = oil_comp(T,P,Tsep,Psep,Rs,gas_grav,oil_grav)
+
+    return np.where(P<=Pb,Bob,Bob*np.exp(co*(Pb-P)))
+
+def oil_comp(T,P,Tsep,Psep,Rs,gas_grav,oil_grav):
+    """Returns the Vasquez and Beggs isothermal oil compressibility, 1/psi."""
+    gas_grav_corr = correct(Tsep,Psep,gas_grav,oil_grav)
+
+    return (5*Rs+17.2*T-1180*gas_grav_corr+12.61*oil_grav-1433)/(P*10**5)
+
+def oil_visc(T,P,Tsep,Psep,Pb,Rs,gas_grav,oil_grav):
+    """Returns the Beggs and Robinson oil viscosity, cp, with the Vasquez and Beggs
+    undersaturated correction above the bubble point."""
+    a = 10.715*(Rs+100)**(-0.515)
+    b = 5.44*(Rs+150)**(-0.338)
+
+    Y = 10**(3.0324-0.0203*oil_grav)
+    x = Y*T**(-1.163)
+
+    visc_ob = a*(10**x-1)**b
+
+    M = 2.6*P**1.187*np.exp(-11.513-8.98E-05*P)
+
+    return np.where(P<=Pb,visc_ob,visc_ob*(P/Pb)**M)
+
+def oil_dens(T,P,Tsep,Psep,Pb,Bo,Rs,gas_grav,oil_grav):
+    """Returns the oil density, lb/ft³."""
+    oil_grav_sp = 141.5/(oil_grav+131.5)
+
+    rho_o = (350*oil_grav_sp+0.0764*gas_grav*Rs)/(5.615*Bo)
+
+    co = oil_comp(T,P,Tsep,Psep,Rs,gas_grav,oil_grav)
+
+    Bob = Bo/(np.exp(co*(P-Pb)))
+
+    rho_ob = (350*oil_grav_sp+0.0764*gas_grav*Rs)/(5.615*Bob)
+
+    return np.where(P<=Pb,rho_o,rho_ob*Bo/Bob)
+
+def oil_tens(P,T,oil_grav):
+    """Returns the Baker and Swerdloff gas-oil interfacial tension, dynes/cm, not less than 1."""
+    s68 = 39-0.2571*oil_grav
+    s100 = 37.5-0.2571*oil_grav
+
+    st = np.where(T<=68,s68,np.where(T>=100,s100,s68-(T-68)*(s68-s100)/32))
+
+    so = (1-0.024*P**0.45)*st
+
+    return np.where(so<1,1.,so)
+
+def Tc(grav):
+    """Returns the Standing gas pseudo-critical temperature, °R."""
+    return 169.2+349.5*grav-74*grav**2
+
+def Pc(grav):
+    """Returns the Standing gas pseudo-critical pressure, psia."""
+    return 756.8-131*grav-3.6*grav**2
+
+def zfact(Tr,Pr,method:str="explicit"):
+    """Returns the gas compressibility factor at reduced temperatures and pressures.
+
+    The explicit Beggs and Brill fit of the Standing-Katz chart is the default, as in
+    psapy.FluidProps. The "DAK" and "HY" methods solve the Dranchuk and Abou-Kassem and
+    the Hall and Yarborough equations of state with batched Newton iterations.
+
+    """
+    if method=="DAK":
+        return zfactor(Tr,Pr)
+
+    if method=="HY":
+        return hall_yarborough(Tr,Pr)
+
+    if method!="explicit":
+        raise ValueError(f"Unknown compressibility factor method {method!r}.")
+
+    a = 1.39*(Tr-0.92)**0.5-0.36*Tr-0.101
+    b = (0.62-0.23*Tr)*Pr+(0.066/(Tr-0.86)-0.037)*Pr**2+0.32*Pr**6/(10**(9*(Tr-1)))
+    c = (0.132-0.32*np.log10(Tr))
+    d = 10**(0.3106-0.49*Tr+0.1824*Tr**2)
+
+    return a+(1-a)*np.exp(-b)+c*Pr**d
+
+def gvisc(P,T,Z,grav):
+    """Returns the Lee, Gonzalez and Eakin gas viscosity, cp, at temperatures in °R."""
+    M = 28.964*grav
+
+    x = 3.448+986.4/T+0.01009*M
+    Y = 2.447-0.2224*x
+
+    rho = (1.4926/1000)*P*M/Z/T
+
+    K = (9.379+0.01607*M)*T**1.5/(209.2+19.26*M+T)
+
+    return K*np.exp(x*rho**Y)/10000
+
+def gas_fvf(P,T,grav,method:str="explicit"):
+    """Returns the gas formation volume factor, ft³/scf, at temperatures in °F."""
+    Z = zfact((T+460)/Tc(grav),P/Pc(grav),method)
+
+    return 0.0283*Z*(T+460)/P
+
+def wtr_fvf(P,T,TDS):
+    """Returns the McCain water formation volume factor, bbl/stb, for salinity in wt%."""
+    Y = 10000*TDS
+
+    x = 5.1*10**-8*P+(T-60)*(5.47*10**-6-1.95*10**-10*P)+(T-60)**2*(-3.23*10**-8+8.5*10**-13*P)
+
+    C1 = 0.9911+6.35E-05*T+8.5*10**-7*T**2
+    C2 = 1.093*10**-6-3.497*10**-9*T+4.57*10**-12*T**2
+    C3 = -5*10**-11+6.429*10**-13*T-1.43*10**-15*T**2
+
+    Bwp = C1+C2*P+C3*P**2
+
+    return Bwp*(1+0.0001*x*Y)
+
+def sol_gwr(P,T,TDS):
+    """Returns the McCain solution gas-water ratio, scf/stb, for salinity in wt%."""
+    Y = 10000*TDS
+
+    x = 3.471*T**-0.837
+
+    C1 = 2.12+0.00345*T-3.59E-05*T**2
+    C2 = 0.0107-5.26E-05*T+1.48*10**-11*T**2
+    C3 = -8.75*10**-7+3.9*10**-9*T-1.02*10**-11*T**2
+
+    Rswp = C1+C2*P+C3*P**2
+
+    return Rswp*(1-0.0001*x*Y)
+
+def wtr_dens(P,T,Bw,TDS):
+    """Returns the water density, lb/ft³, for salinity in wt%."""
+    return (62.368+0.438603*TDS+1.60074*10**-3*TDS**2)/Bw
+
+def wtr_visc(P,T,TDS):
+    """Returns the McCain water viscosity, cp, for salinity in wt%."""
+    Y = 10000*TDS
+
+    a = -0.04518+9.313*10**-7*Y-3.93*10**-12*Y**2
+    b = 70.634+9.576*10**-10*Y**2
+
+    muwd = a+b/T
+
+    return muwd*(1+3.5*10**-12*P**2*(T-40))
+
+def salinity(wtr_grav):
+    """Returns the water salinity, wt% total dissolved solids, from its specific gravity."""
+    rho = 62.368*wtr_grav
+
+    a,b,c = 0.00160074,0.438603,62.368-rho
+
+    return (-b+(b**2-4*a*c)**0.5)/(2*a)
+
+def wtr_tens(P,T):
+    """Returns the Hough gas-water interfacial tension, dynes/cm, not less than 1."""
+    s74 = 75-1.108*P**0.349
+    s280 = 53-0.1048*P**0.637
+
+    sw = np.where(T<=74,s74,np.where(T>=280,s280,s74-(T-74)*(s74-s280)/206))
+
+    return np.where(sw<1,1.,sw)
@@ -0,0 +1,77 @@
+import copy
+import math
+
+import numpy as np
+
+from . import _black_oil as black_oil
+
+class FluidContext():
+    """
+    Pressure- and rate-invariant terms of a black oil flowing in a well.
+
+    The context is built once per fluid and well, so that the separator conditions,
+    corrected gas gravity, water salinity, pseudo-critical properties, bubble point
+    coefficients, water-oil ratio and pipe terms are not recomputed at every depth step
+    and rate of a traverse. Well terms may be arrays with one element per traverse
+    lane, and take() returns the context of a subset of lanes.
+
+    Attributes:
+        gas_grav (float) : Gas specific gravity.
+        oil_grav (float) : API oil gravity.
+        wtr_grav (float) : Water specific gravity.
+        Psep (float)     : Separator pressure, psia.
+        Tsep (float)     : Separator temperature, °F.
+        gas_grav_corr (float): Separator corrected gas gravity.
+        TDS (float)      : Water salinity, wt% total dissolved solids.
+        Tpc (float)      : Gas pseudo-critical temperature, °R.
+        Ppc (float)      : Gas pseudo-critical pressure, psia.
+        zmethod (str)    : Compressibility factor method of black_oil.zfact.
+        Gor (np.ndarray) : Producing gas-oil ratio, scf/stb.
+        wor (np.ndarray) : Water-oil ratio, stb/stb.
+        d (np.ndarray)   : Pipe inner diameter, in.
+        angle (np.ndarray): Pipe inclination from horizontal, radians.
+        Axs (np.ndarray) : Pipe cross-sectional area, ft².
+        eps (np.ndarray) : Pipe relative roughness.
+
+    """
+    LANE_FIELDS = ("Gor","wor","d","angle","Axs","eps")
+
+    def __init__(self,gas_grav:float,oil_grav:float,wtr_grav:float,Gor,wor=0.,d=2.441,angle=90.,eps=0.0006,
+        Psep:float=114.7,Tsep:float=50.,zmethod:str="explicit"):
+        """Computes the invariant terms, the angle is given in degrees from horizontal."""
+        self.gas_grav = gas_grav
+        self.oil_grav = oil_grav
+        self.wtr_grav = wtr_grav
+
+        self.Psep = Psep
+        self.Tsep = Tsep
+
+        self.zmethod = zmethod
+
+        self.gas_grav_corr = float(black_oil.correct(Tsep,Psep,gas_grav,oil_grav))
+
+        self.TDS = float(black_oil.salinity(wtr_grav))
+
+        self.Tpc,self.Ppc = float(black_oil.Tc(gas_grav)),float(black_oil.Pc(gas_grav))
+
+        self.C1,self.C2,self.C3 = (float(C) for C in black_oil._vasquez_beggs(oil_grav))
+
+        self.Gor,self.wor,self.d,self.angle,self.eps = np.broadcast_arrays(*(np.asarray(x,dtype=float)
+            for x in (Gor,wor,d,np.asarray(angle,dtype=float)*math.pi/180,eps)))
+
+        self.Axs = math.pi/4*(self.d/12)**2
+
+    def bubble_point(self,T):
+        """Returns the Vasquez and Beggs bubble point pressure, psia, at temperatures in °F."""
+        return (self.Gor/(self.C1*self.gas_grav_corr*np.exp(self.C3*self.oil_grav/(T+460))))**(1/self.C2)
+
+    def take(self,index):
+        """Returns the context of the lanes in index."""
+        context = copy.copy(self)
+
+        for name in self.LANE_FIELDS:
+            value = getattr(self,name)
+            if value.ndim>0:
+                setattr(context,name,value[index])
+
+        return context
@@ -0,0 +1,41 @@
+from typing import NamedTuple
+
+import numpy as np
+
+class FluidState(NamedTuple):
+    """Black-oil properties at flowing pressures and temperatures in field units.
+
+    Every field is an array of the broadcast shape of the (P, T) points, so that the
+    vectorized pressure-gradient correlations evaluate millions of points in one call.
+
+    Attributes:
+        Z (np.ndarray)   : Gas compressibility factor.
+        Rso (np.ndarray) : Solution gas-oil ratio, scf/stb.
+        Rsw (np.ndarray) : Solution gas-water ratio, scf/stb.
+        Bo (np.ndarray)  : Oil formation volume factor, rb/stb.
+        Bw (np.ndarray)  : Water formation volume factor, rb/stb.
+        Bg (np.ndarray)  : Gas formation volume factor, ft³/scf.
+        muo (np.ndarray) : Oil viscosity, cp.
+        muw (np.ndarray) : Water viscosity, cp.
+        mug (np.ndarray) : Gas viscosity, cp.
+        rhoo (np.ndarray): Oil density, lb/ft³.
+        rhow (np.ndarray): Water density, lb/ft³.
+        rhog (np.ndarray): Gas density, lb/ft³.
+        sigo (np.ndarray): Gas-oil interfacial tension, dynes/cm.
+        sigw (np.ndarray): Gas-water interfacial tension, dynes/cm.
+
+    """
+    Z: np.ndarray
+    Rso: np.ndarray
+    Rsw: np.ndarray
+    Bo: np.ndarray
+    Bw: np.ndarray
+    Bg: np.ndarray
+    muo: np.ndarray
+    muw: np.ndarray
+    mug: np.ndarray
+    rhoo: np.ndarray
+    rhow: np.ndarray
+    rhog: np.ndarray
+    sigo: np.ndarray
+    sigw: np.ndarray
@@ -0,0 +1,126 @@
+import numpy as np
+
+from ._fluid_state import FluidState
+
+class PVTTable():
+    """
+    Black-oil properties of a fluid precomputed over a uniform (P, T) grid.
+
+    The table is built once by calling the property provider on the grid nodes, and
+    all FluidState fields are evaluated together by vectorized bilinear interpolation,
+    with the cell of each point found arithmetically from the uniform spacing. Points
+    outside of the grid are linearly extrapolated from the boundary cells.
+
+    The gas formation volume factor and density, nearly proportional to 1/P and P, are
+    tabulated as Bg*P and rhog/P, and the viscosities, nearly exponential in T, as their
+    logarithms. The largest relative error of each field against the provider, floored
+    at 1e-3 of the field magnitude so that fields crossing zero are measured sensibly,
+    is checked at the cell centers when the table is built and reported as its accuracy.
+
+    The black-oil properties depend on the producing gas-oil ratio, so a table holds a
+    single fluid and the traverses that use it check that all their lanes have its GOR.
+
+    Attributes:
+        pressures (np.ndarray)   : Pressure nodes, psia.
+        temperatures (np.ndarray): Temperature nodes, °F.
+        values (np.ndarray)      : Tabulated fields of shape (fields, pressures, temperatures).
+        errors (dict)            : Maximum relative error of each field at the cell centers.
+        gor (float)              : Gas-oil ratio of the fluid, scf/stb, None if not given.
+
+    """
+    PRESSURE_SCALED = {"Bg":-1,"rhog":1} # powers of P the fields are nearly proportional to
+    LOGARITHMIC = ("muo","muw","mug")
+
+    def __init__(self,provider,pressures:np.ndarray,temperatures:np.ndarray,gor:float=None):
+        """Builds the table.
+
+        Args:
+            provider (callable): Returns the FluidState at arrays of pressure (psia) and temperature (°F).
+            pressures (np.ndarray): Uniformly spaced pressure nodes, psia.
+            temperatures (np.ndarray): Uniformly spaced temperature nodes, °F.
+            gor (float, optional): Gas-oil ratio of the fluid of the provider, scf/stb.
+
+        """
+        self.gor = None if gor is None else float(gor)
+
+        self.pressures = np.asarray(pressures,dtype=float)
+        self.temperatures = np.asarray(temperatures,dtype=float)
+
+        for nodes in (self.pressures,self.temperatures):
+            if nodes.size<2 or not np.allclose(np.diff(nodes),nodes[1]-nodes[0]):
+                raise ValueError("PVTTable nodes must be uniformly spaced and increasing.")
+
+        P,T = np.meshgrid(self.pressures,self.temperatures,indexing="ij")
+
+        self._scale = np.array([self.PRESSURE_SCALED.get(name,0) for name in FluidState._fields])[:,None,None]
+        self._log = np.array([name in self.LOGARITHMIC for name in FluidState._fields])
+
+        self.values = self._forward(np.array(provider(P,T),dtype=float),P)
+
+        Pm = (self.pressures[1:]+self.pressures[:-1])/2
+        Tm = (self.temperatures[1:]+self.temperatures[:-1])/2
+
+        P,T = np.meshgrid(Pm,Tm,indexing="ij")
+
+        exact = provider(P,T)
+
+        self.errors = {}
+
+        for name,table,value in zip(FluidState._fields,self(P,T),exact):
+            scale = np.maximum(np.abs(value),1e-3*np.abs(value).max())
+            self.errors[name] = float((np.abs(table-value)/scale).max())
+
+    @property
+    def max_error(self) -> float:
+        """Returns the largest relative error of all fields."""
+        return max(self.errors.values())
+
+    def check(self,gor:float|np.ndarray):
+        """Checks that the gas-oil ratios of the lanes using the table are that of its fluid.
+
+        Raises:
+            ValueError: If the ratios differ from the GOR of the table, or from each other
+                when the table has no GOR.
+
+        """
+        gor = np.asarray(gor,dtype=float)
+
+        reference = gor.flat[0] if self.gor is None else self.gor
+
+        if gor.size>0 and not np.allclose(gor,reference,rtol=1e-9,atol=0.):
+            raise ValueError(f"PVTTable of GOR {reference} cannot be used for lanes of GOR "
+                f"{gor.min()} to {gor.max()} scf/stb, build a table for each GOR.")
+
+    def __call__(self,P:float|np.ndarray,T:float|np.ndarray) -> FluidState:
+        """Returns the interpolated FluidState at pressures in psia and temperatures in °F."""
+        P,T = np.broadcast_arrays(np.asarray(P,dtype=float),np.asarray(T,dtype=float))
+
+        i,u = _cell(self.pressures,P)
+        j,v = _cell(self.temperatures,T)
+
+        V = self.values
+
+        w00,w01,w10,w11 = (1-u)*(1-v),(1-u)*v,u*(1-v),u*v
+
+        values = w00*V[:,i,j]+w01*V[:,i,j+1]+w10*V[:,i+1,j]+w11*V[:,i+1,j+1]
+
+        return FluidState(*self._backward(values,P))
+
+    def _forward(self,values,P):
+        """Returns the tabulated forms of the fields."""
+        values = values*P**-self._scale
+        values[self._log] = np.log(values[self._log])
+        return values
+
+    def _backward(self,values,P):
+        """Returns the fields from their tabulated forms."""
+        values[self._log] = np.exp(values[self._log])
+        return values*P**self._scale.reshape((-1,)+(1,)*P.ndim)
+
+def _cell(nodes,x):
+    """Returns the cell index and the fractional position of x on uniform nodes."""
+    s = (x-nodes[0])/(nodes[1]-nodes[0])
+
+    i = np.clip(np.floor(s).astype(int),0,nodes.size-2)
+
+    return i,s-i
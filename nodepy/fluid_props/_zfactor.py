@@ -0,0 +1,188 @@
+import numpy as np
+
+def pseudo_critical(gas_grav:float|np.ndarray):
+    """Returns pseudo-critical temperature (°R) and pressure (psia) of a natural gas
+    from its specific gravity using the Sutton correlation."""
+    Tpc = 169.2+349.5*gas_grav-74.0*gas_grav**2
+    Ppc = 756.8-131.0*gas_grav-3.6*gas_grav**2
+
+    return Tpc,Ppc
+
+_DAK = (0.3265,-1.0700,-0.5339,0.01569,-0.05165,0.5475,-0.7361,0.1844,0.1056,0.6134,0.7210)
+
+def zfactor(Tpr:float|np.ndarray,Ppr:float|np.ndarray,tol:float=1e-12,maxiter:int=50) -> np.ndarray:
+    """Returns the gas compressibility factor by the Dranchuk and Abou-Kassem (1975)
+    equation of state.
+
+    The equation is solved for the reduced density with Newton iterations applied to the
+    whole array at once, updating only the elements that have not yet converged.
+
+    Args:
+        Tpr (float|np.ndarray): Pseudo-reduced temperature.
+        Ppr (float|np.ndarray): Pseudo-reduced pressure, broadcast against Tpr.
+        tol (float, optional): Relative tolerance on the reduced density.
+        maxiter (int, optional): Maximum number of Newton iterations.
+
+    Returns:
+        np.ndarray: Compressibility factor with the broadcast shape.
+
+    """
+    A1,A2,A3,A4,A5,A6,A7,A8,A9,A10,A11 = _DAK
+
+    T,P = np.broadcast_arrays(np.asarray(Tpr,dtype=float),np.asarray(Ppr,dtype=float))
+
+    shape = T.shape
+
+    T,P = T.ravel(),P.ravel()
+
+    C1 = A1+A2/T+A3/T**3+A4/T**4+A5/T**5
+    C2 = A6+A7/T+A8/T**2
+    C3 = A9*(A7/T+A8/T**2)
+    C4 = A10/T**3
+    C5 = 0.27*P/T
+
+    rho = C5.copy()
+
+    active = np.flatnonzero(P>0)
+
+    for _ in range(maxiter):
+
+        if active.size==0:
+            break
+
+        r,c1,c2,c3,c4,c5 = rho[active],C1[active],C2[active],C3[active],C4[active],C5[active]
+
+        r2 = r**2
+        ex = np.exp(-A11*r2)
+
+        F = 1+c1*r+c2*r2-c3*r2**2*r+c4*(1+A11*r2)*r2*ex-c5/r
+        dF = c1+2*c2*r-5*c3*r2**2+c4*ex*(2*r+2*A11*r2*r-2*A11**2*r2**2*r)+c5/r2
+
+        dr = F/dF
+
+        rho[active] = r-dr
+
+        active = active[np.abs(dr)>tol*np.abs(r)]
+
+    z = np.ones(T.shape)
+
+    z[P>0] = C5[P>0]/rho[P>0]
+
+    return z.reshape(shape)
+
+def hall_yarborough(Tpr:float|np.ndarray,Ppr:float|np.ndarray,tol:float=1e-12,maxiter:int=50) -> np.ndarray:
+    """Returns the gas compressibility factor by the Hall and Yarborough (1973) equation
+    of state.
+
+    The equation is solved for the reduced density with Newton iterations applied to the
+    whole array at once, updating only the elements that have not yet converged. Steps
+    leaving the physical interval (0,1) are halved back towards the previous iterate.
+
+    Args:
+        Tpr (float|np.ndarray): Pseudo-reduced temperature.
+        Ppr (float|np.ndarray): Pseudo-reduced pressure, broadcast against Tpr.
+        tol (float, optional): Relative tolerance on the reduced density.
+        maxiter (int, optional): Maximum number of Newton iterations.
+
+    Returns:
+        np.ndarray: Compressibility factor with the broadcast shape.
+
+    """
+    T,P = np.broadcast_arrays(np.asarray(Tpr,dtype=float),np.asarray(Ppr,dtype=float))
+
+    shape = T.shape
+
+    t,P = 1/T.ravel(),P.ravel()
+
+    A = 0.06125*t*np.exp(-1.2*(1-t)**2)*P
+    B = 14.76*t-9.76*t**2+4.58*t**3
+    C = 90.7*t-242.2*t**2+42.4*t**3
+    D = 2.18+2.82*t
+
+    y = np.minimum(A,0.5)
+
+    active = np.flatnonzero(P>0)
+
+    for _ in range(maxiter):
+
+        if active.size==0:
+            break
+
+        r,a,b,c,d = y[active],A[active],B[active],C[active],D[active]
+
+        F = -a+(r+r**2+r**3-r**4)/(1-r)**3-b*r**2+c*r**d
+        dF = (1+4*r+4*r**2-4*r**3+r**4)/(1-r)**4-2*b*r+c*d*r**(d-1)
+
+        rn = r-F/dF
+
+        rn = np.where(rn<=0,r/2,np.where(rn>=1,(1+r)/2,rn))
+
+        y[active] = rn
+
+        active = active[np.abs(rn-r)>tol*np.abs(r)]
+
+    z = np.ones(P.shape)
+
+    z[P>0] = A[P>0]/y[P>0]
+
+    return z.reshape(shape)
+
+class ZTable():
+    """
+    Precomputed compressibility factor of a gas over a (pressure, temperature) grid.
+
+    The table is built once per gas gravity with the Dranchuk and Abou-Kassem equation
+    and evaluated by vectorized bilinear interpolation. The number of interpolation
+    calls and interpolated points are counted for performance reporting.
+
+    Attributes:
+        gas_grav (float)       : Gas specific gravity (air=1).
+        pressures (np.ndarray) : Pressure nodes, Pa.
+        temperatures (np.ndarray): Temperature nodes, K.
+        values (np.ndarray)    : Compressibility factors of shape (pressures, temperatures).
+        calls (int)            : Number of interpolation calls.
+        lookups (int)          : Number of interpolated points.
+
+    """
+
+    def __init__(self,gas_grav:float,pressures:np.ndarray=None,temperatures:np.ndarray=None):
+        """Builds the table for the gas gravity on the pressure (Pa) and temperature (K) nodes."""
+        self.gas_grav = gas_grav
+
+        self.pressures = np.linspace(1e5,5e7,400) if pressures is None else np.asarray(pressures,dtype=float)
+        self.temperatures = np.linspace(250.,450.,41) if temperatures is None else np.asarray(temperatures,dtype=float)
+
+        Tpc,Ppc = pseudo_critical(gas_grav)
+
+        Tpr = self.temperatures*1.8/Tpc
+        Ppr = self.pressures/6894.76/Ppc
+
+        self.values = zfactor(Tpr[None,:],Ppr[:,None])
+
+        self.calls = 0
+        self.lookups = 0
+
+    def __call__(self,P:float|np.ndarray,T:float|np.ndarray) -> np.ndarray:
+        """Returns the compressibility factor at pressures in Pa and temperatures in K."""
+        P,T = np.broadcast_arrays(np.asarray(P,dtype=float),np.asarray(T,dtype=float))
+
+        i,u = _locate(self.pressures,P)
+        j,v = _locate(self.temperatures,T)
+
+        Z = self.values
+
+        self.calls += 1
+        self.lookups += P.size
+
+        return (1-u)*((1-v)*Z[i,j]+v*Z[i,j+1])+u*((1-v)*Z[i+1,j]+v*Z[i+1,j+1])
+
+    def reset(self):
+        """Sets the lookup counters to zero."""
+        self.calls = 0
+        self.lookups = 0
+
+def _locate(nodes,x):
+    """Returns the cell index and the fractional position of x on the nodes."""
+    i = np.clip(np.searchsorted(nodes,x)-1,0,nodes.size-2)
+
+    return i,(x-nodes[i])/(nodes[i+1]-nodes[i])
@@ -0,0 +1 @@
+from ._network import Network, NetworkSolution
\ No newline at end of file
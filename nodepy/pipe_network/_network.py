@@ -0,0 +1,251 @@
+import time
+
+from typing import NamedTuple
+
+import numpy as np
+
+from scipy import sparse
+from scipy.sparse import linalg
+
+from respy import Fluid
+
+from ..pressure_drop._pipe import Pipe
+from ..pressure_drop._pipe_array import PipeArray
+from ..pressure_drop._darcy_weisbach import DarcyWeisbach
+from ..pressure_drop._hazen_williams import HazenWilliams
+
+class NetworkSolution(NamedTuple):
+    """Flows and heads of a solved pipe network in SI units.
+
+    Attributes:
+        flows (np.ndarray)    : Pipe flow rates in the order of addition, m³/s.
+        heads (np.ndarray)    : Node hydraulic heads in the order of addition, m.
+        pressures (np.ndarray): Node pressures, Pa.
+        iterations (int)      : Number of Newton iterations.
+        converged (bool)      : True if the tolerance was met.
+        residuals (list)      : Maximum relative flow correction of each iteration.
+        timings (list)        : Wall time of each iteration, seconds.
+
+    """
+    flows: np.ndarray
+    heads: np.ndarray
+    pressures: np.ndarray
+    iterations: int
+    converged: bool
+    residuals: list
+    timings: list
+
+class Network():
+    """
+    Steady-state pipe network solved for all pipe flows and junction heads at once
+    with the global gradient algorithm of Todini and Pilati (1988).
+
+    Nodes are either junctions with a fixed demand (unknown head) or boundaries with
+    a fixed pressure (known head). Each Newton iteration assembles the reduced
+    Schur complement A21*inv(D)*A12 as a sparse matrix, solves it for the head
+    correction, and updates the flows, where D holds the head-loss derivatives of
+    all pipes evaluated in one vectorized call.
+
+    Attributes:
+        fluid (Fluid)   : Fluid flowing in the network.
+        model (str)     : Head loss model, "darcy" or "hazen".
+        method (str)    : All-regime Darcy-Weisbach friction method, "churchill" or "moody".
+        pipe (PipeArray): Geometry of all pipes, built by assemble().
+        solution        : The last NetworkSolution used for warm starts. It is kept when
+                          demands or fixed pressures change through set_demand() and
+                          set_pressure(), and dropped when nodes or pipes are added.
+
+    """
+    GRAVITY = 9.80665
+
+    def __init__(self,fluid:Fluid,model:str="darcy",method:str="churchill"):
+        """Initializes an empty network.
+
+        Args:
+            fluid (Fluid): A Fluid object with the density and viscosity.
+            model (str, optional): "darcy" for Darcy-Weisbach or "hazen" for Hazen-Williams (default="darcy").
+            method (str, optional): Friction method of the Darcy-Weisbach model (default="churchill").
+
+        """
+        if method not in DarcyWeisbach.ALL_REGIME_METHODS:
+            raise ValueError(f"Network friction method must be one of {DarcyWeisbach.ALL_REGIME_METHODS}.")
+
+        self.fluid = fluid
+        self.model = model
+        self.method = method
+
+        self.nodes = {}
+        self.pipes = {}
+
+        self.solution = None
+
+    def add_node(self,name,elevation:float=0.,demand:float=0.,pressure:float=None):
+        """Adds a node to the network.
+
+        Args:
+            name: Unique node label.
+            elevation (float, optional): Node elevation, m.
+            demand (float, optional): Flow withdrawn from the node, m³/s, negative for supply.
+            pressure (float, optional): Fixed pressure of a boundary node, Pa.
+
+        """
+        self.nodes[name] = (elevation,demand,pressure)
+
+        self.solution = None
+
+    def set_demand(self,name,demand:float):
+        """Changes the demand of an existing node, m³/s, keeping the last solution for a
+        warm start since the topology is unchanged."""
+        elevation,_,pressure = self.nodes[name]
+
+        self.nodes[name] = (elevation,demand,pressure)
+
+    def set_pressure(self,name,pressure:float):
+        """Changes the fixed pressure of an existing node, Pa, keeping the last solution for
+        a warm start since the topology is unchanged."""
+        elevation,demand,_ = self.nodes[name]
+
+        self.nodes[name] = (elevation,demand,pressure)
+
+    def add_pipe(self,name,start,end,pipe:Pipe,C:float=120.):
+        """Adds a pipe between two existing nodes, positive flow is from start to end.
+
+        Args:
+            name: Unique pipe label.
+            start: Label of the upstream node.
+            end: Label of the downstream node.
+            pipe (Pipe): Pipe geometry and relative roughness.
+            C (float, optional): Hazen-Williams roughness coefficient (default=120).
+
+        """
+        for node in (start,end):
+            if node not in self.nodes:
+                raise KeyError(f"Node {node} is not in the network.")
+
+        self.pipes[name] = (start,end,pipe,C)
+
+        self.solution = None
+
+    def assemble(self):
+        """Builds the incidence matrices and the pipe property arrays."""
+        names = list(self.nodes)
+        index = {name:i for i,name in enumerate(names)}
+
+        elevation,demand,pressure = (np.array(v,dtype=float) for v in zip(
+            *((z,q,np.nan if p is None else p) for z,q,p in self.nodes.values())))
+
+        fixed = ~np.isnan(pressure)
+
+        if not fixed.any():
+            raise ValueError("Network needs at least one fixed-pressure node.")
+
+        start = np.array([index[p[0]] for p in self.pipes.values()])
+        end = np.array([index[p[1]] for p in self.pipes.values()])
+
+        npipe,nnode = start.size,len(names)
+
+        rows = np.concatenate((np.arange(npipe),np.arange(npipe)))
+        cols = np.concatenate((start,end))
+        vals = np.concatenate((-np.ones(npipe),np.ones(npipe)))
+
+        A = sparse.csr_matrix((vals,(rows,cols)),shape=(npipe,nnode))
+
+        self._A12 = A[:,np.flatnonzero(~fixed)].tocsr()
+        self._A10 = A[:,np.flatnonzero(fixed)].tocsr()
+        self._A21 = self._A12.T.tocsr()
+
+        self._fixed = fixed
+        self._elevation = elevation
+        self._demand = demand[~fixed]
+        self._head0 = elevation[fixed]+pressure[fixed]/(self.fluid._rho*self.GRAVITY)
+
+        self.pipe = PipeArray.from_pipes([p[2] for p in self.pipes.values()])
+
+        self._C = np.array([p[3] for p in self.pipes.values()],dtype=float)
+
+    def head_loss(self,flows:np.ndarray):
+        """Returns head losses of all pipes and their derivatives with respect to flow.
+
+        The derivative of the Darcy-Weisbach loss h = K*f(Re)*Q|Q| is n*h/Q with the local
+        exponent n = 2+dln(f)/dln(Re), so laminar, transition and turbulent pipes get the
+        correct Newton slope. The flow magnitude is floored to keep the slopes finite at
+        zero flow.
+
+        """
+        Q = np.maximum(np.abs(flows),1e-10)
+
+        if self.model=="hazen":
+            r = HazenWilliams.resistance(self.pipe._ll,self.pipe._di,self._C)
+            n = HazenWilliams.EXPONENT
+            hQ = r*Q**(n-1)
+        else:
+            friction = getattr(DarcyWeisbach,self.method)
+            Re = (4*self.fluid._rho*Q)/(np.pi*self.fluid._visc*self.pipe._di)
+            f = friction(Re,self.pipe._rr)
+            n = 2+np.log(friction(Re*1.001,self.pipe._rr)/f)/np.log(1.001)
+            K = 8*self.pipe._ll/(self.GRAVITY*np.pi**2*self.pipe._di**5)
+            hQ = K*f*Q
+
+        return hQ*flows,n*hQ
+
+    def solve(self,warm:bool=True,tol:float=1e-8,maxiter:int=50) -> NetworkSolution:
+        """Solves the network with the global gradient Newton method.
+
+        Args:
+            warm (bool, optional): Start from the previous solution when available (default=True).
+            tol (float, optional): Tolerance on the maximum relative flow correction.
+            maxiter (int, optional): Maximum number of Newton iterations.
+
+        Returns:
+            NetworkSolution: Flows, heads, pressures and iteration statistics.
+
+        """
+        self.assemble()
+
+        if warm and self.solution is not None and self.solution.heads.size==self._fixed.size:
+            Q = self.solution.flows.copy()
+            H = self.solution.heads[~self._fixed].copy()
+        else:
+            Q = np.pi*self.pipe._di**2/4*0.3 # 0.3 m/s initial velocity
+            H = np.full(self._demand.size,self._head0.max())
+
+        residuals,timings = [],[]
+
+        converged = False
+
+        for _ in range(maxiter):
+
+            tic = time.perf_counter()
+
+            h,dh = self.head_loss(Q)
+
+            F1 = h+self._A12@H+self._A10@self._head0
+            F2 = self._A21@Q-self._demand
+
+            Dinv = sparse.diags(1/dh)
+
+            S = (self._A21@Dinv@self._A12).tocsc()
+
+            dH = linalg.spsolve(S,F2-self._A21@(F1/dh))
+            dQ = -(F1+self._A12@dH)/dh
+
+            H += dH
+            Q += dQ
+
+            residuals.append(float(np.abs(dQ).max()/max(np.abs(Q).max(),1e-12)))
+            timings.append(time.perf_counter()-tic)
+
+            if residuals[-1]<tol:
+                converged = True
+                break
+
+        heads = np.empty(self._fixed.size)
+
+        heads[self._fixed] = self._head0
+        heads[~self._fixed] = H
+
+        pressures = (heads-self._elevation)*self.fluid._rho*self.GRAVITY
+
+        self.solution = NetworkSolution(Q,heads,pressures,len(timings),converged,residuals,timings)
+
+        return self.solution
@@ -141,7 +141,7 @@ class IPR():
 
         return rate1/dp1,n
 
-import psapy.FluidProps as FluidProps
+from ..fluid_props import black_oil as FluidProps
   
 def Darcy_IPR(k,h,visc, re,rw, s, P, OilFVF, nPoints):
     """Function to calculate IPR using Darcy's Equation.  It returns a list with a pair of Pressure and rates"""
@@ -1,4 +1,11 @@
 from ._pipe import Pipe
+from ._pipe_array import PipeArray
 
-from ._darcy_weisbach import DarcyWeisbach
-from ._hazen_williams import HazenWilliams
\ No newline at end of file
+from ._colebrook import ColebrookInfo
+from ._moody_table import MoodyTable
+
+from ._darcy_weisbach import DarcyWeisbach, HeadLossResult
+from ._darcy_weisbach import reynolds_number, friction_factor, head_loss, flow_rate
+from ._hazen_williams import HazenWilliams
+
+from ._compressible import Compressible
\ No newline at end of file
@@ -0,0 +1,158 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from scipy import special
+
+class ColebrookInfo(NamedTuple):
+    """Iteration statistics of the batched Colebrook solver.
+
+    Attributes:
+        method (str)          : Solution path, "newton", "halley" or "lambertw".
+        iterations (int)      : Number of sweeps.
+        evaluations (int)     : Total number of element-wise residual evaluations.
+        converged (np.ndarray): Boolean convergence flag of each element.
+        residual (float)      : Maximum absolute residual of 1/sqrt(f) at exit.
+
+    """
+    method: str
+    iterations: int
+    evaluations: int
+    converged: np.ndarray
+    residual: float
+
+LN10 = np.log(10.)
+
+SPARSE_FRACTION = 0.25 # unconverged fraction below which sweeps gather the active elements
+
+def colebrook(Re:float|np.ndarray,epd:float|np.ndarray,guess=None,method:str="halley",tol:float=1e-12,maxiter:int=20,full_output:bool=False):
+    """Solves the Colebrook equation for the whole Reynolds number array at once.
+
+    The equation is solved for x = 1/sqrt(fD) in the form
+
+        F(x) = x + 2*log10(epd/3.7 + 2.51*x/Re) = 0,
+
+    which is smooth and monotone in x. Newton or Halley corrections are applied to
+    the whole arrays in place while most elements are unconverged, and only to the
+    elements that have not yet met the tolerance once fewer than SPARSE_FRACTION of
+    them remain, so one slowly converging element does not cost a full-array update. The "lambertw" path
+    evaluates the exact solution through the Wright omega function and applies
+    a single Halley polish step to remove the cancellation error.
+
+    Args:
+        Re (float|np.ndarray): Reynolds number.
+        epd (float|np.ndarray): Relative roughness, broadcast against Re.
+        guess (callable, optional): Explicit correlation fD = guess(Re,epd) used as the
+            starting point (default=haaland).
+        method (str, optional): "halley", "newton" or "lambertw" (default="halley").
+        tol (float, optional): Relative tolerance on 1/sqrt(fD) (default=1e-12).
+        maxiter (int, optional): Maximum number of sweeps (default=20).
+        full_output (bool, optional): Also return ColebrookInfo statistics (default=False).
+
+    Returns:
+        np.ndarray: Darcy friction factor with the broadcast shape of Re and epd,
+        followed by ColebrookInfo when full_output is True.
+
+    """
+    Re,epd = np.broadcast_arrays(np.asarray(Re,dtype=float),np.asarray(epd,dtype=float))
+
+    a = (epd/3.7).ravel()
+    b = (2.51/Re).ravel()
+
+    if method=="lambertw":
+        x = _lambertw(a,b)
+        sweeps = 1
+    elif method in ("newton","halley"):
+        x = 1/np.sqrt((guess or haaland)(Re.ravel(),epd.ravel()))
+        sweeps = maxiter
+    else:
+        raise ValueError(f"Unknown Colebrook solution method: {method}")
+
+    halley = method!="newton"
+
+    active = None # all elements are swept in place until few remain unconverged
+    evaluations = 0
+    iterations = 0
+
+    while iterations<sweeps and (active is None or active.size>0):
+
+        if active is None:
+            xa,aa,ba = x,a,b
+        else:
+            xa,aa,ba = x[active],a[active],b[active]
+
+        inner = ba*xa
+        inner += aa
+
+        g = ba/inner
+
+        F = np.log(inner)
+        F *= 2/LN10
+        F += xa
+
+        dF = g*(2/LN10)
+        dF += 1
+
+        if halley:
+            # F'' = -2/ln(10)*g**2, so 2*F'**2-F*F'' = 2*F'**2+2/ln(10)*F*g**2
+            dx = F*dF
+            dx *= 2
+            g *= g
+            g *= F
+            g *= 2/LN10
+            g += 2*dF*dF
+            dx /= g
+        else:
+            dx = F/dF
+
+        pending = np.abs(dx)>tol*np.abs(xa)
+
+        evaluations += xa.size
+        iterations += 1
+
+        if active is None:
+            x -= dx
+            if np.count_nonzero(pending)<=SPARSE_FRACTION*x.size:
+                active = np.flatnonzero(pending)
+        else:
+            x[active] = xa-dx
+            active = active[pending]
+
+    if active is None:
+        active = np.flatnonzero(pending)
+
+    fD = (1/x**2).reshape(Re.shape)
+
+    if not full_output:
+        return fD
+
+    residual = np.abs(x+2*np.log10(a+b*x))
+
+    converged = np.ones(x.size,dtype=bool)
+
+    if method!="lambertw":
+        converged[active] = False
+
+    info = ColebrookInfo(method,iterations,evaluations,converged.reshape(Re.shape),
+        float(residual.max()) if residual.size else 0.)
+
+    return fD,info
+
+def _lambertw(a,b):
+    """Returns the closed-form Colebrook solution x = 1/sqrt(fD).
+
+    With c = 2/ln(10) the substitution a+b*x = exp(-x/c) turns the equation into
+    t*exp(t) = exp(a/(b*c))/(b*c), so that x = c*(omega(s)-a/(b*c)) where omega is
+    the Wright omega function and s = a/(b*c)-ln(b*c). Wright omega is used instead
+    of W(exp(s)) because exp(s) overflows for rough pipes at high Reynolds numbers.
+
+    """
+    c = 2/LN10
+
+    r = a/(b*c)
+
+    return c*(special.wrightomega(r-np.log(b*c)).real-r)
+
+def haaland(Re:float|np.ndarray,epd:float|np.ndarray) -> np.ndarray:
+    """Returns the explicit Haaland approximation of the Colebrook friction factor."""
+    return 1/(-1.8*np.log10((epd/3.7)**1.11+6.9/Re))**2
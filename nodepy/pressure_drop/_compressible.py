@@ -1,33 +1,345 @@
+import numpy as np
+
+from respy import Fluid
+
+from ..fluid_props._zfactor import ZTable
+
 from ._darcy_weisbach import DarcyWeisbach
 
 class Compressible(DarcyWeisbach):
+    """
+    Isothermal flow of an ideal or real gas through a pipe or an array of pipes.
+
+    The mass flow rate between the upstream and downstream pressures is
+
+        G = A*sqrt((P1²-P2²)/(2*P1*v1*(ln(P1/P2)+4*phi*L/d)))
+
+    where v1 is the upstream specific volume and phi = R/(rho*u²) is the friction
+    group (half of the Fanning friction factor). The flow rate is maximum at the
+    critical pressure ratio w = P2/P1 that satisfies
+
+        (1/w)² - 1 - 2*ln(1/w) = 8*phi*L/d,
+
+    below which the flow is choked. All methods work element-wise on arrays, so that
+    thousands of gas lines, given as a PipeArray, are evaluated in one call.
+
+    When a ZTable is given, the gas is real with density rho = P*M/(Z*R*T) and the
+    mass flux g = G/A follows from the isothermal momentum balance
+
+        g² = integral(rho dP)/(ln(rho1/rho2)+4*phi*L/d)
+
+    where the density integral is evaluated by Gauss-Legendre quadrature with all
+    compressibility factors of a call interpolated from the table at once. The choke
+    limit of the real gas is the maximum of this flow rate over the downstream pressure,
+    found by a golden-section search bracketed around the ideal critical pressure.
+
+    """
+    UGC = 8.314 # Universal gas constant (J/mol/K)
+
+    GAUSS_NODES,GAUSS_WEIGHTS = np.polynomial.legendre.leggauss(5)
+
+    def __init__(self,pipe,fluid:Fluid,temperature:float,phi:float,molarweight:float=None,ztable:ZTable=None,**kwargs):
+        """
+        Initializes the Compressible class by inheriting from DarcyWeisbach.
+
+        Args:
+            pipe (Pipe|PipeArray): Pipe geometry.
+            fluid (Fluid): Gas properties.
+            temperature (float): Gas temperature, K.
+            phi (float|np.ndarray): Friction group R/(rho*u²), half of the Fanning friction factor.
+            molarweight (float, optional): Molar weight of the gas, kg/mol. Defaults to the
+                first molar weight of the fluid.
+            ztable (ZTable, optional): Compressibility factor table of the gas. The gas is
+                ideal when it is None.
+            **kwargs: Keyword arguments passed to the parent class.
 
-    def __init__(self,*args,**kwargs):
+        """
+        super().__init__(pipe,fluid,**kwargs)
 
-        super().__init__(*args,**kwargs)
+        self.temperature = temperature
+        self.phi = phi
+
+        self.molarweight = fluid.molarweight[0] if molarweight is None else molarweight
+
+        self.ztable = ztable
+
+    @property
+    def _area(self):
+        """Returns the cross-sectional area of the pipes, m²."""
+        return np.pi*self.pipe._di**2/4
+
+    @property
+    def _fterm(self):
+        """Returns the friction term 4*phi*L/d of the pipes."""
+        return 4*self.phi*self.pipe._ll/self.pipe._di
 
     def get(self,P2,P1):
+        """Returns the mass flow rate, kg/s, for upstream and downstream pressures in Pa.
+
+        Downstream pressures below the critical one return the choked flow rate.
+
+        """
+        P1,P2 = np.broadcast_arrays(np.asarray(P1,dtype=float),np.asarray(P2,dtype=float))
+
+        P2 = np.maximum(P2,self.critical_pressure(P1))
 
-        rho1 = (P1*self.Fluid.molarweight[0])/(self.UGC*self.temperature)
-        rho2 = (P2*self.Fluid.molarweight[0])/(self.UGC*self.temperature)
+        return self._flow(P1,P2,self._area,self._fterm)
 
-        nu1 = 1/rho1
-        nu2 = 1/rho2
+    def critical_ratio(self):
+        """Returns the critical pressure ratio of the pipes for the ideal gas from the inverse table."""
+        return critical_ratio(2*self._fterm)
 
-        Dp = P1**2-P2**2
-        Rp = np.log(P1/P2)
-        Ft = 4*self.phi*self.Pipe.length/self.Pipe.diameter
-        
-        G = self.Pipe.csa*np.sqrt(Dp/(2*P1*nu1*(Rp+Ft)))
+    def critical_pressure(self,P1):
+        """Returns the downstream pressure in Pa at which the flow from P1 in Pa chokes."""
+        P1,area,fterm = np.broadcast_arrays(np.asarray(P1,dtype=float),self._area,self._fterm)
 
-        return G
+        return self._critical(P1,area,fterm)
 
     def omega(self):
+        """Returns the critical pressure ratio of the pipes."""
+        return self.critical_ratio()
+
+    def maximum(self,P1):
+        """Returns the choked mass flow rate, kg/s, for the upstream pressure in Pa."""
+        P1 = np.asarray(P1,dtype=float)
+
+        return self._flow(P1,self.critical_pressure(P1),self._area,self._fterm)
+
+    def downstream(self,P1,G,tol:float=1e-10,maxiter:int=100):
+        """Returns the downstream pressure in Pa that carries the mass flow rate G in kg/s.
+
+        The flow rate decreases monotonically from its choked value at the critical
+        pressure to zero at P1, so each element is bracketed there and solved by the
+        Illinois variant of regula falsi, iterating only the unconverged elements.
+        Rates above the choked one return NaN.
+
+        """
+        P1,G,area,fterm = np.broadcast_arrays(
+            np.asarray(P1,dtype=float),np.asarray(G,dtype=float),self._area,self._fterm)
+
+        shape = P1.shape
+
+        P1,G,area,fterm = (np.ravel(x) for x in (P1,G,area,fterm))
+
+        lower = self._critical(P1,area,fterm)
+
+        def residual(P2,index):
+            return self._flow(P1[index],P2,area[index],fterm[index])-G[index]
+
+        P2 = bracketed(residual,lower,P1.copy(),tol=tol*P1,maxiter=maxiter)
+
+        P2[G>self._flow(P1,lower,area,fterm)] = np.nan
+
+        return P2.reshape(shape)
+
+    def march(self,P1,G,segments:int=20,temperature=None,iterations:int=3):
+        """Returns the pressure profile, Pa, of the lines carrying the mass flow rate G in kg/s.
+
+        The lines are divided into equal segments, each isothermal at its own temperature,
+        and the outlet pressure of every segment is found from its inlet pressure by
+        fixed-point iterations on
+
+            P1²-P2² = 2*Zm*R*T/M*g²*(ln(P1*Z2/(P2*Z1))+4*phi*dL/d)
+
+        where Zm is the compressibility factor at the mean segment pressure. All lines
+        are marched together, so each iteration costs two table lookups. Lines that
+        choke return NaN from the choking segment onwards.
+
+        Args:
+            P1 (float|np.ndarray): Inlet pressure, Pa.
+            G (float|np.ndarray): Mass flow rate, kg/s.
+            segments (int, optional): Number of segments.
+            temperature (float|np.ndarray, optional): Temperature of each segment, K.
+                Defaults to the gas temperature.
+            iterations (int, optional): Fixed-point iterations per segment.
+
+        Returns:
+            np.ndarray: Pressures at the segment ends of shape (segments+1,)+shape.
+
+        """
+        P1,G,area,fterm = np.broadcast_arrays(
+            np.asarray(P1,dtype=float),np.asarray(G,dtype=float),self._area,self._fterm)
+
+        T = np.broadcast_to(self.temperature if temperature is None else temperature,(segments,))
+
+        RTM = 2*self.UGC/self.molarweight*(G/area)**2
+        dfterm = fterm/segments
+
+        P = np.empty((segments+1,)+P1.shape)
+
+        P[0] = P1
+
+        Zin = self._zfactor(P1,T[0])
+
+        for k in range(segments):
+
+            Pin = P[k]
+            Pout,Zout = Pin,Zin
+
+            for _ in range(iterations):
+
+                Zm = self._zfactor((Pin+Pout)/2,T[k])
+
+                with np.errstate(divide="ignore",invalid="ignore"):
+                    Pout = np.sqrt(Pin**2-Zm*RTM*T[k]*(np.log(Pin*Zout/(Pout*Zin))+dfterm))
+
+                Zout = self._zfactor(Pout,T[k])
+
+            P[k+1],Zin = Pout,Zout
+
+        return P
+
+    def _zfactor(self,P,T):
+        """Returns the compressibility factor of the gas, unity for an ideal gas."""
+        if self.ztable is None:
+            return np.ones(np.shape(P))
+
+        return self.ztable(P,T)
+
+    def _critical(self,P1,area,fterm,tol:float=1e-10):
+        """Returns the critical downstream pressures of arrays of the same shape.
+
+        The ideal gas chokes at the critical ratio. For the real gas the maximum of the
+        flow rate is searched in log P2 by golden sections on all elements at once,
+        between a quarter and four times the ideal critical pressure.
+
+        """
+        Pc = critical_ratio(2*fterm)*P1
+
+        if self.ztable is None:
+            return Pc
+
+        a,b = np.log(Pc/4),np.log(np.minimum(4*Pc,P1))
+
+        ratio = (np.sqrt(5)-1)/2
+
+        c,d = b-ratio*(b-a),a+ratio*(b-a)
+
+        flow = lambda x: self._flow(P1,np.exp(x),area,fterm)
+
+        fc,fd = flow(c),flow(d)
+
+        for _ in range(int(np.ceil(np.log(tol/np.log(16))/np.log(ratio)))):
+
+            left = fc>fd
+
+            a,b = np.where(left,a,c),np.where(left,d,b)
+
+            x = np.where(left,b-ratio*(b-a),a+ratio*(b-a))
+
+            fx = flow(x)
+
+            c,d,fc,fd = np.where(left,x,d),np.where(left,c,x),np.where(left,fx,fd),np.where(left,fc,fx)
+
+        return np.exp((a+b)/2)
+
+    def _flow(self,P1,P2,area,fterm):
+        """Returns the mass flow rate of the gas between the pressures."""
+        if self.ztable is None:
+            return self._ideal(P1,P2,area,fterm)
+
+        P1,P2 = np.broadcast_arrays(P1,P2)
+
+        Pm,dP = (P1+P2)/2,(P1-P2)/2
+
+        nodes = np.concatenate(([1.,-1.],self.GAUSS_NODES)).reshape((-1,)+(1,)*P1.ndim)
+
+        Pq = Pm+dP*nodes
+
+        Z = self._zfactor(Pq,self.temperature)
+
+        M_RT = self.molarweight/(self.UGC*self.temperature)
+
+        integral = M_RT*dP*np.tensordot(self.GAUSS_WEIGHTS,Pq[2:]/Z[2:],axes=1)
+
+        with np.errstate(divide="ignore",invalid="ignore"):
+            G = area*np.sqrt(integral/(np.log(P1*Z[1]/(P2*Z[0]))+fterm))
+
+        return np.where(P2>=P1,0.,G)
+
+    def _ideal(self,P1,P2,area,fterm):
+        """Returns the mass flow rate of the ideal gas between the pressures."""
+        v1 = (self.UGC*self.temperature)/(P1*self.molarweight)
+
+        with np.errstate(divide="ignore",invalid="ignore"):
+            G = area*np.sqrt((P1**2-P2**2)/(2*P1*v1*(np.log(P1/P2)+fterm)))
+
+        return np.where(P2>=P1,0.,G)
+
+def _critical_lhs(w):
+    """Returns (1/w)² - 1 - 2*ln(1/w), which decreases monotonically on (0,1]."""
+    return (1/w)**2-1-2*np.log(1/w)
+
+_W = np.concatenate((np.logspace(-8,-0.05,3000),1-np.logspace(-1.2,-6,1000)))
+_LOGLHS = np.log(_critical_lhs(_W))[::-1]
+_LOGW = np.log(_W)[::-1]
+
+def critical_ratio(lhs):
+    """Returns the critical pressure ratio w for the friction term lhs = 8*phi*L/d.
+
+    A monotone table of log w against log lhs, tabulated once at import, gives the
+    starting value, and three Newton steps on the exact equation polish it to machine
+    precision.
+
+    """
+    lhs = np.asarray(lhs,dtype=float)
+
+    w = np.exp(np.interp(np.log(lhs),_LOGLHS,_LOGW))
+
+    for _ in range(3):
+        w -= (_critical_lhs(w)-lhs)/((2*w**2-2)/w**3)
+
+    return w
+
+def bracketed(func,lower,upper,tol=1e-10,maxiter:int=100):
+    """Solves func(x,index) = 0 element-wise inside the brackets [lower,upper].
+
+    The Illinois variant of regula falsi is applied to all unconverged elements at
+    once. func receives the trial values and the indices of the elements they
+    belong to, and the bracket ends must have residuals of opposite signs.
+
+    """
+    a,b = np.array(lower,dtype=float),np.array(upper,dtype=float)
+
+    index = np.arange(a.size)
+
+    fa,fb = func(a,index),func(b,index)
+
+    x = np.where(np.abs(fa)<np.abs(fb),a,b)
+
+    tol = np.broadcast_to(tol,a.shape)
+
+    active = np.flatnonzero((fa!=0)&(fb!=0))
+
+    side = np.zeros(a.size,dtype=int)
+
+    for _ in range(maxiter):
+
+        if active.size==0:
+            break
+
+        aa,ba,fA,fB = a[active],b[active],fa[active],fb[active]
+
+        xa = ba-fB*(ba-aa)/(fB-fA)
+
+        fx = func(xa,active)
+
+        step = np.abs(xa-x[active])
+
+        x[active] = xa
+
+        left = fx*fA>0
+
+        a[active] = np.where(left,xa,aa)
+        b[active] = np.where(left,ba,xa)
+
+        fa[active] = np.where(left,fx,np.where(side[active]==-1,fA/2,fA))
+        fb[active] = np.where(left,np.where(side[active]==1,fB/2,fB),fx)
+
+        side[active] = np.where(left,1,-1)
 
-        def objective(wc,LHS):
-            RHS = (1/wc)**2-(np.log(1/wc))**2-1
-            return (RHS-LHS)**2
+        done = (fx==0)|(np.abs(b[active]-a[active])<tol[active])|(step<tol[active])
 
-        LHS = 8*self.phi*self.Pipe.length/self.Pipe.diameter
+        active = active[~done]
 
-        self.omega = minimize_scalar(objective,args=(LHS,),bounds=((1e-5,1)),method='bounded').x
\ No newline at end of file
+    return x
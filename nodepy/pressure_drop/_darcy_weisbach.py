@@ -1,106 +1,133 @@
+from typing import NamedTuple
+
 import numpy as np
 
-from scipy import optimize
+from ._colebrook import colebrook, haaland
+from ._moody_table import MoodyTable
 
 from ._pressure_drop import PressureDrop
 
+class HeadLossResult(NamedTuple):
+	"""Immutable result of a Darcy-Weisbach evaluation.
+
+	Attributes:
+		head_loss (np.ndarray): Head loss due to friction.
+		friction (np.ndarray) : Darcy friction factor.
+		reynolds (np.ndarray) : Reynolds number.
+		laminar (np.ndarray)  : True where the flow is laminar.
+		turbulent (np.ndarray): True where the flow is turbulent.
+
+	"""
+	head_loss: np.ndarray
+	friction: np.ndarray
+	reynolds: np.ndarray
+	laminar: np.ndarray
+	turbulent: np.ndarray
+
 class DarcyWeisbach(PressureDrop):
 	"""
 	Computes head loss and friction factor using the Darcy-Weisbach equation.
 
+	The methods keep no state between calls and delegate to the pure kernels of this
+	module, so one instance can be shared by threads. The regime limits default to the
+	class constants and can be set per instance.
+
 	Inherits from:
 		PressureDrop: A base class handling pipe and fluid properties.
 
 	Methods:
 		get(flow_rate: float) -> float:
 			Calculates the head loss due to friction.
+		rate(head_loss: float, method="colebrook") -> float:
+			Calculates the flow rate for the given head loss.
+		evaluate(flow_rate: float, method="colebrook") -> HeadLossResult:
+			Returns head loss, friction factor, Reynolds number and regime flags.
 		friction(flow_rate: float, method="colebrook") -> float:
 			Computes the Darcy friction factor based on flow regime.
 		reynolds(flow_rate: float) -> float:
 			Computes the Reynolds number.
 		
 	Static Methods:
-		colebrook(Re: float, epd: float) -> float:
-			Computes friction factor using the Colebrook equation.
+		colebrook(Re: float, epd: float, method="halley", guess="haaland") -> float:
+			Computes friction factor using the batched Colebrook solver.
 		haaland(Re: float, epd: float) -> float:
 			Computes friction factor using the Haaland equation.
 		chen(Re: float, epd: float) -> float:
 			Computes friction factor using the Chen equation.
+		moody(Re: float, epd: float) -> float:
+			Computes friction factor for all regimes from the shared Moody table.
+		churchill(Re: float, epd: float, out=None) -> float:
+			Computes friction factor for all regimes using the Churchill equation.
 	"""
 	LOWER_REYNOLDS_LIMIT = 2000
 	UPPER_REYNOLDS_LIMIT = 4000
 
-	def __init__(self,*args,**kwargs):
+	ALL_REGIME_METHODS = ("moody","churchill")
+
+	MOODY_TABLE = MoodyTable()
+
+	def __init__(self,*args,lower_limit:float=None,upper_limit:float=None,**kwargs):
 		"""
 		Initializes the DarcyWeisbach class by inheriting from PressureDrop.
 		
 		Args:
 			*args: Positional arguments passed to the parent class.
+			lower_limit (float, optional): Upper Reynolds number of laminar flow of this instance.
+			upper_limit (float, optional): Lower Reynolds number of turbulent flow of this instance.
 			**kwargs: Keyword arguments passed to the parent class.
 
 		"""
 		super().__init__(*args,**kwargs)
 
+		self.LOWER_REYNOLDS_LIMIT = DarcyWeisbach.LOWER_REYNOLDS_LIMIT if lower_limit is None else lower_limit
+		self.UPPER_REYNOLDS_LIMIT = DarcyWeisbach.UPPER_REYNOLDS_LIMIT if upper_limit is None else upper_limit
+
 	def get(self,flow_rate:float|np.ndarray,**kwargs) -> float:
 		"""Calculates the head loss due to friction using the Darcy-Weisbach equation."""
-		fD = self.friction(flow_rate,**kwargs)
+		return self.evaluate(flow_rate,**kwargs).head_loss
+
+	def evaluate(self,flow_rate:float|np.ndarray,method:str="colebrook",**kwargs):
+		"""Returns the head loss, friction factor, Reynolds number and regime flags as an
+		immutable HeadLossResult without storing anything on the instance."""
+		return head_loss(flow_rate,self.pipe,self.fluid,method,
+			self.LOWER_REYNOLDS_LIMIT,self.UPPER_REYNOLDS_LIMIT,**kwargs)
 
-		v = flow_rate/self.pipe.csa
-		g = 9.80665 # Gravitational acceleration (m/s²)
+	def rate(self,head_loss:float|np.ndarray,method:str="colebrook",**kwargs) -> np.ndarray:
+		"""Calculates the flow rate that gives the head loss, inverse of get().
 
-		return (fD * self.pipe.length * v**2) / (2*g*self.pipe.diam)
+		Args:
+			head_loss (float|np.ndarray): Allowed head loss, broadcast against the pipes.
+			method (str, optional): Friction factor method (default="colebrook").
+			**kwargs: tol and maxiter of the Newton refinement, and correlation arguments.
+
+		Returns:
+			np.ndarray: Flow rate, NaN where it falls into the transition regime.
+
+		"""
+		return flow_rate(head_loss,self.pipe,self.fluid,method,
+			self.LOWER_REYNOLDS_LIMIT,self.UPPER_REYNOLDS_LIMIT,**kwargs)
 
 	def friction(self,flow_rate:float|np.ndarray,method:str="colebrook",**kwargs):
 		"""Computes the Darcy-Weisbach friction factor based on the flow regime.
 		
 		Args:
 			flow_rate (float): Volumetric flow rate in cubic meters per second (m³/s).
-			method (str, optional): Friction factor correlation method: "colebrook", "haaland", or "chen" (default="colebrook").
+			method (str, optional): Friction factor correlation method: "colebrook", "haaland", "chen",
+				or the all-regime "moody" and "churchill" (default="colebrook").
+			**kwargs: Passed to the correlation, e.g. out= buffer of "churchill".
 
 		Returns:
-			float: Darcy friction factor.
-
-		Raises:
-			ValueError: If the Reynolds number falls in the transition regime.
+			float: Darcy friction factor, NaN in the transition regime unless an all-regime
+				method is selected.
 
 		"""
-		Re = self.reynolds(flow_rate)
-
-		fD = np.empty_like(Re)
-
-		c1 = Re<self.LOWER_REYNOLDS_LIMIT
-		c2 = np.logical_and(Re>=self.LOWER_REYNOLDS_LIMIT,Re<=self.UPPER_REYNOLDS_LIMIT)
-		c3 = Re>self.UPPER_REYNOLDS_LIMIT
-
-		fD[c1] = 64/Re[c1]
-		fD[c2] = np.nan
-		fD[c3] = getattr(self,method)(Re[c3],self.pipe.epd,**kwargs)
-
-		return fD
+		return friction_factor(self.reynolds(flow_rate),self.pipe.epd,method,
+			self.LOWER_REYNOLDS_LIMIT,self.UPPER_REYNOLDS_LIMIT,**kwargs)
 
 	def reynolds(self,flow_rate:float|np.ndarray) -> float:
-		"""Computes the Reynolds number for the given flow rate."""
-		Q = np.ravel(flow_rate)
-
-		self.__reynolds_number = (4*self.fluid._rho*Q)/(np.pi*self.fluid._visc*self.pipe.diam)
-
-		return self.__reynolds_number
-
-	@property
-	def laminar(self):
-		"""Returns True if the last calculated flow regime is laminar."""
-		flag = np.zeros(self.__reynolds_number.shape,dtype=bool)
-		flag[self.__reynolds_number<self.LOWER_REYNOLDS_LIMIT] = True
-		
-		return flag
-
-	@property
-	def turbulent(self):
-		"""Returns True if the last calculated flow regime is turbulent."""
-		flag = np.zeros(self.__reynolds_number.shape,dtype=bool)
-		flag[self.__reynolds_number>self.UPPER_REYNOLDS_LIMIT] = True
-		
-		return flag
+		"""Computes the Reynolds number for the given flow rate, keeping the broadcast
+		(pipes x rates) shape when the pipe is a PipeArray."""
+		return reynolds_number(flow_rate,self.fluid._rho,self.fluid._visc,self.pipe.diam)
 
 	@staticmethod
 	def blasius(Re:float|np.ndarray,*args,**kwargs) -> float:
@@ -108,20 +135,206 @@ class DarcyWeisbach(PressureDrop):
 		return 0.3164/Re**0.25
 
 	@staticmethod
-	def colebrook(Re:float|np.ndarray,epd:float,**kwargs) -> float:
-		"""Computes the Darcy-Weisbach friction factor using the Colebrook equation."""
-		inner = lambda phi,Re,epd: epd/3.7+2.51/Re/np.sqrt(phi)
-		func  = lambda phi,Re,epd: 1/np.sqrt(phi)+2*np.log10(inner(phi,Re,epd))
-		prime = lambda phi,Re,epd: -1/(2*phi**(3/2))*(1+2.18/(Re*inner(phi,Re,epd)))
-		
-		return optimize.newton(func,64/Re,prime,args=(Re,epd),**kwargs)
+	def colebrook(Re:float|np.ndarray,epd:float,method:str="halley",guess:str="haaland",**kwargs) -> float:
+		"""Computes the Darcy-Weisbach friction factor using the Colebrook equation.
+
+		The whole Reynolds number array is solved at once by batched Newton or Halley
+		iterations started from an explicit correlation, or by the Lambert-W closed form.
+
+		Args:
+			Re (float|np.ndarray): Reynolds number.
+			epd (float|np.ndarray): Relative roughness.
+			method (str, optional): "halley", "newton" or "lambertw" (default="halley").
+			guess (str, optional): Starting correlation, "haaland" or "chen" (default="haaland").
+			**kwargs: tol, maxiter and full_output passed to the batched solver.
+
+		Returns:
+			float: Darcy friction factor, followed by ColebrookInfo when full_output is True.
+
+		"""
+		return colebrook(Re,epd,getattr(DarcyWeisbach,guess),method=method,**kwargs)
 
 	@staticmethod
 	def haaland(Re:float|np.ndarray,epd:float) -> float:
 		"""Computes the Darcy-Weisbach friction factor using the Haaland equation."""
-		return 1/(-1.8*np.log10((epd/3.7)**1.11+6.9/Re))**2
+		return haaland(Re,epd)
 
 	@staticmethod
 	def chen(Re:float|np.ndarray,epd:float) -> float:
 		"""Computes the Darcy-Weisbach friction factor using the Chen equation."""
-		return 1/(-2*np.log10(epd/3.7065-5.0452/Re*np.log10((epd**1.1098)/2.8257+5.8506/Re**0.8981)))**2
\ No newline at end of file
+		return 1/(-2*np.log10(epd/3.7065-5.0452/Re*np.log10((epd**1.1098)/2.8257+5.8506/Re**0.8981)))**2
+
+	@staticmethod
+	def moody(Re:float|np.ndarray,epd:float) -> float:
+		"""Computes the Darcy-Weisbach friction factor by bicubic interpolation of the shared
+		Moody table, including the laminar branch and a smooth transition blend."""
+		return DarcyWeisbach.MOODY_TABLE(Re,epd)
+
+	@staticmethod
+	def churchill(Re:float|np.ndarray,epd:float,out:np.ndarray=None) -> float:
+		"""Computes the Darcy-Weisbach friction factor using the Churchill (1977) equation.
+
+		The equation spans laminar, transition and turbulent flow in one expression, so it
+		is evaluated in a single pass without regime masks. All intermediate steps are done
+		in place in the output buffer and one scratch array.
+
+		Args:
+			Re (float|np.ndarray): Reynolds number.
+			epd (float|np.ndarray): Relative roughness.
+			out (np.ndarray, optional): Preallocated buffer of the broadcast shape to hold the result.
+
+		Returns:
+			float: Darcy friction factor.
+
+		"""
+		Re = np.asarray(Re,dtype=float)
+
+		shape = np.broadcast_shapes(Re.shape,np.shape(epd))
+
+		if out is None:
+			out = np.empty(shape)
+
+		tmp = np.empty(shape)
+
+		np.divide(7,Re,out=out)
+		np.power(out,0.9,out=out)
+		np.add(out,np.multiply(epd,0.27),out=out)
+		np.log(out,out=out)
+		np.multiply(out,-2.457,out=out)
+		np.power(out,16,out=out)
+
+		np.divide(37530,Re,out=tmp)
+		np.power(tmp,16,out=tmp)
+		np.add(out,tmp,out=out)
+		np.power(out,-1.5,out=out)
+
+		np.divide(8,Re,out=tmp)
+		np.power(tmp,12,out=tmp)
+		np.add(out,tmp,out=out)
+		np.power(out,1/12,out=out)
+		np.multiply(out,8,out=out)
+
+		return out
+
+def reynolds_number(flow_rate:float|np.ndarray,rho:float,visc:float,diam:float|np.ndarray) -> np.ndarray:
+	"""Returns the Reynolds number of the flow rate, broadcast against the diameter."""
+	Q = np.atleast_1d(np.asarray(flow_rate,dtype=float))
+
+	return (4*rho*Q)/(np.pi*visc*diam)
+
+def friction_factor(Re:np.ndarray,epd:float|np.ndarray,method:str="colebrook",
+	lower:float=DarcyWeisbach.LOWER_REYNOLDS_LIMIT,upper:float=DarcyWeisbach.UPPER_REYNOLDS_LIMIT,**kwargs) -> np.ndarray:
+	"""Returns the Darcy friction factor for the flow regimes bounded by lower and upper.
+
+	Laminar points get 64/Re, transition points NaN and turbulent points the selected
+	correlation. All-regime methods are evaluated for every point without masks.
+
+	"""
+	if method in DarcyWeisbach.ALL_REGIME_METHODS:
+		return getattr(DarcyWeisbach,method)(Re,epd,**kwargs)
+
+	fD = np.empty_like(Re)
+
+	c1 = Re<lower
+	c2 = np.logical_and(Re>=lower,Re<=upper)
+	c3 = Re>upper
+
+	if np.ndim(epd)>0:
+		epd = np.broadcast_to(epd,Re.shape)[c3]
+
+	fD[c1] = 64/Re[c1]
+	fD[c2] = np.nan
+	fD[c3] = getattr(DarcyWeisbach,method)(Re[c3],epd,**kwargs)
+
+	return fD
+
+def head_loss(flow_rate:float|np.ndarray,pipe,fluid,method:str="colebrook",
+	lower:float=DarcyWeisbach.LOWER_REYNOLDS_LIMIT,upper:float=DarcyWeisbach.UPPER_REYNOLDS_LIMIT,**kwargs) -> HeadLossResult:
+	"""Returns the Darcy-Weisbach head loss of a Pipe or PipeArray as a HeadLossResult.
+
+	Args:
+		flow_rate (float|np.ndarray): Volumetric flow rate.
+		pipe (Pipe|PipeArray): Pipe geometry, read only.
+		fluid (Fluid): Fluid density and viscosity, read only.
+		method (str, optional): Friction factor method (default="colebrook").
+		lower (float, optional): Upper Reynolds number of laminar flow.
+		upper (float, optional): Lower Reynolds number of turbulent flow.
+		**kwargs: Passed to the friction correlation.
+
+	"""
+	Re = reynolds_number(flow_rate,fluid._rho,fluid._visc,pipe.diam)
+
+	fD = friction_factor(Re,pipe.epd,method,lower,upper,**kwargs)
+
+	v = flow_rate/pipe.csa
+	g = 9.80665 # Gravitational acceleration (m/s²)
+
+	return HeadLossResult((fD * pipe.length * v**2) / (2*g*pipe.diam),fD,Re,Re<lower,Re>upper)
+
+def flow_rate(head_loss:float|np.ndarray,pipe,fluid,method:str="colebrook",
+	lower:float=DarcyWeisbach.LOWER_REYNOLDS_LIMIT,upper:float=DarcyWeisbach.UPPER_REYNOLDS_LIMIT,
+	tol:float=1e-10,maxiter:int=50,**kwargs) -> np.ndarray:
+	"""Returns the flow rate of a Pipe or PipeArray for the given head loss.
+
+	With h = fD*A*Q**2 and Re = B*Q, a known head loss fixes Re*sqrt(fD) = B*sqrt(h/A),
+	so the Colebrook equation gives the turbulent rate explicitly (the Swamee-Jain form)
+	and the laminar rate is Q = h*B/(64*A). The turbulent start is exact for "colebrook";
+	for other methods it is refined by Newton iterations batched over the unconverged
+	elements, using the local exponent n = 2+dln(fD)/dln(Re) for the slope. All-regime
+	methods are iterated as they are, while for the others the laminar solution is taken
+	below the lower limit and rates whose head loss falls into the gap are NaN.
+
+	"""
+	g = 9.80665 # Gravitational acceleration (m/s²)
+
+	A = pipe.length/(2*g*pipe.diam*pipe.csa**2)
+	B = (4*fluid._rho)/(np.pi*fluid._visc*pipe.diam)
+
+	epd = 0. if pipe.epd is None else pipe.epd
+
+	h,A,B,epd = np.broadcast_arrays(np.asarray(head_loss,dtype=float),A,B,epd)
+
+	shape = h.shape
+
+	h,A,B,epd = (np.ravel(x) for x in (h,A,B,epd))
+
+	S = np.sqrt(h/A)
+
+	Q = -2*S*np.log10(epd/3.7+2.51/(B*S))
+
+	laminar = h*B/(64*A)
+
+	turbulent = B*Q>lower
+
+	if method in DarcyWeisbach.ALL_REGIME_METHODS:
+		friction = lambda Re,epd: friction_factor(Re,epd,method,lower,upper,**kwargs)
+		Q[~turbulent] = laminar[~turbulent]
+		active = np.arange(Q.size)
+	else:
+		friction = lambda Re,epd: getattr(DarcyWeisbach,method)(Re,epd,**kwargs)
+		active = np.flatnonzero(turbulent) if method!="colebrook" else np.empty(0,dtype=int)
+
+	for _ in range(maxiter):
+
+		if active.size==0:
+			break
+
+		Qa,Aa,Ba,ea = Q[active],A[active],B[active],epd[active]
+
+		f = friction(Ba*Qa,ea)
+		n = 2+np.log(friction(Ba*Qa*1.001,ea)/f)/np.log(1.001)
+
+		dQ = (f*Aa*Qa**2-h[active])/(n*f*Aa*Qa)
+
+		Q[active] = Qa-dQ
+
+		active = active[np.abs(dQ)>tol*np.abs(Qa)]
+
+	if method in DarcyWeisbach.ALL_REGIME_METHODS:
+		return Q.reshape(shape)
+
+	Q[~(B*Q>upper)] = np.nan
+
+	Q[B*laminar<lower] = laminar[B*laminar<lower]
+
+	return Q.reshape(shape)
\ No newline at end of file
@@ -2,6 +2,8 @@ from ._pressure_drop import PressureDrop
 
 class HazenWilliams(PressureDrop):
 
+	EXPONENT = 1.852
+
 	def __init__(self,*args,**kwargs):
 		"""
 		Initializes the HazenWilliams class by inheriting from PressureDrop.
@@ -15,4 +17,13 @@ class HazenWilliams(PressureDrop):
 
 	def get(self,flow_rate,C:float=120.):
 		"""Returns the head loss due to friction."""
-		return (10.67 * self.pipe.length * flow_rate**1.852) / (C**1.852 * self.pipe.diam**4.87)
\ No newline at end of file
+		return self.resistance(self.pipe.length,self.pipe.diam,C) * flow_rate**self.EXPONENT
+
+	def rate(self,head_loss,C:float=120.):
+		"""Returns the flow rate that gives the head loss, inverse of get()."""
+		return (head_loss/self.resistance(self.pipe.length,self.pipe.diam,C))**(1/self.EXPONENT)
+
+	@staticmethod
+	def resistance(length,diam,C:float=120.):
+		"""Returns the resistance coefficient r of the head loss h = r*Q**1.852."""
+		return (10.67 * length) / (C**1.852 * diam**4.87)
\ No newline at end of file
@@ -0,0 +1,256 @@
+import threading
+
+import numpy as np
+
+from scipy import interpolate
+
+from ._colebrook import colebrook
+
+class MoodyTable():
+    """Cached Moody chart for fast evaluation of the Darcy friction factor.
+
+    The turbulent branch is the Colebrook equation tabulated in (log10 Re, log10 epd)
+    and evaluated by vectorized bicubic spline interpolation of log fD. Each decade of
+    relative roughness is a separate bucket that is built on its first use, and smooth
+    pipes (epd=0) have their own one-dimensional table. The grid of a bucket is refined
+    until the relative error against the converged Colebrook solution, sampled at every
+    eighth of the cells along both axes, edge midpoints and centers included, is below
+    the tolerance, which is therefore the stated maximum error of the table.
+
+    Below the lower Reynolds limit the laminar 64/Re is returned, and the transition
+    band is a smoothstep blend in log Re of the laminar and Colebrook values. Points
+    outside the tabulated ranges are evaluated with the exact Colebrook solver.
+
+    The table is shared by all DarcyWeisbach instances, so building buckets and caching
+    slices are guarded by a lock and the table may be evaluated from several threads.
+
+    Attributes:
+        tolerance (float): Maximum relative error of the turbulent branch.
+        buckets (dict)   : Built interpolants keyed by roughness decade (None for smooth pipes).
+        errors (dict)    : Maximum relative error of each built bucket at the eighths of
+                           its cells, within a percent of the dense maximum.
+        slices (dict)    : Cached fixed-roughness cubics keyed by relative roughness, at
+                           most MAX_CACHED of them.
+
+    """
+    LOWER_REYNOLDS_LIMIT = 2000
+    UPPER_REYNOLDS_LIMIT = 4000
+
+    REYNOLDS_RANGE = (2000,1e8)
+    ROUGHNESS_RANGE = (1e-7,1e-1)
+
+    MAX_SLICES = 64 # distinct roughnesses of one call evaluated on slices
+    MAX_CACHED = 256 # slices kept in the cache, the oldest is dropped first
+
+    def __init__(self,tolerance:float=1e-5):
+        """Initializes an empty table with the given maximum relative error."""
+        self.tolerance = tolerance
+
+        self.buckets = {}
+        self.errors = {}
+        self.slices = {}
+
+        self._lock = threading.RLock()
+
+    def __call__(self,Re:float|np.ndarray,epd:float|np.ndarray) -> np.ndarray:
+        """Returns the Darcy friction factor for all flow regimes."""
+        Re,epd = np.broadcast_arrays(np.asarray(Re,dtype=float),np.asarray(epd,dtype=float))
+
+        fD = np.empty(Re.shape)
+
+        turb = Re>=self.LOWER_REYNOLDS_LIMIT
+
+        fD[~turb] = 64/Re[~turb]
+        fD[turb] = self.turbulent(Re[turb],epd[turb])
+
+        blend = turb&(Re<self.UPPER_REYNOLDS_LIMIT)
+
+        s = np.log(Re[blend]/self.LOWER_REYNOLDS_LIMIT)/np.log(self.UPPER_REYNOLDS_LIMIT/self.LOWER_REYNOLDS_LIMIT)
+        s = s**2*(3-2*s)
+
+        fD[blend] = (1-s)*64/Re[blend]+s*fD[blend]
+
+        return fD
+
+    @property
+    def max_error(self) -> float:
+        """Returns the largest verified relative error of the built buckets."""
+        return max(self.errors.values(),default=0.)
+
+    def turbulent(self,Re:np.ndarray,epd:np.ndarray) -> np.ndarray:
+        """Returns the tabulated Colebrook friction factor."""
+        fD = np.empty(Re.shape)
+
+        inside = (Re>=self.REYNOLDS_RANGE[0])&(Re<=self.REYNOLDS_RANGE[1])
+        inside &= (epd==0)|((epd>=self.ROUGHNESS_RANGE[0])&(epd<self.ROUGHNESS_RANGE[1]))
+
+        if inside.all():
+            fD[...] = self.lookup(Re,epd)
+        else:
+            fD[inside] = self.lookup(Re[inside],epd[inside])
+            fD[~inside] = colebrook(Re[~inside],epd[~inside])
+
+        return fD
+
+    def lookup(self,Re:np.ndarray,epd:np.ndarray) -> np.ndarray:
+        """Evaluates the cached roughness slices of the table.
+
+        A uniform roughness is detected by one comparison and evaluated on its slice
+        without sorting. Otherwise the distinct roughnesses are found once and all points
+        are evaluated in one gather over the stacked coefficients of their slices. When
+        there are more distinct roughnesses than MAX_SLICES, the exact Colebrook solver,
+        which is faster than the bicubic buckets at scattered roughnesses, is used.
+
+        """
+        if epd.size==0 or np.all(epd==epd.flat[0]):
+            return self.slice(float(epd.flat[0]) if epd.size else 0.)(Re)
+
+        # a leading sample rejects scattered roughnesses before the full sort
+        if np.unique(epd.flat[:16*self.MAX_SLICES]).size>self.MAX_SLICES:
+            return colebrook(Re,epd)
+
+        values,inverse = np.unique(epd,return_inverse=True)
+
+        if values.size>self.MAX_SLICES:
+            return colebrook(Re,epd)
+
+        return _HermiteSlice.stack([self.slice(float(value)) for value in values])(Re,inverse.reshape(Re.shape))
+
+    def slice(self,epd:float):
+        """Returns the cubic in log10 Re of the table at fixed roughness.
+
+        The bicubic spline restricted to one roughness is a cubic spline in log10 Re, so
+        its Hermite form built from the values and slopes at the grid nodes reproduces
+        it exactly while evaluating with one gather and a Horner step per point.
+
+        """
+        with self._lock:
+
+            piece = self.slices.get(epd)
+
+            if piece is None:
+
+                key = None if epd==0 else int(np.floor(np.log10(epd)))
+
+                spline = self.bucket(key)
+
+                x = spline.nodes
+
+                if key is None:
+                    y,dy = spline(x),spline(x,1)
+                else:
+                    y = spline(x,np.log10(epd),grid=False)
+                    dy = spline(x,np.log10(epd),dx=1,grid=False)
+
+                if len(self.slices)>=self.MAX_CACHED:
+                    del self.slices[next(iter(self.slices))]
+
+                piece = self.slices[epd] = _HermiteSlice(x,y,dy)
+
+        return piece
+
+    def bucket(self,key:int|None):
+        """Returns the interpolant of the roughness decade, building it on first use."""
+        with self._lock:
+
+            if key not in self.buckets:
+                self.buckets[key],self.errors[key] = self.build(key)
+
+            return self.buckets[key]
+
+    def build(self,key:int|None,nre:int=16,nepd:int=4):
+        """Builds the interpolant of a roughness decade by grid doubling.
+
+        Args:
+            key (int|None): Decade exponent of the relative roughness, None for smooth pipes.
+            nre (int, optional): Initial number of nodes per decade of Reynolds number.
+            nepd (int, optional): Initial number of nodes per decade of relative roughness.
+
+        Returns:
+            tuple: Interpolant and its maximum relative error at the eighths of the cells.
+
+        """
+        lower,upper = np.log10(self.REYNOLDS_RANGE)
+
+        while True:
+
+            x = np.linspace(lower,upper,int(np.ceil((upper-lower)*nre))+1)
+            xs = _eighths(x)
+
+            if key is None:
+                spline = interpolate.make_interp_spline(x,self.exact(x,None),k=3)
+                error = np.abs(np.expm1(spline(xs)-self.exact(xs,None))).max()
+            else:
+                y = np.linspace(key,key+1,nepd+1)
+                ys = _eighths(y)
+                spline = interpolate.RectBivariateSpline(x,y,self.exact(x,y),kx=3,ky=3,s=0)
+                error = np.abs(np.expm1(spline(xs,ys)-self.exact(xs,ys))).max()
+
+            if error<=self.tolerance:
+                spline.nodes = x
+                return spline,float(error)
+
+            nre,nepd = 2*nre,2*nepd
+
+    @staticmethod
+    def exact(x:np.ndarray,y:np.ndarray|None) -> np.ndarray:
+        """Returns log fD of converged Colebrook on the (log10 Re, log10 epd) grid."""
+        if y is None:
+            return np.log(colebrook(10**x,0.))
+
+        X,Y = np.meshgrid(x,y,indexing="ij")
+
+        return np.log(colebrook(10**X,10**Y))
+
+def _eighths(x:np.ndarray) -> np.ndarray:
+    """Returns the nodes and the points at every eighth of their intervals."""
+    return np.append((x[:-1,None]+np.diff(x)[:,None]*np.arange(8)/8).ravel(),x[-1])
+
+class _HermiteSlice():
+    """Piecewise cubic of log fD on a uniform log10 Re grid."""
+
+    def __init__(self,x,y,dy):
+
+        self.x0,self.dx = x[0],x[1]-x[0]
+
+        h = self.dx
+
+        dy0,dy1 = dy[:-1]*h,dy[1:]*h
+        y0,y1 = y[:-1],y[1:]
+
+        self.c3 = 2*(y0-y1)+dy0+dy1
+        self.c2 = 3*(y1-y0)-2*dy0-dy1
+        self.c1 = dy0
+        self.c0 = y0
+
+    def __call__(self,Re,key=None):
+        """Evaluates the cubic, or the stacked cubics of the keys for a stack."""
+        if key is None:
+            x0,dx,size,offset = self.x0,self.dx,self.c0.size,0
+        else:
+            x0,dx,size,offset = self.x0[key],self.dx[key],self.size[key],self.offset[key]
+
+        u = (np.log10(Re)-x0)/dx
+
+        i = np.minimum(u.astype(int),size-1)
+
+        t = u-i
+
+        i = i+offset
+
+        return np.exp(((self.c3[i]*t+self.c2[i])*t+self.c1[i])*t+self.c0[i])
+
+    @classmethod
+    def stack(cls,slices):
+        """Returns the slices as one piecewise cubic indexed by slice number."""
+        stacked = cls.__new__(cls)
+
+        stacked.x0 = np.array([piece.x0 for piece in slices])
+        stacked.dx = np.array([piece.dx for piece in slices])
+        stacked.size = np.array([piece.c0.size for piece in slices])
+        stacked.offset = np.concatenate(([0],np.cumsum(stacked.size)[:-1]))
+
+        for name in ("c3","c2","c1","c0"):
+            setattr(stacked,name,np.concatenate([getattr(piece,name) for piece in slices]))
+
+        return stacked
@@ -0,0 +1,119 @@
+from functools import cached_property
+
+import numpy as np
+
+from ._pipe import Pipe
+
+class PipeArray():
+    """A struct-of-arrays collection of cylindrical pipes.
+
+    The diameters, lengths and relative roughnesses are stored as contiguous NumPy
+    arrays in SI units, and all derived geometry is computed once at construction.
+    Properties have the same names and units as those of Pipe but are returned as
+    (N,1) columns, converted on first access and cached, so that pressure drop models
+    broadcast them against a row of flow rates and return (pipes x rates) results.
+
+    Attributes:
+        di (np.ndarray) : The inner diameters of the pipes, inch.
+        ll (np.ndarray) : The lengths of the pipes (default is 1.0), feet.
+        rr (np.ndarray) : Relative roughnesses of the pipes (default is 0.0).
+
+    """
+    def __init__(self,di:np.ndarray,ll:np.ndarray=1.,rr:np.ndarray=None):
+        """Initializes a PipeArray with diameters, lengths, and relative roughnesses."""
+        di,ll,rr = np.broadcast_arrays(
+            np.asarray(di,dtype=float),
+            np.asarray(ll,dtype=float),
+            np.asarray(0. if rr is None else rr,dtype=float))
+
+        self._di = np.ravel(di)*0.0254
+        self._ll = np.ravel(ll)*0.3048
+        self._rr = np.array(np.ravel(rr))
+
+        self._radius = self._di/2
+        self._circ = np.pi*self._di
+        self._surface = self._circ*self._ll
+        self._csa = np.pi*self._di**2/4
+        self._volume = self._csa*self._ll
+
+    @classmethod
+    def from_pipes(cls,pipes:list[Pipe]):
+        """Builds a PipeArray from a sequence of Pipe objects."""
+        size = len(pipes)
+
+        di = np.fromiter((pipe.di for pipe in pipes),dtype=float,count=size)
+        ll = np.fromiter((pipe.ll for pipe in pipes),dtype=float,count=size)
+        rr = np.fromiter((pipe.rr or 0. for pipe in pipes),dtype=float,count=size)
+
+        return cls(di,ll,rr)
+
+    def __len__(self):
+        """Returns the number of pipes."""
+        return self._di.size
+
+    def __getitem__(self,key):
+        """Returns the pipe at the index as a Pipe, or a slice of pipes as a PipeArray."""
+        if np.ndim(key)==0 and not isinstance(key,slice):
+            return Pipe(self._di[key]/0.0254,self._ll[key]/0.3048,self._rr[key])
+
+        return PipeArray(self._di[key]/0.0254,self._ll[key]/0.3048,self._rr[key])
+
+    @property
+    def diameter(self):
+        """Getter for the inner diameters."""
+        return self.di
+
+    @property
+    def diam(self):
+        """Getter for the inner diameters."""
+        return self.di
+
+    @cached_property
+    def di(self):
+        """Getter for the inner diameters, inch."""
+        return self._di[:,None]/0.0254
+
+    @property
+    def length(self):
+        """Getter for the pipe lengths."""
+        return self.ll
+
+    @cached_property
+    def ll(self):
+        """Getter for the pipe lengths, ft."""
+        return self._ll[:,None]/0.3048
+
+    @property
+    def epd(self):
+        """Getter for the relative roughnesses."""
+        return self.rr
+
+    @property
+    def rr(self):
+        """Getter for the relative roughnesses."""
+        return self._rr[:,None]
+
+    @cached_property
+    def radius(self):
+        """Getter for the pipe radii, inches."""
+        return self._radius[:,None]/0.0254
+
+    @cached_property
+    def circ(self):
+        """Getter for the pipe circumferences, ft."""
+        return self._circ[:,None]/0.3048
+
+    @cached_property
+    def surface(self):
+        """Getter for the pipe surface areas, ft2."""
+        return self._surface[:,None]/0.3048**2
+
+    @cached_property
+    def csa(self):
+        """Getter for the pipe cross-sectional-areas, ft2."""
+        return self._csa[:,None]/0.3048**2
+
+    @cached_property
+    def volume(self):
+        """Getter for the pipe volumes, ft3."""
+        return self._volume[:,None]/0.3048**3
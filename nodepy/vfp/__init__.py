@@ -0,0 +1,3 @@
+from ._vfp_table import VFPTable
+
+from ._eclipse import write_vfpprod, write_vfpinj, read_vfp
\ No newline at end of file
@@ -0,0 +1,260 @@
+import contextlib
+import re
+
+import numpy as np
+
+from ._vfp_table import VFPTable
+
+_TOKEN = re.compile(r"'[^']*'|/|[^\s/]+")
+
+_WIDTH = 100 # record lines stay within the 132 columns read by the simulator
+
+_CHUNK = 4096 # records formatted per write
+
+def write_vfpprod(file,table:VFPTable,number:int,comment:str=None):
+    """Writes a table as a VFPPROD keyword in FIELD units.
+
+    The records are formatted and written in chunks, so that the text of a large grid
+    is never held in memory as a whole. Several tables may be written to one open file.
+    The gas-oil ratios are converted from scf/stb to the Mscf/stb of the keyword.
+
+    Args:
+        file (str|file): Path or open text file.
+        table (VFPTable): Table to write.
+        number (int): Table number referred to by the wells.
+        comment (str, optional): Comment line written before the keyword.
+
+    Raises:
+        ValueError: If a bottomhole pressure is not finite.
+
+    """
+    _finite(table,"NT NW NG NA")
+
+    with _open(file,"w") as stream:
+
+        if comment is not None:
+            stream.write(f"-- {comment}\n")
+
+        stream.write("VFPPROD\n")
+        stream.write("-- table datum flo wfr gfr thp alq units type\n")
+        stream.write(f"{number} {_number(float(table.depth or 0.))} 'LIQ' 'WCT' 'GOR' 'THP' 'GRAT' 'FIELD' 'BHP' /\n")
+
+        for name,nodes in zip(("FLO","THP","WFR","GFR","ALQ"),
+            (table.flo,table.thp,table.wfr,table.gfr/1000,table.alq)):
+            stream.write(f"-- {name}\n")
+            stream.write(_wrap(nodes))
+
+        stream.write("-- NT NW NG NA BHP\n")
+
+        # records of all flow rates at each THP, WFR, GFR and ALQ node
+        bhp = np.moveaxis(table.bhp,0,-1)
+
+        index = np.indices(bhp.shape[1:-1]).reshape(3,-1).T+1
+
+        for nt,block in enumerate(bhp,start=1):
+
+            block = block.reshape(-1,table.flo.size)
+
+            for start in range(0,block.shape[0],_CHUNK):
+                stream.write("".join(
+                    f"{nt} {nw} {ng} {na} "+_wrap(values)
+                    for (nw,ng,na),values in zip(index[start:start+_CHUNK],block[start:start+_CHUNK])))
+
+        stream.write("\n")
+
+def write_vfpinj(file,table:VFPTable,number:int,flo:str="WAT",comment:str=None):
+    """Writes a table with single water cut, gas-oil ratio and lift gas nodes as a VFPINJ
+    keyword in FIELD units.
+
+    Args:
+        file (str|file): Path or open text file.
+        table (VFPTable): Table to write, its flo nodes are the injection rates.
+        number (int): Table number referred to by the wells.
+        flo (str, optional): Injected phase, 'WAT', 'GAS' or 'OIL'.
+        comment (str, optional): Comment line written before the keyword.
+
+    Raises:
+        ValueError: If the table varies with water cut, gas-oil ratio or lift gas, or if
+            a bottomhole pressure is not finite.
+
+    """
+    if table.shape[2:]!=(1,1,1):
+        raise ValueError("VFPINJ tables depend on the flow rate and wellhead pressure only.")
+
+    _finite(table,"NT")
+
+    with _open(file,"w") as stream:
+
+        if comment is not None:
+            stream.write(f"-- {comment}\n")
+
+        stream.write("VFPINJ\n")
+        stream.write("-- table datum flo thp units type\n")
+        stream.write(f"{number} {_number(float(table.depth or 0.))} '{flo}' 'THP' 'FIELD' 'BHP' /\n")
+
+        for name,nodes in zip(("FLO","THP"),(table.flo,table.thp)):
+            stream.write(f"-- {name}\n")
+            stream.write(_wrap(nodes))
+
+        stream.write("-- NT BHP\n")
+
+        for nt,values in enumerate(table.bhp[:,:,0,0,0].T,start=1):
+            stream.write(f"{nt} "+_wrap(values))
+
+        stream.write("\n")
+
+def read_vfp(file) -> dict:
+    """Reads the VFPPROD and VFPINJ keywords of a file.
+
+    The file is tokenized lazily line by line and the bottomhole pressures are written
+    record by record into the float32 array of each table, so that only one record of
+    text is held in memory at a time. Other keywords are skipped. Injection tables are
+    returned with single zero water cut, gas-oil ratio and lift gas nodes.
+
+    Args:
+        file (str|file): Path or open text file.
+
+    Returns:
+        dict: Tables by their numbers.
+
+    Raises:
+        ValueError: If a table is not in FIELD units, does not tabulate the bottomhole
+            pressure, or uses rate definitions other than LIQ, WCT, GOR and GRAT.
+
+    """
+    tables = {}
+
+    with _open(file,"r") as stream:
+
+        tokens = _tokens(stream)
+
+        for token in tokens:
+
+            if token=="VFPPROD":
+                number,table = _read_vfpprod(tokens)
+            elif token=="VFPINJ":
+                number,table = _read_vfpinj(tokens)
+            else:
+                continue
+
+            tables[number] = table
+
+    return tables
+
+def _read_vfpprod(tokens):
+    """Returns the number and the table of a VFPPROD keyword."""
+    header = _record(tokens,9)
+
+    _check(header[2:5],("LIQ","WCT","GOR"),"rate definitions")
+    _check(header[5:6],("THP",),"pressure definition")
+    _check(header[6:7],("GRAT",None),"lift definition")
+    _check(header[7:9],("FIELD","BHP"),"units and table type")
+
+    flo,thp,wfr,gfr,alq = (np.array(_record(tokens),dtype=float) for _ in range(5))
+
+    bhp = np.empty((flo.size,thp.size,wfr.size,gfr.size,alq.size),dtype=np.float32)
+
+    for _ in range(thp.size*wfr.size*gfr.size*alq.size):
+        record = _record(tokens)
+        nt,nw,ng,na = (int(float(x))-1 for x in record[:4])
+        bhp[:,nt,nw,ng,na] = np.array(record[4:],dtype=float)
+
+    return int(header[0]),VFPTable(flo,thp,wfr,1000*gfr,alq,bhp,_depth(header[1]))
+
+def _read_vfpinj(tokens):
+    """Returns the number and the table of a VFPINJ keyword."""
+    header = _record(tokens,6)
+
+    _check(header[3:6],("THP","FIELD","BHP"),"pressure definition, units and table type")
+
+    flo,thp = (np.array(_record(tokens),dtype=float) for _ in range(2))
+
+    bhp = np.empty((flo.size,thp.size,1,1,1),dtype=np.float32)
+
+    for _ in range(thp.size):
+        record = _record(tokens)
+        bhp[:,int(float(record[0]))-1,0,0,0] = np.array(record[1:],dtype=float)
+
+    return int(header[0]),VFPTable(flo,thp,0.,0.,0.,bhp,_depth(header[1]))
+
+def _tokens(stream):
+    """Yields the tokens of the lines without their comments, '/' ends a record."""
+    for line in stream:
+        yield from _TOKEN.findall(line.split("--",1)[0])
+
+def _record(tokens,size:int=None) -> list:
+    """Returns the items of the next record, with repeat counts n*x expanded and defaulted
+    items as None, padded with None to size."""
+    items = []
+
+    for token in tokens:
+
+        if token=="/":
+            break
+
+        count,star,value = token.partition("*")
+
+        if star and count.isdigit():
+            items.extend([value or None]*int(count))
+        else:
+            items.append(token)
+
+    items = [item.strip("' ").upper() or None if item is not None and item.startswith("'") else item
+        for item in items]
+
+    if size is not None:
+        items.extend([None]*(size-len(items)))
+
+    return items
+
+def _check(items,expected,name):
+    """Raises ValueError if a defined header item differs from the supported one."""
+    for item,value in zip(items,expected):
+        if item is not None and value is not None and item!=value:
+            raise ValueError(f"Unsupported VFP {name} {items}, expected {expected}.")
+
+def _depth(item):
+    """Returns the datum depth of a header item."""
+    return None if item is None else float(item)
+
+def _finite(table:VFPTable,fields:str):
+    """Raises ValueError naming the first record, by its fields, with a bottomhole
+    pressure that is not finite, before anything is written."""
+    bad = ~np.isfinite(table.bhp)
+
+    if bad.any():
+        node = np.argwhere(bad)[0]
+        record = " ".join(str(i+1) for i in node[1:1+len(fields.split())])
+        raise ValueError(f"The bottomhole pressure at flow rate node {node[0]+1} of the "
+            f"record {fields} = {record} is not finite.")
+
+def _number(value) -> str:
+    """Returns the shortest text of a number that reads back to the same value."""
+    return str(value)
+
+def _wrap(values) -> str:
+    """Returns the values of a record on lines of at most _WIDTH columns, ending with '/'."""
+    lines,line = [],""
+
+    for value in values:
+
+        text = _number(value)
+
+        if line and len(line)+len(text)>=_WIDTH:
+            lines.append(line)
+            line = " "
+
+        line += text+" "
+
+    lines.append(line)
+
+    return "\n".join(lines)+"/\n"
+
+@contextlib.contextmanager
+def _open(file,mode):
+    """Opens a path, or passes an open file through without closing it."""
+    if hasattr(file,"write" if mode=="w" else "read"):
+        yield file
+    else:
+        with open(file,mode) as stream:
+            yield stream
@@ -0,0 +1,153 @@
+import numpy as np
+
+from .. import _hagedorn_brown
+
+class VFPTable():
+    """
+    Bottomhole pressure of a well tabulated over its flow conditions.
+
+    The table holds the flowing bottomhole pressure on the grid of liquid rate (FLO),
+    wellhead pressure (THP), water cut (WFR), gas-oil ratio (GFR) and artificial lift
+    gas rate (ALQ), in the axis order of the Eclipse VFPPROD tables, as a compact float32
+    array. It is evaluated by vectorized multilinear interpolation: the cell of each
+    query is located on every axis with one searchsorted call, and the 2**5 cell corners
+    are gathered at once and contracted one axis after the other. Queries outside of
+    the grid are linearly extrapolated from the boundary cells, and axes with a single
+    node are constant.
+
+    Attributes:
+        flo (np.ndarray): Liquid rate nodes, stb/d.
+        thp (np.ndarray): Wellhead pressure nodes, psia.
+        wfr (np.ndarray): Water cut nodes, fraction.
+        gfr (np.ndarray): Gas-oil ratio nodes, scf/stb.
+        alq (np.ndarray): Lift gas rate nodes, Mscf/d.
+        bhp (np.ndarray): Bottomhole pressures of shape (flo, thp, wfr, gfr, alq), psia.
+        depth (float)   : Datum depth of the bottomhole pressures, ft.
+
+    """
+    AXES = ("flo","thp","wfr","gfr","alq")
+
+    def __init__(self,flo,thp,wfr,gfr,alq,bhp:np.ndarray,depth:float=None):
+        """Initializes the table from its axes and bottomhole pressures."""
+        for name,nodes in zip(self.AXES,(flo,thp,wfr,gfr,alq)):
+            nodes = np.atleast_1d(np.asarray(nodes,dtype=float))
+            if np.any(np.diff(nodes)<=0):
+                raise ValueError(f"VFPTable {name} nodes must be increasing.")
+            setattr(self,name,nodes)
+
+        self.bhp = np.ascontiguousarray(bhp,dtype=np.float32)
+
+        if self.bhp.shape!=self.shape:
+            raise ValueError(f"VFPTable bhp shape {self.bhp.shape} does not match the axes {self.shape}.")
+
+        self.depth = depth
+
+        strides = np.array(self.bhp.strides)//self.bhp.itemsize
+
+        # flat offsets of the 32 cell corners, single-node axes do not move
+        steps = np.where(np.array(self.shape)>1,strides,0)
+        corners = np.indices((2,)*len(self.AXES)).reshape(len(self.AXES),-1)
+
+        self._offsets = steps@corners
+
+    @property
+    def axes(self) -> tuple:
+        """Returns the node arrays in the axis order."""
+        return tuple(getattr(self,name) for name in self.AXES)
+
+    @property
+    def shape(self) -> tuple:
+        """Returns the grid shape."""
+        return tuple(nodes.size for nodes in self.axes)
+
+    @classmethod
+    def build(cls,flo,thp,wfr,gfr,alq=0.,*,gas_grav:float,oil_grav:float,wtr_grav:float,
+        ID:float,angle:float,depth:float,fwht:float,fbht:float,correlation=None,rtol:float=5e-4,pvt=None):
+        """Builds the table by integrating the traverses of all grid nodes together.
+
+        The lift gas is added to the produced gas of the whole tubing, so that the gas-oil
+        ratio of a node is GFR+1000*ALQ/qo.
+
+        Args:
+            flo, thp, wfr, gfr, alq: Increasing nodes of the liquid rate (stb/d), wellhead
+                pressure (psia), water cut, gas-oil ratio (scf/stb) and lift gas rate (Mscf/d).
+                The liquid rates must be positive and the water cuts below one.
+            gas_grav (float): Gas specific gravity.
+            oil_grav (float): API oil gravity.
+            wtr_grav (float): Water specific gravity.
+            ID (float): Tubing inner diameter, in.
+            angle (float): Tubing inclination from horizontal, degrees.
+            depth (float): Depth of the bottomhole datum, ft.
+            fwht (float): Flowing wellhead temperature, °F.
+            fbht (float): Flowing bottomhole temperature, °F.
+            correlation (callable, optional): Batch traverse with the signature of pwf_q of
+                the multiphase modules. Defaults to Hagedorn and Brown.
+            rtol (float, optional): Relative tolerance of the traverse steps.
+            pvt (PVTTable, optional): Tabulated fluid properties for the traverses, only for
+                a single GFR node without lift gas, whose GOR must be that of the table.
+
+        Returns:
+            VFPTable: Table of the bottomhole pressures.
+
+        Raises:
+            ValueError: If the rates or water cuts are out of range, or the gas-oil ratios
+                of the nodes are not the GOR of pvt.
+
+        """
+        correlation = _hagedorn_brown.pwf_q if correlation is None else correlation
+
+        axes = [np.atleast_1d(np.asarray(nodes,dtype=float)) for nodes in (flo,thp,wfr,gfr,alq)]
+
+        if np.any(axes[0]<=0) or np.any(axes[2]<0) or np.any(axes[2]>=1):
+            raise ValueError("VFPTable liquid rates must be positive and water cuts in [0,1).")
+
+        FLO,THP,WFR,GFR,ALQ = np.meshgrid(*axes,indexing="ij")
+
+        qo = FLO*(1-WFR)
+        qw = FLO*WFR
+
+        gor = GFR+1000*ALQ/qo
+
+        if pvt is not None:
+            pvt.check(gor)
+
+        bhp = correlation(THP,fwht,qo,qw,gor,gas_grav,oil_grav,wtr_grav,
+            ID,angle,depth,fbht,rtol=rtol,pvt=pvt)
+
+        return cls(*axes,bhp,depth)
+
+    def __call__(self,flo,thp,wfr,gfr,alq=0.) -> np.ndarray:
+        """Returns the interpolated bottomhole pressures in the broadcast shape of the queries."""
+        queries = np.broadcast_arrays(*(np.asarray(x,dtype=float) for x in (flo,thp,wfr,gfr,alq)))
+
+        shape = queries[0].shape
+
+        base = np.zeros(queries[0].size,dtype=np.intp)
+
+        weights = []
+
+        for nodes,stride,x in zip(self.axes,self.bhp.strides,queries):
+
+            i,t = _cell(nodes,x.ravel())
+
+            base += i*(stride//self.bhp.itemsize)
+
+            weights.append(t)
+
+        values = self.bhp.ravel()[base[:,None]+self._offsets].astype(float)
+
+        # contract the corners one axis after the other, the last axis varies fastest
+        for t in reversed(weights):
+            values = values.reshape(base.size,-1,2)
+            values = values[:,:,0]+t[:,None]*(values[:,:,1]-values[:,:,0])
+
+        return values.reshape(shape)
+
+def _cell(nodes,x):
+    """Returns the cell index and the fractional position of x on increasing nodes."""
+    if nodes.size==1:
+        return np.zeros(x.shape,dtype=np.intp),np.zeros(x.shape)
+
+    i = np.clip(np.searchsorted(nodes,x,side="right")-1,0,nodes.size-2)
+
+    return i,(x-nodes[i])/(nodes[i+1]-nodes[i])
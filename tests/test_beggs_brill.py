@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+
+from nodepy import _beggs_brill as bb
+
+class TestVectorized(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        n = 500
+        self.args = (
+            rng.uniform(100,4000,n),        # P, psia
+            rng.uniform(60,250,n),          # T, °F
+            rng.uniform(10,5000,n),         # oil rate, stb/d
+            rng.uniform(0,3000,n),          # water rate, stb/d
+            rng.uniform(50,3000,n),         # GOR, scf/stb
+            0.65,35,1.07,
+            rng.uniform(1.5,6,n),           # ID, in
+            rng.choice([90,45,0,-45],n),    # angle, degrees
+            )
+
+    def test_scalar_agreement(self):
+        P,T,qo,qw,gor,gg,api,wg,d,angle = self.args
+        scalar = np.array([bb.Pgrad(*point,gg,api,wg,di,theta) for *point,di,theta in zip(P,T,qo,qw,gor,d,angle)])
+        np.testing.assert_allclose(bb.pgrad(*self.args),scalar,rtol=1e-13)
+
+    def test_state(self):
+        P,T,qo,qw,gor,gg,api,wg,d,angle = self.args
+        state = bb.fluid_state(P,T,gor,gg,api,wg)
+        np.testing.assert_array_equal(bb.pgrad(*self.args,state=state),bb.pgrad(*self.args))
+
+    def test_regimes(self):
+        laml = np.array([0.005,0.2,0.2,0.2,0.2,0.6])
+        Nfr = np.array([1.,0.01,0.5,50.,1000.,1000.])
+        L1,L2,L3,L4 = 316*laml**0.302,0.0009252*laml**-2.4684,0.1*laml**-1.4516,0.5*laml**-6.738
+        np.testing.assert_array_equal(bb.flow_regime(Nfr,laml,L1,L2,L3,L4),
+            [bb.Flow_regime(*args) for args in zip(Nfr,laml,L1,L2,L3,L4)])
+
+class TestPwf(unittest.TestCase):
+
+    def test_traverse(self):
+        gradient = lambda z,p: bb.Pgrad(p,100+z*50/5000,100,50,300,0.65,30,1.07,2.44,90)
+        exact = bb.traverse(gradient,150.,0.,5000.,rtol=1e-12,atol=1e-12).pressures[-1]
+        self.assertAlmostEqual(bb.Pwf_q(150,100,100,50,300,0.65,30,1.07,2.44,90,5000,150),exact,delta=0.5)
+
+    def test_evaluations(self):
+        # the default tolerances hold a deep well to a tenth of a percent in few evaluations
+        gradient = lambda z,p: bb.Pgrad(p,90+z*120/9000,1500,500,600,0.65,30,1.07,2.441,90)
+        exact = bb.traverse(gradient,250.,0.,9000.,rtol=1e-12,atol=1e-12).pressures[-1]
+        result = bb.traverse(gradient,250.,0.,9000.)
+        self.assertLess(result.evaluations,60)
+        self.assertAlmostEqual(result.pressures[-1],exact,delta=1e-3*exact)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+import numpy as np
+
+from nodepy.fluid_props import FluidContext, black_oil, zfactor, hall_yarborough
+
+# (P psia, T °F, API) and Pb, Rs, Bo, muo, rhoo, sigo, Bg, Bw, Rsw, muw, sigw of the scalar
+# psapy.FluidProps correlations for a 0.65 gravity gas, 375 scf/stb and 1.5 wt% brine
+REFERENCE = (
+    ((500.,150.,35.),(1984.7331760363493,73.0022482766945,1.0878727462817237,2.0578615700292042,
+        49.28827016431489,17.291245798706267,0.03296183202913438,1.0204730174379983,
+        2.8611341442492026,0.44027735595047907,58.7406523958712)),
+    ((3000.,180.,25.),(2775.669108567847,375.0000000000001,1.2220351793555777,1.3608142540454613,
+        49.05853920167268,3.7014156504642886,0.005267455014041123,1.0325604893855105,
+        0.6937900120666728,0.36310763503361104,46.04000638117589)),
+    ((2000.,60.,35.),(1624.619580488879,374.9999999999999,1.1725949330244447,6.891217249393052,
+        48.21226504677322,7.981480021742395,0.005403278971002755,0.9998559225541039,
+        12.109847409232202,1.1490512276166667,59.27468952066721)),
+    )
+
+def properties(P,T,api):
+    Pb = black_oil.Pbub(T,50,114.7,0.65,api,375)
+    Rs = black_oil.sol_gor(T,P,50,114.7,Pb,0.65,api)
+    Bo = black_oil.oil_fvf(T,P,50,114.7,Pb,Rs,0.65,api)
+    return (Pb,Rs,Bo,
+        black_oil.oil_visc(T,P,50,114.7,Pb,Rs,0.65,api),
+        black_oil.oil_dens(T,P,50,114.7,Pb,Bo,Rs,0.65,api),
+        black_oil.oil_tens(P,T,api),
+        black_oil.gas_fvf(P,T,0.65),
+        black_oil.wtr_fvf(P,T,1.5),
+        black_oil.sol_gwr(P,T,1.5),
+        black_oil.wtr_visc(P,T,1.5),
+        black_oil.wtr_tens(P,T))
+
+class TestBlackOil(unittest.TestCase):
+
+    def test_scalar(self):
+        for point,values in REFERENCE:
+            np.testing.assert_allclose(properties(*point),values,rtol=1e-12)
+
+    def test_arrays(self):
+        P,T,api = (np.array(x) for x in zip(*(point for point,_ in REFERENCE)))
+        np.testing.assert_allclose(np.array(properties(P,T,api)),
+            np.array([values for _,values in REFERENCE]).T,rtol=1e-12)
+
+    def test_separator(self):
+        # Vasquez and Beggs gravity 0.65*(1+5.912e-5*API*Tsep*log10(Psep/114.7)) at 300 psia and 60 °F
+        self.assertAlmostEqual(float(black_oil.correct(60,300,0.65,35)),0.6836964163618403,places=14)
+        context = FluidContext(0.65,35,1.07,375,Psep=300,Tsep=60)
+        np.testing.assert_allclose(context.bubble_point(150.),black_oil.Pbub(150.,60,300,0.65,35,375),rtol=1e-14)
+        self.assertLess(black_oil.Pbub(150.,60,300,0.65,35,375),black_oil.Pbub(150.,60,114.7,0.65,35,375))
+
+    def test_zfact(self):
+        # the explicit fit stays within 3% of the equations of state over its usual range
+        Tr,Pr = np.linspace(1.3,2.5,13)[:,None],np.linspace(0.5,5.,10)
+        explicit = black_oil.zfact(Tr,Pr)
+        np.testing.assert_allclose(black_oil.zfact(Tr,Pr,"DAK"),explicit,rtol=0.03)
+        np.testing.assert_allclose(black_oil.zfact(Tr,Pr,"HY"),explicit,rtol=0.03)
+        with self.assertRaises(ValueError):
+            black_oil.zfact(Tr,Pr,"Standing")
+
+class TestHallYarborough(unittest.TestCase):
+
+    def test_dak(self):
+        Tr,Pr = np.linspace(1.2,3.,37)[:,None],np.linspace(0.,15.,61)
+        np.testing.assert_allclose(hall_yarborough(Tr,Pr),zfactor(Tr,Pr),rtol=0.02)
+
+    def test_ideal(self):
+        np.testing.assert_array_equal(hall_yarborough([1.5,2.],0.),[1.,1.])
+
+if __name__ == "__main__":
+    unittest.main()
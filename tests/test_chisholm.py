@@ -0,0 +1,55 @@
+import unittest
+
+import numpy as np
+
+from respy import Fluid
+
+from nodepy import Pipe, DarcyWeisbach, LockhartMartinelli, Chisholm
+
+class TestChisholm(unittest.TestCase):
+
+    def setUp(self):
+        self.pipe = Pipe(4.,1000.,1e-4)
+        self.gas = Fluid(1.8e-5,rho=50.)
+        self.liq = Fluid(1e-3,rho=800.)
+        self.model = Chisholm(self.pipe,self.gas,self.liq)
+
+    def test_C(self):
+        lam = np.array([True,False,True,False,False])
+        turb = np.array([False,True,False,True,False])
+        np.testing.assert_array_equal(Chisholm.get_C(lam,turb,lam[[0,0,1,1,1]],turb[[0,0,1,1,1]]),
+            [5.,12.,10.,20.,np.nan])
+
+    def test_scalar(self):
+        # agrees with the scalar two-phase multiplier of the phase head losses
+        for grate,lrate in ((0.05,0.002),(0.001,1e-5),(0.02,0.01)):
+            dropG = DarcyWeisbach(self.pipe,self.gas,lower_limit=1000,upper_limit=2000).evaluate(grate)
+            dropL = DarcyWeisbach(self.pipe,self.liq,lower_limit=1000,upper_limit=2000).evaluate(lrate)
+            C = {(True,True):5.,(False,True):10.,(True,False):12.,(False,False):20.}[
+                (bool(dropL.laminar[0]),bool(dropG.laminar[0]))]
+            X = np.sqrt(dropL.head_loss/dropG.head_loss)
+            np.testing.assert_allclose(self.model.get(grate,lrate),(1+C*X+X**2)*dropG.head_loss,rtol=1e-14)
+
+    def test_grid(self):
+        grate = np.geomspace(1e-4,0.1,1000)
+        lrate = np.geomspace(1e-6,0.05,1000)
+        with self.assertNoLogs(level="WARNING"):
+            result = self.model.evaluate(grate[:,None],lrate[None,:])
+        self.assertEqual(result.head_loss.shape,(1000,1000))
+        self.assertTrue(set(np.unique(result.regime))<={-1,0,1,2,3})
+        np.testing.assert_array_equal(np.isnan(result.C),result.regime<0)
+        self.assertLess(np.nanmax(result.error),1e-12)
+        np.testing.assert_allclose(result.phiG**2,result.phiL**2*result.X**2)
+
+    def test_base(self):
+        # the base class evaluates the standard C table and curves that Chisholm reuses
+        grate = np.geomspace(1e-4,0.1,50)
+        lrate = np.geomspace(1e-6,0.05,40)
+        base = LockhartMartinelli(self.pipe,self.gas,self.liq).evaluate(grate[:,None],lrate[None,:])
+        result = self.model.evaluate(grate[:,None],lrate[None,:])
+        self.assertTrue(np.isfinite(base.head_loss).any())
+        for name in base._fields:
+            np.testing.assert_array_equal(getattr(base,name),getattr(result,name))
+
+if __name__ == "__main__":
+    unittest.main()
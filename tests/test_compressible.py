@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+
+from respy import Fluid
+
+from nodepy import PipeArray
+
+from nodepy.pressure_drop import Compressible
+from nodepy.fluid_props import zfactor, ZTable
+
+class TestZFactor(unittest.TestCase):
+
+    def test_standing_katz(self):
+        # Standing-Katz chart readings
+        z = zfactor(np.array([1.5,2.0,1.2]),np.array([2.,3.,2.]))
+        np.testing.assert_allclose(z,[0.82,0.94,0.55],atol=0.01)
+
+    def test_table(self):
+        table = ZTable(0.65)
+        z = table(np.array([5e6,1.5e7]),300.)
+        self.assertEqual(table.calls,1)
+        self.assertEqual(table.lookups,2)
+        np.testing.assert_allclose(z,table(np.array([5e6,1.5e7]),np.array([300.,300.])))
+
+class TestIdealGas(unittest.TestCase):
+
+    def setUp(self):
+        self.pipe = PipeArray(np.array([2.,6.,12.]),ll=np.array([2e2,5e3,1e5]))
+        self.gas = Fluid(rho=50.,visc=1e-5,molarweight=[0.0186])
+        self.model = Compressible(self.pipe,self.gas,310.,0.003)
+
+    def test_maximum(self):
+        # the choked rate is the maximum of the flow rate over the downstream pressure
+        P2 = np.linspace(1e3,1e7,200001)[:,None]
+        flow = self.model._flow(1e7,P2,self.model._area,self.model._fterm)
+        np.testing.assert_allclose(self.model.maximum(1e7),flow.max(axis=0),rtol=1e-9)
+        np.testing.assert_allclose(self.model.critical_ratio()*1e7,P2[flow.argmax(axis=0),0],rtol=1e-3)
+
+    def test_round_trip(self):
+        P2 = self.model.critical_ratio()*1e7*np.array([[1.001],[1.5],[2.]])
+        P2 = np.minimum(P2,9.9e6)
+        np.testing.assert_allclose(self.model.downstream(1e7,self.model.get(P2,1e7)),P2,rtol=1e-8)
+
+class TestRealGas(unittest.TestCase):
+
+    def setUp(self):
+        self.pipe = PipeArray(np.array([12.,24.]),ll=np.array([5e4,2e5]))
+        self.gas = Fluid(rho=50.,visc=1e-5,molarweight=[0.0186])
+
+    def test_unit_zfactor(self):
+        table = ZTable(0.65)
+        table.values = np.ones_like(table.values)
+        ideal = Compressible(self.pipe,self.gas,310.,0.002)
+        real = Compressible(self.pipe,self.gas,310.,0.002,ztable=table)
+        np.testing.assert_allclose(real.get(7e6,1e7),ideal.get(7e6,1e7),rtol=1e-12)
+
+    def test_choke(self):
+        # the real-gas clamp sits at the maximum of the real-gas flow rate
+        real = Compressible(self.pipe,self.gas,310.,0.002,ztable=ZTable(0.65))
+        P2 = np.linspace(1e4,2e7,200001)[:,None]
+        flow = real._flow(2e7,P2,real._area,real._fterm)
+        np.testing.assert_allclose(real.critical_pressure(2e7),P2[flow.argmax(axis=0),0],rtol=1e-3)
+        np.testing.assert_allclose(real.get(1e4,2e7),flow.max(axis=0),rtol=1e-9)
+        np.testing.assert_allclose(real.maximum(2e7),real.get(1e4,2e7))
+
+    def test_march(self):
+        real = Compressible(self.pipe,self.gas,310.,0.002,ztable=ZTable(0.65))
+        G = real.get(7e6,1e7)
+        np.testing.assert_allclose(real.downstream(1e7,G),7e6,rtol=1e-9)
+        np.testing.assert_allclose(real.march(1e7,G,segments=50)[-1],7e6,rtol=1e-4)
+
+if __name__ == "__main__":
+    unittest.main()
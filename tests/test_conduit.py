@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+
+from nodepy import Conduit
+from nodepy import _hagedorn_brown as hb
+
+class TestConduit(unittest.TestCase):
+
+    def test_vertical(self):
+        conduit = Conduit.from_survey(np.linspace(0,5000,51),0.)
+        np.testing.assert_allclose(conduit.tvd,conduit.md)
+        np.testing.assert_allclose(conduit.angle,np.pi/2)
+
+    def test_build_section(self):
+        # a constant build rate from vertical to horizontal traces a quarter circle
+        radius = 2000.
+        md = np.linspace(0,np.pi/2*radius,7)
+        conduit = Conduit.from_survey(md,np.degrees(md/radius),45.)
+        self.assertAlmostEqual(conduit.tvd[-1],radius,delta=1e-9)
+        self.assertAlmostEqual(np.hypot(conduit.north[-1],conduit.east[-1]),radius,delta=1e-9)
+        self.assertAlmostEqual(conduit.north[-1],conduit.east[-1],delta=1e-9)
+
+    def test_lookup(self):
+        conduit = Conduit([0.,1000.,2000.],[0.,1000.,1500.],diameter=[3.5,2.441])
+        np.testing.assert_array_equal(conduit.segment([0.,999.,1000.,2500.]),[0,0,1,1])
+        np.testing.assert_allclose(conduit.vertical([500.,1500.]),[500.,1250.])
+        np.testing.assert_allclose(conduit.temperature(1500.,100.,160.),150.)
+        self.assertEqual(conduit.depth,2000.)
+        with self.assertRaises(ValueError):
+            Conduit([0.,0.],[0.,0.])
+
+    def test_profile(self):
+        conduit = Conduit.from_profile([0.,300.,400.],[50.,10.,10.])
+        np.testing.assert_allclose(conduit.length,[np.hypot(300,40),100.])
+        self.assertGreater(conduit.angle[0],0.)
+        self.assertEqual(conduit.angle[1],0.)
+
+    def test_traverse(self):
+        rates = np.array([200.,800.,2000.])
+        args = (150,100,rates,0.25*rates,375,0.65,30,1.07)
+        vertical = Conduit.from_survey(np.linspace(0,5000,201),0.,diameter=2.44)
+        np.testing.assert_allclose(hb.pwf_q(*args,2.44,90,5000,150,rtol=1e-8,conduit=vertical),
+            hb.pwf_q(*args,2.44,90,5000,150,rtol=1e-8),rtol=1e-6)
+        # a deviated well has the hydrostatic head of its vertical depth and the friction of its length
+        md = np.linspace(0,6000,301)
+        deviated = Conduit.from_survey(md,np.interp(md,[0,1000,3000,6000],[0,0,40,40]),diameter=2.44)
+        pwf = hb.pwf_q(*args,2.44,90,5000,150,rtol=1e-6,conduit=deviated)
+        self.assertTrue(np.all(pwf>hb.pwf_q(*args,2.44,90,deviated.tvd[-1],150,rtol=1e-6)))
+        self.assertTrue(np.all(pwf<hb.pwf_q(*args,2.44,90,6000,150)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+import unittest
+
+import numpy as np
+
+from respy import Fluid
+
+from nodepy import Pipe, PipeArray, DarcyWeisbach
+
+from nodepy.pressure_drop import MoodyTable
+
+from nodepy.pressure_drop._colebrook import colebrook
+
+class TestColebrook(unittest.TestCase):
+
+    def setUp(self):
+
+        self.Re = np.logspace(np.log10(4000),8,500)
+        self.epd = np.tile([0.,1e-5,1e-4,1e-3,5e-2],100)
+
+    def residual(self,fD):
+
+        return 1/np.sqrt(fD)+2*np.log10(self.epd/3.7+2.51/self.Re/np.sqrt(fD))
+
+    def test_methods(self):
+
+        for method in ("halley","newton","lambertw"):
+            fD,info = DarcyWeisbach.colebrook(self.Re,self.epd,method=method,full_output=True)
+            self.assertTrue(info.converged.all())
+            np.testing.assert_allclose(self.residual(fD),0,atol=1e-12)
+
+    def test_sweeps(self):
+
+        # a few poorly started elements are finished by sparse sweeps over them alone
+        guess = lambda Re,epd: np.where(np.arange(Re.size)%50==0,1.,DarcyWeisbach.haaland(Re,epd))
+        fD,info = colebrook(self.Re,self.epd,guess,method="newton",full_output=True)
+        self.assertTrue(info.converged.all())
+        self.assertLess(info.evaluations,(info.iterations-1)*self.Re.size)
+        np.testing.assert_allclose(self.residual(fD),0,atol=1e-12)
+
+    def test_guess(self):
+
+        fH = DarcyWeisbach.colebrook(self.Re,self.epd,guess="haaland")
+        fC = DarcyWeisbach.colebrook(self.Re,self.epd,guess="chen")
+
+        np.testing.assert_allclose(fH,fC,rtol=1e-12)
+
+class TestMoodyTable(unittest.TestCase):
+
+    def test_error_bound(self):
+
+        table = MoodyTable(tolerance=1e-5)
+
+        rng = np.random.default_rng(0)
+
+        Re = 10**rng.uniform(np.log10(4000),8,2000)
+        epd = 10**rng.uniform(-7,-1,2000)
+        epd[::10] = 0.
+
+        fD = table(Re,epd)
+
+        self.assertLessEqual(table.max_error,1e-5)
+
+        np.testing.assert_allclose(fD,DarcyWeisbach.colebrook(Re,epd),rtol=1e-5)
+
+    def test_slices(self):
+
+        table = MoodyTable()
+        table.MAX_CACHED = 3
+
+        rng = np.random.default_rng(0)
+
+        Re = 10**rng.uniform(4,8,1000)
+        epd = rng.choice([0.,1e-5,1e-4,1e-3],1000)
+
+        fD = table(Re,epd)
+
+        self.assertLessEqual(len(table.slices),3)
+
+        for value in (0.,1e-5,1e-4,1e-3):
+            np.testing.assert_allclose(fD[epd==value],table(Re[epd==value],value),rtol=1e-14)
+
+        np.testing.assert_allclose(fD,DarcyWeisbach.colebrook(Re,epd),rtol=1e-5)
+
+    def test_eviction(self):
+
+        # a slice evicted by another thread right after its insertion is still returned
+        class Evicting(dict):
+            def __setitem__(self,key,value):
+                super().__setitem__(key,value)
+                self.clear()
+
+        table = MoodyTable()
+        table.slices = Evicting()
+
+        Re = np.logspace(4,8,200)
+
+        for value in (0.,1e-5,1e-3):
+            np.testing.assert_allclose(table(Re,value),DarcyWeisbach.colebrook(Re,value),rtol=1e-5)
+
+    def test_sampled_error(self):
+
+        # the stored error of a decade is within a percent of its maximum on a dense sample
+        table = MoodyTable()
+        spline = table.bucket(-3)
+
+        x = np.linspace(spline.nodes[0],spline.nodes[-1],16*(spline.nodes.size-1)+1)
+        y = np.linspace(-3,-2,129)
+
+        error = np.abs(np.expm1(spline(x,y)-table.exact(x,y))).max()
+
+        self.assertLessEqual(error,1.01*table.errors[-3])
+
+    def test_regimes(self):
+
+        fD = DarcyWeisbach.moody(np.array([1000.,3000.,1e5]),1e-4)
+
+        self.assertAlmostEqual(fD[0],0.064)
+        self.assertFalse(np.isnan(fD).any())
+
+class TestChurchill(unittest.TestCase):
+
+    def test_all_regimes(self):
+
+        Re = np.logspace(1,8,1000)
+        out = np.empty_like(Re)
+
+        fD = DarcyWeisbach.churchill(Re,1e-4,out=out)
+
+        self.assertIs(fD,out)
+        self.assertFalse(np.isnan(fD).any())
+
+        np.testing.assert_allclose(fD[Re<1000],64/Re[Re<1000],rtol=1e-10)
+        np.testing.assert_allclose(fD[Re>1e4],DarcyWeisbach.colebrook(Re[Re>1e4],1e-4),rtol=1e-2)
+
+class TestPipeArray(unittest.TestCase):
+
+    def test_broadcast(self):
+
+        pipes = PipeArray([2.,3.,4.],[100.,200.,300.],[1e-4,2e-4,3e-4])
+
+        fluid = Fluid(1e-3,rho=1000.)
+
+        rates = np.linspace(1e-3,1e-2,5)
+
+        drop = DarcyWeisbach(pipes,fluid).get(rates)
+
+        self.assertEqual(drop.shape,(3,5))
+
+        for index in range(3):
+            single = DarcyWeisbach(pipes[index],fluid).get(rates)
+            np.testing.assert_allclose(drop[index],single)
+
+class TestInverse(unittest.TestCase):
+
+    def test_rate(self):
+
+        pipes = PipeArray(np.linspace(1,8,50),np.linspace(100,5000,50),1e-4)
+
+        model = DarcyWeisbach(pipes,Fluid(1e-3,rho=1000.))
+
+        rates = np.array([1e-6,1e-3,1e-2,5e-2])
+
+        for method in ("colebrook","haaland","churchill"):
+
+            drop = model.get(rates,method=method)
+
+            valid = np.isfinite(drop)
+
+            rate = model.rate(drop,method=method)
+
+            np.testing.assert_allclose(rate[valid],np.broadcast_to(rates,drop.shape)[valid],rtol=1e-9)
+
+class TestStateless(unittest.TestCase):
+
+    def test_limits(self):
+
+        self.assertEqual(DarcyWeisbach.LOWER_REYNOLDS_LIMIT,2000)
+
+        fluid = Fluid(1e-3,rho=1000.)
+
+        model = DarcyWeisbach(Pipe(2,100,1e-4),fluid,lower_limit=1000,upper_limit=2000)
+
+        result = model.evaluate(np.array([1e-5,1e-2]))
+
+        self.assertEqual(result.laminar.tolist(),[True,False])
+        self.assertEqual(result.turbulent.tolist(),[False,True])
+        self.assertEqual(DarcyWeisbach.UPPER_REYNOLDS_LIMIT,4000)
+
+if __name__ == "__main__":
+
+    unittest.main()
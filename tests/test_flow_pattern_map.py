@@ -0,0 +1,44 @@
+import unittest
+
+import numpy as np
+
+from nodepy import LockhartMartinelli, FlowPatternMap
+
+class TestFlowPatternMap(unittest.TestCase):
+
+    def setUp(self):
+        self.map = FlowPatternMap()
+
+    def exact(self,X,Y):
+        values = np.column_stack([getattr(LockhartMartinelli,name)(X) for name in self.map.patterns])
+        values = np.where(values<=Y[:,None],values,-np.inf)
+        return np.where(np.isfinite(values).any(axis=1),values.shape[1]-1-np.argmax(values[:,::-1],axis=1),-1)
+
+    def test_point(self):
+        # boundaries at X=1 are 4, 4, 2, 3, 2.2 and 4
+        self.assertEqual(self.map.name(self.map(1.,3.)),"stratified_wavy")
+        self.assertEqual(self.map.name(self.map(1.,2.1)),"smooth_stratified")
+        self.assertIsNone(self.map.name(self.map(1.,1.)))
+        self.assertEqual(self.map(0.,5.),-1)
+        # on a boundary the point takes that boundary's pattern
+        self.assertEqual(self.map.name(self.map(1.,2.2)),"slug_flow")
+
+    def test_points(self):
+        rng = np.random.default_rng(0)
+        X = 10**rng.uniform(-4,4,100000)
+        Y = rng.uniform(-20,200,X.size)
+        codes = self.map(X,Y)
+        self.assertEqual(codes.dtype,np.int8)
+        np.testing.assert_array_equal(codes,self.exact(X,Y))
+
+    def test_raster(self):
+        X = np.geomspace(1e-4,1e4,300)
+        Y = np.linspace(-20,200,200)
+        raster = self.map.raster(X,Y)
+        self.assertEqual(raster.shape,(200,300))
+        np.testing.assert_array_equal(raster,self.map(X[None,:],Y[:,None]))
+        with self.assertRaises(ValueError):
+            self.map.raster(X,Y[::-1])
+
+if __name__ == "__main__":
+    unittest.main()
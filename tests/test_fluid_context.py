@@ -0,0 +1,36 @@
+import unittest
+
+import numpy as np
+
+from nodepy import _beggs_brill as bb
+from nodepy import _hagedorn_brown as hb
+
+from nodepy.fluid_props import FluidContext
+
+class TestFluidContext(unittest.TestCase):
+
+    def setUp(self):
+        self.gor = np.array([200.,375.,800.])
+        self.context = FluidContext(0.65,30,1.07,self.gor,wor=0.25,d=np.array([2.441,3.5,4.]),angle=90.)
+
+    def test_bubble_point(self):
+        T = np.array([100.,150.,200.])
+        Pb = self.context.bubble_point(T)
+        self.assertTrue(np.all(np.diff(Pb)>0))
+        np.testing.assert_allclose(self.context.take(1).bubble_point(T[1]),Pb[1])
+
+    def test_take(self):
+        lanes = self.context.take(np.array([0,2]))
+        np.testing.assert_array_equal(lanes.Gor,self.gor[[0,2]])
+        np.testing.assert_array_equal(lanes.d,[2.441,4.])
+        np.testing.assert_array_equal(lanes.wor,[0.25,0.25])
+        self.assertEqual(lanes.Tpc,self.context.Tpc)
+
+    def test_gradient(self):
+        P,T,qo = np.array([500.,1500.,2500.]),np.array([110.,130.,150.]),np.array([300.,900.,1500.])
+        for module in (bb,hb):
+            np.testing.assert_array_equal(module.gradient(P,T,qo,self.context),
+                module.pgrad(P,T,qo,0.25*qo,self.gor,0.65,30,1.07,self.context.d,90.))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+import numpy as np
+
+from nodepy import _hagedorn_brown as hb
+
+from nodepy.fluid_props import PVTTable
+
+class TestCharts(unittest.TestCase):
+
+    def test_accuracy(self):
+        for chart in (hb.CNL_CHART,hb.HOLDUP_CHART,hb.PSI_CHART):
+            self.assertLess(chart.max_error,1e-5)
+
+    def test_psi_continuity(self):
+        # the branches of the secondary correction fit meet within 1%
+        for B in (0.025,0.055):
+            left,right = hb.psi(np.array([B,np.nextafter(B,1)]))
+            self.assertAlmostEqual(left/right,1.,delta=0.01)
+
+class TestVectorized(unittest.TestCase):
+
+    def test_scalar_agreement(self):
+        rng = np.random.default_rng(2)
+        n = 300
+        P,T = rng.uniform(100,4000,n),rng.uniform(60,250,n)
+        qo,qw,gor = rng.uniform(10,5000,n),rng.uniform(1,3000,n),rng.uniform(50,1000,n)
+        d = rng.uniform(1.5,6,n)
+        qw[::10] = 0. # dry wells
+        scalar = np.array([hb.Pgrad(*args,0.65,35,1.07,di,90.) for *args,di in zip(P,T,qo,qw,gor,d)])
+        np.testing.assert_allclose(hb.pgrad(P,T,qo,qw,gor,0.65,35,1.07,d,90.),scalar,rtol=1e-4)
+
+    def test_dry_well(self):
+        # the scalar reference handles a well without water
+        scalar = hb.Pgrad(500.,150.,1000.,0.,800.,0.65,35,1.07,2.441,90.)
+        np.testing.assert_allclose(hb.pgrad(500.,150.,1000.,0.,800.,0.65,35,1.07,2.441,90.),scalar,rtol=1e-4)
+
+    def test_batch(self):
+        rates = np.linspace(50,3000,20)[:,None]
+        P,T = np.linspace(200,3000,15),np.linspace(100,150,15)
+        state = hb.fluid_state(P,T,375.,0.65,30,1.07)
+        out = np.empty((20,15))
+        grad = hb.pgrad(P,T,rates,50.,375.,0.65,30,1.07,2.44,90.,state=state,out=out)
+        self.assertIs(grad,out)
+        np.testing.assert_allclose(grad[7],hb.pgrad(P,T,rates[7],50.,375.,0.65,30,1.07,2.44,90.))
+
+class TestPwf(unittest.TestCase):
+
+    def test_batch(self):
+        rates = np.linspace(100.,3000.,8)
+        scalar = [hb.Pwf_q(150,100,q,0.25*q,375,0.65,30,1.07,2.44,90,5000,150) for q in rates]
+        np.testing.assert_allclose(hb.pwf_q(150,100,rates,0.25*rates,375,0.65,30,1.07,2.44,90,5000,150),scalar,atol=0.5)
+
+    def test_table(self):
+        rates = np.linspace(100.,3000.,8)
+        pvt = PVTTable(lambda P,T: hb.fluid_state(P,T,375.,0.65,30,1.07),np.linspace(14.7,5000,401),np.linspace(60,250,41),gor=375.)
+        live = hb.pwf_q(150,100,rates,0.25*rates,375,0.65,30,1.07,2.44,90,5000,150,rtol=1e-8)
+        table = hb.pwf_q(150,100,rates,0.25*rates,375,0.65,30,1.07,2.44,90,5000,150,rtol=1e-8,pvt=pvt)
+        np.testing.assert_allclose(table,live,atol=0.2)
+        # the table holds the fluid of a single GOR
+        with self.assertRaises(ValueError):
+            hb.pwf_q(150,100,rates,0.25*rates,800,0.65,30,1.07,2.44,90,5000,150,pvt=pvt)
+
+    def test_bottom_up(self):
+        rates = np.linspace(300.,3000.,6)
+        pwf = hb.pwf_q(150,100,rates,0.25*rates,375,0.65,30,1.07,2.44,90,5000,150,rtol=1e-8)
+        pwh = hb.pwh_q(pwf,100,rates,0.25*rates,375,0.65,30,1.07,2.44,90,5000,150,rtol=1e-8)
+        np.testing.assert_allclose(pwh,150.,atol=0.05)
+
+    def test_shooting(self):
+        rates = np.linspace(300.,3000.,6)
+        pwf = hb.pwf_q(150,100,rates,0.25*rates,375,0.65,30,1.07,2.44,90,5000,150,rtol=1e-8)
+        cold = hb.q_pwf(150,pwf,100,0.25,375,0.65,30,1.07,2.44,90,5000,150,guess=1000.)
+        np.testing.assert_allclose(cold.x,rates,rtol=1e-3)
+        # neighbouring bottomhole pressures are matched in two or three traverses
+        warm = hb.q_pwf(150,pwf+10,100,0.25,375,0.65,30,1.07,2.44,90,5000,150,guess=cold)
+        self.assertLessEqual(warm.evaluations.max(),3)
+        self.assertLess(warm.evaluations.sum(),cold.evaluations.sum())
+        np.testing.assert_array_less(np.abs(warm.residual),0.1)
+        self.assertTrue(np.all(warm.x>cold.x))
+
+if __name__ == "__main__":
+    unittest.main()
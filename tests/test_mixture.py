@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+
+from respy import Fluid
+
+from nodepy import Pipe, PipeArray, DarcyWeisbach, Mixture
+
+class TestMixture(unittest.TestCase):
+
+    def setUp(self):
+        self.pipe = Pipe(4.,1000.,1e-4)
+        self.mixture = Mixture(self.pipe,Fluid(1.8e-5,rho=50.),Fluid(1e-3,rho=800.))
+        self.grate = np.array([0.001,0.01,0.02,0.05])
+        self.lrate = np.array([0.002,0.01,0.02,0.03])
+
+    def test_objects(self):
+        # agrees with the mixture fluid and Darcy-Weisbach model objects
+        expected = []
+        for grate,lrate in zip(self.grate,self.lrate):
+            fluid = self.mixture.fluid(grate,lrate,1.5)
+            expected.append(DarcyWeisbach(self.pipe,fluid).get(fluid._rate)[0])
+        np.testing.assert_allclose(self.mixture.get(self.grate,self.lrate,1.5),expected,rtol=1e-12)
+
+    def test_drift_flux(self):
+        homogeneous = self.mixture.evaluate(self.grate,self.lrate,C0=1.,vd=0.)
+        np.testing.assert_allclose(homogeneous.voidage,self.mixture.evaluate(self.grate,self.lrate).voidage)
+        drift = self.mixture.evaluate(self.grate,self.lrate,C0=1.2,vd=0.3)
+        self.assertTrue(np.all(drift.voidage<homogeneous.voidage))
+
+    def test_buffers(self):
+        out = self.mixture.buffers((4,))
+        result = self.mixture.evaluate(self.grate,self.lrate,method="churchill",out=out)
+        self.assertIs(result.head_loss,out.head_loss)
+        np.testing.assert_allclose(result.head_loss,self.mixture.get(self.grate,self.lrate,method="churchill"))
+
+    def test_pipes(self):
+        pipes = PipeArray(np.array([2.,4.,6.]),1000.,np.array([1e-4,1e-4,2e-4]))
+        mixture = Mixture(pipes,self.mixture.gas,self.mixture.liq)
+        head = mixture.get(self.grate,self.lrate,method="churchill")
+        self.assertEqual(head.shape,(3,4))
+        np.testing.assert_allclose(head[1],self.mixture.get(self.grate,self.lrate,method="churchill"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+import numpy as np
+
+from respy import Fluid
+
+from nodepy import Network, Pipe
+
+class TestNetwork(unittest.TestCase):
+
+    def network(self,model):
+
+        net = Network(Fluid(1e-3,rho=1000.),model=model)
+
+        net.add_node("source",elevation=10.,pressure=5e5)
+
+        for name,demand in zip("ABCD",(1e-3,2e-3,1.5e-3,0.5e-3)):
+            net.add_node(name,demand=demand)
+
+        net.add_pipe(1,"source","A",Pipe(6,2000,1e-4))
+        net.add_pipe(2,"A","B",Pipe(4,1500,1e-4))
+        net.add_pipe(3,"A","C",Pipe(4,1200,1e-4))
+        net.add_pipe(4,"B","D",Pipe(3,1000,1e-4))
+        net.add_pipe(5,"C","D",Pipe(3,1100,1e-4))
+
+        return net
+
+    def test_balance(self):
+
+        for model in ("darcy","hazen"):
+
+            net = self.network(model)
+
+            sol = net.solve()
+
+            self.assertTrue(sol.converged)
+            self.assertAlmostEqual(sol.flows[0],5e-3)
+
+            flows = dict(zip(net.pipes,sol.flows))
+
+            self.assertAlmostEqual(flows[4]+flows[5],0.5e-3)
+
+    def test_warm_start(self):
+
+        net = self.network("darcy")
+
+        cold = net.solve()
+        warm = net.solve()
+
+        self.assertLessEqual(warm.iterations,2)
+
+        np.testing.assert_allclose(warm.heads,cold.heads)
+
+    def test_demand_change(self):
+
+        net = self.network("darcy")
+        net.solve()
+
+        net.set_demand("D",0.6e-3)
+        net.set_pressure("source",5.2e5)
+
+        warm = net.solve()
+        cold = net.solve(warm=False)
+
+        self.assertLess(warm.iterations,cold.iterations)
+        self.assertAlmostEqual(warm.flows[0],5.1e-3)
+        np.testing.assert_allclose(warm.heads,cold.heads)
+
+if __name__ == "__main__":
+
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+import numpy as np
+
+from nodepy.fluid_props import FluidState, PVTTable
+
+def provider(P,T):
+    # fields that the tabulated forms interpolate exactly
+    bilinear = 1+P*T/1e6
+    return FluidState(*(
+        0.01/P if name=="Bg" else 0.002*P if name=="rhog" else
+        np.exp(-T/100) if name in PVTTable.LOGARITHMIC else bilinear
+        for name in FluidState._fields))
+
+class TestPVTTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = PVTTable(provider,np.linspace(14.7,5000,51),np.linspace(60,250,11))
+
+    def test_exact(self):
+        P,T = np.random.default_rng(0).uniform(20,4900,(2,1000))
+        T = 60+T/5000*190
+        for table,exact in zip(self.table(P,T),provider(P,T)):
+            np.testing.assert_allclose(table,exact,rtol=1e-12)
+        self.assertLess(self.table.max_error,1e-12)
+
+    def test_shape(self):
+        state = self.table(np.linspace(100,4000,6)[:,None],np.linspace(80,200,4))
+        self.assertEqual(state.Bo.shape,(6,4))
+
+    def test_uniform(self):
+        with self.assertRaises(ValueError):
+            PVTTable(provider,np.array([14.7,100,1000]),np.linspace(60,250,11))
+
+if __name__ == "__main__":
+    unittest.main()
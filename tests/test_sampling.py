@@ -0,0 +1,34 @@
+import unittest
+
+import numpy as np
+
+from nodepy import sample_curve
+
+class TestSampleCurve(unittest.TestCase):
+
+    def test_line(self):
+        curve = sample_curve(lambda x: 3*x+1,0.,10.)
+        self.assertEqual(curve.evaluations,17)
+        self.assertEqual(curve.passes,2)
+
+    def test_accuracy(self):
+        # J-shaped curve with a sharp minimum near x=0.05
+        func = lambda x: 1/(x+0.01)+40*x
+        x = np.linspace(0,1,20001)
+        curve = sample_curve(func,0.,1.,rtol=0.,atol=0.01)
+        self.assertLess(np.abs(curve(x)-func(x)).max(),0.02)
+        self.assertTrue(np.all(np.diff(curve.x)>0))
+        # the samples concentrate near the minimum
+        self.assertGreater(np.sum(curve.x<0.1),np.sum(curve.x>0.5))
+        self.assertLess(curve.evaluations,500)
+
+    def test_nan(self):
+        curve = sample_curve(lambda x: np.where(x<0.3,np.nan,x**2),0.,1.,rtol=0.,atol=1e-3)
+        self.assertTrue(np.all(np.isfinite(curve.y[curve.x>=0.375])))
+
+    def test_max_evaluations(self):
+        with self.assertRaises(RuntimeError):
+            sample_curve(np.sin,0.,100.,rtol=0.,atol=1e-9,max_evaluations=100)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+
+from nodepy._traverse import traverse, batch_traverse, shoot
+
+class TestTraverse(unittest.TestCase):
+
+    def test_exponential(self):
+        result = traverse(lambda z,P: 1e-4*P,100.,0.,10000.,rtol=1e-8,atol=1e-8)
+        self.assertAlmostEqual(result.pressures[-1],100*np.exp(1.),delta=1e-5)
+        self.assertEqual(result.depths[-1],10000.)
+        self.assertEqual(result.evaluations,1+3*(result.depths.size-1+result.rejected))
+
+    def test_bottom_up(self):
+        result = traverse(lambda z,P: 0.4+0*P,3000.,8000.,0.)
+        self.assertAlmostEqual(result.pressures[-1],3000.-0.4*8000.)
+
+    def test_linear_steps(self):
+        # a linear profile is integrated exactly and the steps grow to the limit
+        result = traverse(lambda z,P: 0.3+1e-5*z,150.,0.,5000.)
+        self.assertAlmostEqual(result.pressures[-1],150+0.3*5000+0.5e-5*5000**2)
+        self.assertLess(result.evaluations,20)
+
+class TestBatchTraverse(unittest.TestCase):
+
+    def test_lanes(self):
+        rate = np.linspace(1e-5,3e-4,7)
+        batch = batch_traverse(lambda z,P,index: rate[index]*P,np.full(7,100.),0.,8000.,rtol=1e-8,atol=1e-8)
+        for k in range(7):
+            single = traverse(lambda z,P: rate[k]*P,100.,0.,8000.,rtol=1e-8,atol=1e-8)
+            self.assertAlmostEqual(batch.pressures[k],single.pressures[-1],delta=1e-10)
+            self.assertEqual(batch.evaluations[k],single.evaluations)
+        self.assertEqual(batch.calls,batch.evaluations.max())
+
+    def test_profile(self):
+        depths = np.linspace(0.,8000.,9)
+        result = batch_traverse(lambda z,P,index: 1e-4*P,np.array([100.,200.]),0.,8000.,depths=depths,rtol=1e-8,atol=1e-8)
+        np.testing.assert_allclose(result.profile,np.array([[100.],[200.]])*np.exp(1e-4*depths),rtol=1e-6)
+
+    def test_failed_lane(self):
+        grad = np.array([0.3,np.nan])
+        result = batch_traverse(lambda z,P,index: grad[index]+0*P,3000.,np.array([8000.,5000.]),0.)
+        self.assertAlmostEqual(result.pressures[0],600.)
+        self.assertTrue(np.isnan(result.pressures[1]))
+
+class TestShoot(unittest.TestCase):
+
+    def test_secant(self):
+        a = np.array([1.,2.,3.,4.])
+        func = lambda x,index: a[index]*x**3
+        cold = shoot(func,8.,np.ones(4),tol=1e-10)
+        np.testing.assert_allclose(cold.x,2/a**(1/3))
+        self.assertEqual(cold.calls,cold.evaluations.max())
+        warm = shoot(func,8.2,cold,tol=1e-10)
+        np.testing.assert_allclose(warm.x,(8.2/a)**(1/3))
+        self.assertLess(warm.evaluations.sum(),cold.evaluations.sum())
+
+    def test_failed_traverse(self):
+        # traverses fail above x=3 and the steps are halved back into the domain
+        func = lambda x,index: np.where(x>3,np.nan,x**2)
+        result = shoot(func,np.array([4.,1.]),np.array([0.5,2.]),tol=1e-8)
+        np.testing.assert_allclose(result.x,[2.,1.])
+        self.assertTrue(np.isnan(shoot(lambda x,index: np.ones_like(x),2.,1.).x))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import io
+import unittest
+
+import numpy as np
+
+from nodepy.vfp import VFPTable, write_vfpprod, write_vfpinj, read_vfp
+
+KEYWORDS = """
+WELSPECS
+ 'P1' 'G1' 1 1 1* 'OIL' /
+/
+VFPPROD
+-- a hand written table with defaults and repeat counts
+ 7 6500. 'LIQ' 'WCT' 'GOR' 'THP' ' ' 'FIELD' 'BHP' /
+ 100 1000 /
+ 200 /
+ 0 0.5 /
+ 0.4 /
+ 0 /
+ 1 1 1 1 1500 1800 /
+ 1 2 1 1 2*1700 /
+VFPINJ
+ 2 5000 'WAT' 'THP' 'FIELD' 'BHP' /
+ 1000 5000 /
+ 500 1000 /
+ 1 2700 2600 /
+ 2 3200 3100 /
+"""
+
+class TestEclipse(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        axes = (np.geomspace(50,5000,13),np.linspace(100,600,4),np.linspace(0,0.9,3),
+            np.linspace(200,3000,3),np.linspace(0,1000,2))
+        self.table = VFPTable(*axes,rng.uniform(500,5000,tuple(nodes.size for nodes in axes)),depth=8000.)
+
+    def test_vfpprod(self):
+        stream = io.StringIO()
+        write_vfpprod(stream,self.table,3,comment="well P1")
+        self.assertLessEqual(max(len(line) for line in stream.getvalue().splitlines()),132)
+        table = read_vfp(io.StringIO(stream.getvalue()))[3]
+        np.testing.assert_array_equal(table.bhp,self.table.bhp)
+        for nodes,expected in zip(table.axes,self.table.axes):
+            np.testing.assert_allclose(nodes,expected,rtol=1e-14)
+        self.assertEqual(table.depth,8000.)
+
+    def test_vfpinj(self):
+        table = VFPTable([1000.,5000.,9000.],[500.,1500.],0.,0.,0.,np.arange(6.).reshape(3,2,1,1,1))
+        stream = io.StringIO()
+        write_vfpinj(stream,table,4)
+        np.testing.assert_array_equal(read_vfp(io.StringIO(stream.getvalue()))[4].bhp,table.bhp)
+        with self.assertRaises(ValueError):
+            write_vfpinj(stream,self.table,5)
+
+    def test_not_finite(self):
+        self.table.bhp[2,1,0,2,1] = np.nan
+        stream = io.StringIO()
+        with self.assertRaisesRegex(ValueError,"NT NW NG NA = 2 1 3 2"):
+            write_vfpprod(stream,self.table,3)
+        self.assertEqual(stream.getvalue(),"")
+        table = VFPTable([1000.,5000.],[500.,1500.],0.,0.,0.,np.array([1.,2.,np.inf,4.]).reshape(2,2,1,1,1))
+        with self.assertRaisesRegex(ValueError,"NT = 1"):
+            write_vfpinj(stream,table,4)
+
+    def test_keywords(self):
+        tables = read_vfp(io.StringIO(KEYWORDS))
+        self.assertEqual(sorted(tables),[2,7])
+        np.testing.assert_array_equal(tables[7].bhp[:,0,:,0,0],[[1500.,1700.],[1800.,1700.]])
+        np.testing.assert_array_equal(tables[7].gfr,[400.])
+        np.testing.assert_array_equal(tables[2].bhp[:,:,0,0,0],[[2700.,3200.],[2600.,3100.]])
+
+    def test_units(self):
+        with self.assertRaises(ValueError):
+            read_vfp(io.StringIO(KEYWORDS.replace("'FIELD'","'METRIC'")))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+import numpy as np
+
+from nodepy import _hagedorn_brown as hb
+
+from nodepy.fluid_props import PVTTable
+
+from nodepy.vfp import VFPTable
+
+WELL = dict(gas_grav=0.65,oil_grav=30,wtr_grav=1.07,ID=2.441,angle=90.,depth=5000.,fwht=100.,fbht=150.)
+
+class TestLookup(unittest.TestCase):
+
+    def setUp(self):
+        self.axes = (np.array([100.,500.,2000.]),np.array([100.,300.]),np.array([0.,0.5]),
+            np.array([300.]),np.array([0.,100.,400.]))
+        grids = np.meshgrid(*self.axes,indexing="ij")
+        self.table = VFPTable(*self.axes,self.linear(*grids))
+
+    @staticmethod
+    def linear(flo,thp,wfr,gfr,alq):
+        return 1000+0.1*flo+1.5*thp+400*wfr-0.2*gfr-0.3*alq
+
+    def test_linear(self):
+        # multilinear interpolation and extrapolation reproduce linear fields
+        rng = np.random.default_rng(0)
+        queries = (rng.uniform(50,2500,100),rng.uniform(50,350,100),rng.uniform(0,0.7,100),
+            rng.uniform(200,400,100),rng.uniform(0,500,100))
+        np.testing.assert_allclose(self.table(*queries),self.linear(*queries[:3],300.,queries[4]),rtol=1e-6)
+
+    def test_broadcast(self):
+        bhp = self.table(self.axes[0][:,None],200.,0.25,300.,self.axes[4])
+        self.assertEqual(bhp.shape,(3,3))
+        self.assertEqual(self.table.bhp.dtype,np.float32)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            VFPTable(*self.axes,np.zeros((3,2,2,1,2)))
+        with self.assertRaises(ValueError):
+            VFPTable.build([100.],[100.],[1.],[300.],**WELL)
+
+class TestBuild(unittest.TestCase):
+
+    def test_nodes(self):
+        table = VFPTable.build([200.,1000.,2000.],[150.],[0.,0.4],[300.,600.],[0.,200.],**WELL)
+        flo,wfr,alq = 1000.,0.4,200.
+        qo = flo*(1-wfr)
+        exact = hb.pwf_q(150.,100.,qo,flo*wfr,600.+1000*alq/qo,0.65,30,1.07,2.441,90.,5000.,150.)
+        self.assertAlmostEqual(float(table(flo,150.,wfr,600.,alq)),float(exact),delta=1e-3)
+
+    def test_pvt(self):
+        # a PVT table of one GOR cannot serve several GFR nodes or lift gas
+        pvt = PVTTable(lambda P,T: hb.fluid_state(P,T,300.,0.65,30,1.07),np.linspace(14.7,5000,51),np.linspace(60,250,11),gor=300.)
+        with self.assertRaises(ValueError):
+            VFPTable.build([200.,1000.],[150.],[0.],[300.,600.],**WELL,pvt=pvt)
+        with self.assertRaises(ValueError):
+            VFPTable.build([200.,1000.],[150.],[0.],[300.],[100.],**WELL,pvt=pvt)
+        table = VFPTable.build([200.,1000.],[150.],[0.],[300.],**WELL,pvt=pvt)
+        self.assertTrue(np.all(np.isfinite(table.bhp)))
+
+if __name__ == "__main__":
+    unittest.main()